@@ -0,0 +1,117 @@
+"""
+Guard the import cost paid by pytest collection, using ``python -X importtime``.
+
+Each target is imported in a fresh interpreter. The benchmark prints its
+cumulative import time and slowest dependencies, and fails if the target pulls
+in a heavy dependency it should load lazily or exceeds its time budget.
+
+Usage:
+    python -m benchmarks.import_time [--budget-scale 1.0] [--top 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# (label, statement, modules that must not be imported, budget in ms)
+TARGETS = [
+    (
+        "conftest",
+        "import conftest",
+        ("selenium", "allure", "psutil", "openpyxl", "mysql", "yaml", "loguru"),
+        400,
+    ),
+    (
+        "utils",
+        "import utils.browser_pool, utils.excel_reader, utils.config, utils.capability_cache",
+        ("selenium", "allure", "psutil", "openpyxl", "mysql", "yaml", "loguru"),
+        250,
+    ),
+    (
+        "helpers",
+        "import pages.base_page, utils.wait_helper, utils.table_helper",
+        ("selenium", "loguru"),
+        250,
+    ),
+    (
+        "test_excel_data",
+        "import sys; sys.path.insert(0, 'tests/data_driven_test'); import test_excel_data",
+        ("openpyxl", "mysql"),
+        1000,
+    ),
+    (
+        "test_sql_database",
+        "import sys; sys.path.insert(0, 'tests/data_driven_test'); import test_sql_database",
+        ("openpyxl", "mysql"),
+        1000,
+    ),
+]
+
+
+def import_profile(statement):
+    """
+    Runs ``statement`` under ``-X importtime`` and parses the report.
+
+    Returns:
+        list[tuple[str, int, int]]: (module, nesting depth, cumulative microseconds)
+        in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        profile.append((module.strip(), depth, int(cumulative)))
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="multiply every time budget, e.g. 2.0 on slow CI runners",
+    )
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    failures = []
+    for label, statement, forbidden, budget_ms in TARGETS:
+        profile = import_profile(statement)
+        modules = {module.split(".")[0] for module, _, _ in profile}
+        # Cumulative times of the top-level imports add up to the total
+        total_ms = sum(us for _, depth, us in profile if depth == 0) / 1000
+        budget_ms *= args.budget_scale
+
+        print(f"\n{label}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+        for module, _, us in sorted(profile, key=lambda item: item[2], reverse=True)[
+            : args.top
+        ]:
+            print(f"  {us / 1000:8.1f} ms  {module}")
+
+        loaded = [name for name in forbidden if name in modules]
+        if loaded:
+            failures.append(f"{label} imports {', '.join(loaded)} eagerly")
+        if total_ms > budget_ms:
+            failures.append(f"{label} took {total_ms:.1f} ms (> {budget_ms:.0f} ms)")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nAll import budgets met.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark browser teardown latency: fixed sleeps versus waiting on process exit.
+
+The "legacy" teardown replays what quit_browser used to do (sleep 1s, kill,
+sleep 2s if anything was killed). The "current" teardown is
+BrowserManager.quit_browser, which waits on the tracked process tree with
+psutil.wait_procs.
+
+By default the browser is simulated by a small process tree that shuts down
+shortly after quit() is requested, so the benchmark runs anywhere. Pass
+--real to launch the configured browser instead.
+
+Usage:
+    python -m benchmarks.teardown_latency [--runs 5] [--real]
+"""
+
+import argparse
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import psutil
+from utils.browser_manager import BrowserManager
+
+# A stand-in driver service: spawns a child "browser" and exits shortly after SIGTERM
+FAKE_SERVICE = """
+import signal, subprocess, sys, time
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+def stop(*_):
+    time.sleep(0.05)
+    child.terminate()
+    child.wait()
+    sys.exit(0)
+signal.signal(signal.SIGTERM, stop)
+time.sleep(60)
+"""
+
+
+class FakeDriver:
+    """Minimal driver whose quit() stops the fake service like Service.stop()."""
+
+    def __init__(self, service):
+        self.service = service
+
+    def quit(self):
+        self.service.send_signal(signal.SIGTERM)
+        self.service.wait()
+
+
+class LegacyTeardownManager(BrowserManager):
+    """BrowserManager with the previous sleep-based quit_browser."""
+
+    def quit_browser(self):
+        self._collect_browser_processes()
+        if self.driver:
+            try:
+                self.driver.quit()
+            finally:
+                self.driver = None
+        time.sleep(1)
+        killed = 0
+        for proc in self._processes.values():
+            try:
+                if proc.is_running():
+                    proc.kill()
+                    killed += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        self._processes.clear()
+        self.service_pid = None
+        if killed > 0:
+            time.sleep(2)
+        self._cleanup_temp_directories()
+        self._release_ports()
+
+
+def _start(manager_cls, real):
+    """Start a real or simulated browser and return its manager."""
+    manager = manager_cls()
+    if real:
+        manager.start_browser()
+        return manager
+
+    service = subprocess.Popen([sys.executable, "-c", FAKE_SERVICE])
+    # Wait until the fake service has spawned its child
+    while not psutil.Process(service.pid).children():
+        time.sleep(0.01)
+    manager.driver = FakeDriver(service)
+    manager.service_pid = service.pid
+    manager._collect_browser_processes()
+    return manager
+
+
+def measure(manager_cls, runs, real):
+    """Return teardown durations in seconds for ``runs`` browsers."""
+    durations = []
+    for _ in range(runs):
+        manager = _start(manager_cls, real)
+        started = time.perf_counter()
+        manager.quit_browser()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--real", action="store_true", help="launch real browsers")
+    args = parser.parse_args()
+
+    for label, manager_cls in (
+        ("legacy (fixed sleeps)", LegacyTeardownManager),
+        ("current (wait_procs)", BrowserManager),
+    ):
+        durations = measure(manager_cls, args.runs, args.real)
+        print(
+            f"{label:<24} mean {statistics.mean(durations) * 1000:8.1f} ms   "
+            f"max {max(durations) * 1000:8.1f} ms   runs {len(durations)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
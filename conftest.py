@@ -4,34 +4,60 @@ This module contains pytest fixtures for setting up and tearing down the Seleniu
 
 import pytest
 import os
-import allure
+import sys
 import json
 import atexit
+import dataclasses
 import shutil
 from datetime import datetime
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    TimeoutException,
-    WebDriverException,
-)
-from utils.browser_manager import BrowserManager
+from typing import TYPE_CHECKING
+from utils.browser_manager import sweep_stale_browser_dirs
+from utils.browser_pool import BrowserPool, pool_stats
+from utils.capability_cache import cache_key, load_capabilities, store_capabilities
+from utils.config import get_config, set_overrides
+from utils.disk_cache import cache_stats
+from utils.http_mirror import get_active_mirror, start_mirror, stop_mirror
 from utils.logger import attach_log_to_allure, logger
+from utils.network_filter import format_savings, network_savings, resolve_blocklist
+from utils.paths import get_absolute_path
+from utils.wait_telemetry import format_report, wait_stats
+from utils.worker import get_worker_id, is_controller
+
+# Selenium and Allure are imported where they are used so that collection and
+# runs of tests that never start a browser do not pay for them.
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 # Global variable to track temporary directories for cleanup
 _temp_dirs = []
 
+# Browser details for the current session, used for the Allure environment file
+_session_info = {}
+
+# The test that will run after the current one, used to prefetch its browser
+_next_item = {}
+
 
 def pytest_addoption(parser):
     """Add command line options for pytest."""
     parser.addoption(
-        "--browser", action="store", default="chrome", help="Browser to run tests on"
+        "--browser",
+        action="store",
+        default=None,
+        help="Browser to run tests on (defaults to 'browser' in config.yaml)",
     )
     parser.addoption(
         "--headless",
         action="store_true",
-        default=False,
-        help="Run browser in headless mode",
+        default=None,
+        help="Run browser in headless mode (defaults to 'headless' in config.yaml)",
+    )
+    parser.addoption(
+        "--mirror",
+        action="store",
+        default=None,
+        choices=("off", "record", "replay"),
+        help="Record live traffic to, or replay it from, the HTTP mirror archive",
     )
     parser.addoption(
         "--env", action="store", default="QA", help="Environment to run tests against"
@@ -39,61 +65,87 @@ def pytest_addoption(parser):
 
 
 def pytest_configure(config):
-    """Configure pytest with custom markers."""
+    """Configure pytest with custom markers and apply command line overrides."""
+    set_overrides(
+        browser=config.getoption("--browser"),
+        headless=config.getoption("--headless"),
+    )
+    mirror_mode = config.getoption("--mirror")
+    if mirror_mode:
+        set_overrides(mirror=dataclasses.replace(get_config().mirror, mode=mirror_mode))
+
     config.addinivalue_line("markers", "smoke: mark test as smoke test")
     config.addinivalue_line("markers", "regression: mark test as regression test")
     config.addinivalue_line("markers", "slow: mark test as slow running")
 
 
+def _write_environment_file(session, browser_version):
+    """Write the Allure environment.properties file for this session."""
+    env_file = os.path.join("allure-results", "environment.properties")
+    with open(env_file, "w") as f:
+        f.write(f"Browser={_session_info['browser']}\n")
+        f.write(f"Browser.Version={browser_version}\n")
+        f.write(f"Headless={_session_info['headless']}\n")
+        f.write(f"OS={os.name}\n")
+        f.write(f"Environment={_session_info['environment']}\n")
+        f.write(
+            f"Python.Version={session.config.hook.pytest_report_header(config=session.config, start_path=session.startpath)[0] if hasattr(session.config.hook, 'pytest_report_header') else 'unknown'}\n"
+        )
+        f.write(f"Test.Start.Time={_session_info['start_time']}\n")
+    return env_file
+
+
 def pytest_sessionstart(session):
     """Initialize test session and create environment file."""
     os.makedirs("allure-results", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
 
     # Get browser configuration
-    browser_name = session.config.getoption("--browser")
-    headless = session.config.getoption("--headless")
+    browser_name = get_config().browser
+    headless = get_config().headless
     environment = session.config.getoption("--env")
 
-    # Create temporary browser instance to get capabilities
-    temp_browser_manager = None
-    driver = None
-    browser_version = "unknown"
+    _session_info.update(
+        browser=browser_name,
+        headless=headless,
+        environment=environment,
+        start_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    )
 
-    try:
-        temp_browser_manager = BrowserManager(browser_name=browser_name)
-        driver = temp_browser_manager.start_browser()
-        browser_version = driver.capabilities.get("browserVersion", "unknown")
-        logger.info(
-            "Driver capabilities:\n" + json.dumps(driver.capabilities, indent=2)
-        )
-    except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-        logger.error(f"Failed to get browser capabilities: {e}")
-    finally:
-        if temp_browser_manager:
-            temp_browser_manager.quit_browser()
+    # Read capabilities from the on-disk cache instead of launching a browser.
+    # The cache describes the local browser binary, so it is only used for the
+    # local backend with a binary on PATH. Otherwise, and on a cache miss, the
+    # version is taken from the first real test session.
+    key = cache_key(browser_name) if get_config().backend == "local" else None
+    capabilities = load_capabilities(key)
+    _session_info["capability_cache_key"] = key
+    _session_info["capabilities_cached"] = capabilities is not None
+    _session_info["version_from_cache"] = capabilities is not None
+    browser_version = (capabilities or {}).get("browserVersion", "unknown")
+
+    # Under xdist only the controller writes the environment file and removes
+    # the browser directories that crashed runs left in the temp dir
+    if is_controller(session.config):
+        env_file = _write_environment_file(session, browser_version)
+        logger.info(f"Environment file created at {env_file}")
+        if get_config().backend == "local":
+            sweep_stale_browser_dirs()
 
-    # Create environment file for Allure
-    env_file = os.path.join("allure-results", "environment.properties")
-    with open(env_file, "w") as f:
-        f.write(f"Browser={browser_name}\n")
-        f.write(f"Browser.Version={browser_version}\n")
-        f.write(f"Headless={headless}\n")
-        f.write(f"OS={os.name}\n")
-        f.write(f"Environment={environment}\n")
-        f.write(
-            f"Python.Version={session.config.hook.pytest_report_header(config=session.config, start_path=session.startpath)[0] if hasattr(session.config.hook, 'pytest_report_header') else 'unknown'}\n"
-        )
-        f.write(f"Test.Start.Time={datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-
-    logger.info(f"Environment file created at {env_file}")
     logger.info("=" * 80)
-    logger.info("TEST SESSION STARTED")
+    logger.info(f"TEST SESSION STARTED (worker: {get_worker_id()})")
     logger.info(f"Browser: {browser_name} (headless: {headless})")
     logger.info(f"Environment: {environment}")
     logger.info("=" * 80)
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the browser version an xdist worker saw in its sessions."""
+    browser_version = getattr(node, "workeroutput", {}).get("browser_version")
+    if browser_version:
+        _session_info.setdefault("browser_version", browser_version)
+
+
 def pytest_sessionfinish(session, exitstatus):
     """Clean up after test session."""
     logger.info("=" * 80)
@@ -101,6 +153,87 @@ def pytest_sessionfinish(session, exitstatus):
     logger.info(f"Exit status: {exitstatus}")
     logger.info("=" * 80)
 
+    # Fill in the browser version collected during the run. xdist workers hand
+    # it to the controller, which writes the environment file.
+    if not is_controller(session.config):
+        if _session_info.get("browser_version"):
+            session.config.workeroutput["browser_version"] = _session_info[
+                "browser_version"
+            ]
+    elif not _session_info.get("version_from_cache", True):
+        browser_version = _session_info.get("browser_version")
+        if not browser_version and _session_info.get("capability_cache_key"):
+            capabilities = (
+                load_capabilities(_session_info["capability_cache_key"]) or {}
+            )
+            browser_version = capabilities.get("browserVersion")
+        if browser_version:
+            _write_environment_file(session, browser_version)
+
+    # Report WebDriver command latency when talking to a remote endpoint
+    remote_connection = sys.modules.get("utils.remote_connection")
+    latency = (
+        remote_connection.PooledRemoteConnection.stats.summary()
+        if remote_connection
+        else {}
+    )
+    if latency:
+        worker_id = get_worker_id()
+        latency_file = os.path.join("logs", f"remote_command_latency_{worker_id}.json")
+        with open(latency_file, "w") as f:
+            json.dump(latency, f, indent=2)
+        logger.info(f"Remote command latency written to {latency_file}")
+        remote_connection.PooledRemoteConnection.close_pool()
+
+    # Report the requests each test avoided through network blocking
+    savings = network_savings.summary()
+    if savings["tests"]:
+        savings_file = os.path.join("logs", f"network_savings_{get_worker_id()}.json")
+        with open(savings_file, "w") as f:
+            json.dump(savings, f, indent=2)
+        logger.info(
+            f"Network blocking avoided {format_savings(savings['total'])}, "
+            f"written to {savings_file}"
+        )
+    network_savings.save_sizes()
+
+    # Report how often the shared disk cache answered instead of the network
+    cache = cache_stats.summary()
+    if cache["responses"]:
+        cache_file = os.path.join("logs", f"disk_cache_{get_worker_id()}.json")
+        with open(cache_file, "w") as f:
+            json.dump(cache, f, indent=2)
+        logger.info(
+            f"Disk cache hit rate: {cache['hit_rate']:.1%} "
+            f"({cache['disk_cache_hits']}/{cache['responses']} responses)"
+        )
+
+    # Report how often browsers were reused, and why resets fell back to a relaunch
+    pool = pool_stats.summary()
+    if pool["reused"] or pool["launched"]:
+        pool_file = os.path.join("logs", f"browser_pool_{get_worker_id()}.json")
+        with open(pool_file, "w") as f:
+            json.dump(pool, f, indent=2)
+        fallbacks = sum(pool["reset_fallbacks"].values())
+        logger.info(
+            f"Browsers reused {pool['reused']} times, launched {pool['launched']} "
+            f"times ({fallbacks} after a failed reset), written to {pool_file}"
+        )
+
+    # Report how long explicit waits took, per locator
+    waits = wait_stats.summary()
+    if waits["waits"]:
+        waits_file = os.path.join("logs", f"wait_telemetry_{get_worker_id()}.json")
+        with open(waits_file, "w") as f:
+            json.dump(waits, f, indent=2)
+        report_file = os.path.join("logs", f"wait_telemetry_{get_worker_id()}.txt")
+        with open(report_file, "w") as f:
+            f.write(format_report(waits) + "\n")
+        logger.info(
+            f"{waits['waits']} waits ({waits['timeouts']} timed out) took "
+            f"{waits['total_ms'] / 1000:.1f}s, written to {waits_file} and {report_file}"
+        )
+
     # Clean up temporary directories
     cleanup_temp_directories()
 
@@ -113,7 +246,7 @@ def cleanup_temp_directories():
             if os.path.exists(temp_dir):
                 shutil.rmtree(temp_dir)
                 logger.info(f"Cleaned up temporary directory: {temp_dir}")
-        except (NoSuchElementException, TimeoutException, WebDriverException) as e:
+        except OSError as e:
             logger.warning(f"Failed to clean up temporary directory {temp_dir}: {e}")
     _temp_dirs.clear()
 
@@ -122,33 +255,153 @@ def cleanup_temp_directories():
 atexit.register(cleanup_temp_directories)
 
 
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Remember the next test so its browser can be started in the background."""
+    _next_item["item"] = nextitem
+
+
+def _network_patterns(item):
+    """
+    Returns the URL patterns to block for a test.
+
+    Starts from ``network_blocklist`` when ``network_blocking`` is on, then applies
+    the test's ``network_filter`` marker: ``block`` adds patterns, ``allow`` drops
+    matching blocklist entries and ``enabled=False`` turns blocking off.
+
+    Args:
+        item: pytest test item
+
+    Returns:
+        list[str]: The patterns for Network.setBlockedURLs.
+    """
+    config = get_config()
+    marker = item.get_closest_marker("network_filter")
+    options = marker.kwargs if marker else {}
+
+    if not options.get("enabled", config.network_blocking):
+        return []
+    block = list(config.network_blocklist) + list(options.get("block", ()))
+    allow = list(config.network_allowlist) + list(options.get("allow", ()))
+    return resolve_blocklist(block, allow)
+
+
+def _page_load_strategy(item):
+    """
+    Returns the page load strategy for a test.
+
+    Args:
+        item: pytest test item
+
+    Returns:
+        str: The ``page_load_strategy`` marker argument, or the configured strategy.
+    """
+    marker = item.get_closest_marker("page_load_strategy")
+    if marker and marker.args:
+        return marker.args[0].lower()
+    return get_config().page_load_strategy.lower()
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    """
+    Session-scoped pool of warm browsers shared by the tests of this worker.
+
+    The HTTP mirror, when enabled, is started first so every browser is routed
+    through it.
+
+    Yields:
+        BrowserPool: The pool used by setup_teardown.
+    """
+    mirror = get_config().mirror
+    start_mirror(
+        mirror.mode.lower(),
+        get_absolute_path(mirror.archive_dir),
+        upstream_timeout=mirror.upstream_timeout,
+    )
+    pool = BrowserPool(browser_name=get_config().browser)
+    yield pool
+    pool.shutdown()
+    stop_mirror()
+
+
 @pytest.fixture(scope="function")
-def setup_teardown(request):
+def setup_teardown(request, browser_pool):
     """
     Sets up and tears down the Selenium WebDriver for each test function.
 
+    Browsers are taken from the session pool and reset after the test instead
+    of being relaunched. Tests marked ``isolated`` get a fresh browser that is
+    quit afterwards, and tests marked ``page_load_strategy`` get a browser
+    started with that strategy.
+
     Args:
         request: pytest request object
+        browser_pool: session browser pool
 
     Yields:
         WebDriver: The Selenium WebDriver instance.
     """
     test_name = request.node.name
-    browser_name = request.config.getoption("--browser")
-    headless = request.config.getoption("--headless")
+    browser_name = get_config().browser
+    headless = get_config().headless
+    isolated = request.node.get_closest_marker("isolated") is not None
+    page_load_strategy = _page_load_strategy(request.node)
 
     logger.info(f"Setting up test: {test_name}")
-    logger.info(f"Browser: {browser_name} (headless: {headless})")
+    logger.info(f"Browser: {browser_name} (headless: {headless}, isolated: {isolated})")
 
     browser_manager = None
     driver = None
+    blocking = False
+    mirror = get_active_mirror()
+    if mirror:
+        mirror.start_test(request.node.nodeid)
 
     try:
-        browser_manager = BrowserManager(browser_name=browser_name)
-        driver = browser_manager.start_browser()
-        logger.info(f"Browser {browser_name} started successfully")
+        browser_manager = browser_pool.acquire(
+            isolated=isolated, page_load_strategy=page_load_strategy
+        )
+        driver = browser_manager.driver
+        logger.info(f"Browser {browser_name} ready")
+
+        # Per-test event buffers: drop what earlier tests in this browser produced
+        if browser_manager.events:
+            browser_manager.events.clear()
+
+        blocking = browser_manager.apply_network_filter(_network_patterns(request.node))
+
+        if not _session_info.get("capabilities_cached", True):
+            logger.info(
+                "Driver capabilities:\n" + json.dumps(driver.capabilities, indent=2)
+            )
+            _session_info["browser_version"] = driver.capabilities.get(
+                "browserVersion", "unknown"
+            )
+            if _session_info.get("capability_cache_key"):
+                store_capabilities(
+                    _session_info["capability_cache_key"], driver.capabilities
+                )
+            _session_info["capabilities_cached"] = True
+
+        # Start the next test's browser while this one runs if it cannot reuse ours.
+        # Prefetched browsers use the configured strategy, so only those can help.
+        next_item = _next_item.get("item")
+        default_strategy = get_config().page_load_strategy.lower()
+        if (
+            next_item is not None
+            and "setup_teardown" in next_item.fixturenames
+            and _page_load_strategy(next_item) == default_strategy
+        ):
+            browser_pool.prepare_next(
+                current_isolated=isolated or page_load_strategy != default_strategy,
+                next_isolated=next_item.get_closest_marker("isolated") is not None,
+                page_load_strategy=default_strategy,
+            )
 
         # Add test info to Allure
+        import allure
+
         allure.dynamic.feature(f"Browser: {browser_name}")
         allure.dynamic.parameter("browser", browser_name)
         allure.dynamic.parameter("headless", headless)
@@ -160,10 +413,21 @@ def setup_teardown(request):
         raise
     finally:
         if browser_manager:
-            logger.info(f"Quitting browser: {browser_name}")
-            browser_manager.quit_browser()
+            activity = browser_manager.collect_network_activity()
+            network_savings.learn(activity.loaded, get_config().network_blocklist)
+            if browser_manager.cache_slot:
+                cache_stats.record(activity.responses, activity.cache_hits)
+            if blocking and get_config().network_savings_report:
+                savings = network_savings.record(request.node.nodeid, activity.blocked)
+                logger.info(f"Network blocking avoided {format_savings(savings)}")
+
+            logger.info(f"Releasing browser: {browser_name}")
+            browser_pool.release(browser_manager, reuse=not isolated)
             logger.info("Browser session ended")
 
+        if mirror:
+            mirror.finish_test()
+
         logger.info(f"Test completed: {test_name}")
         logger.info("-" * 80)
 
@@ -186,6 +450,12 @@ def _extract_driver_from_item(item):
     Returns:
         WebDriver or None: The WebDriver instance if found
     """
+    # No browser can have been started if Selenium was never imported
+    if "selenium.webdriver.remote.webdriver" not in sys.modules:
+        return None
+
+    from selenium.webdriver.remote.webdriver import WebDriver
+
     try:
         for name, value in item.funcargs.items():
             if isinstance(value, WebDriver):
@@ -195,7 +465,7 @@ def _extract_driver_from_item(item):
     return None
 
 
-def _attach_screenshot(driver: WebDriver, phase: str, test_name: str = ""):
+def _attach_screenshot(driver: "WebDriver", phase: str, test_name: str = ""):
     """
     Take and attach screenshot to Allure if driver is available.
 
@@ -204,6 +474,8 @@ def _attach_screenshot(driver: WebDriver, phase: str, test_name: str = ""):
         phase: Test phase (setup, call, teardown)
         test_name: Name of the test
     """
+    import allure
+
     try:
         screenshot = driver.get_screenshot_as_png()
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -221,7 +493,7 @@ def _attach_screenshot(driver: WebDriver, phase: str, test_name: str = ""):
         logger.error(f"Failed to capture screenshot: {type(e).__name__}: {e}")
 
 
-def _attach_page_source(driver: WebDriver, phase: str, test_name: str = ""):
+def _attach_page_source(driver: "WebDriver", phase: str, test_name: str = ""):
     """
     Take and attach page source (HTML) to Allure if driver is available.
 
@@ -230,6 +502,8 @@ def _attach_page_source(driver: WebDriver, phase: str, test_name: str = ""):
         phase: Test phase (setup, call, teardown)
         test_name: Name of the test
     """
+    import allure
+
     try:
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         name = f"{phase}_page_source_{timestamp}"
@@ -246,15 +520,25 @@ def _attach_page_source(driver: WebDriver, phase: str, test_name: str = ""):
         logger.error(f"Failed to capture page source: {type(e).__name__}: {e}")
 
 
-def _attach_browser_logs(driver: WebDriver, phase: str, test_name: str = ""):
+def _attach_browser_logs(driver: "WebDriver", phase: str, test_name: str = ""):
     """
     Attach browser logs to Allure if available.
 
+    Uses the events buffered by the BiDi event stream when the session has one,
+    otherwise asks the driver for its browser log.
+
     Args:
         driver: WebDriver instance
         phase: Test phase (setup, call, teardown)
         test_name: Name of the test
     """
+    import allure
+
+    events = getattr(driver, "event_stream", None)
+    if events is not None:
+        _attach_event_stream(events, phase, test_name)
+        return
+
     try:
         if hasattr(driver, "get_log"):
             logs = driver.get_log("browser")
@@ -277,6 +561,45 @@ def _attach_browser_logs(driver: WebDriver, phase: str, test_name: str = ""):
         logger.debug(f"Could not capture browser logs: {type(e).__name__}: {e}")
 
 
+def _attach_event_stream(events, phase: str, test_name: str = ""):
+    """
+    Attach the console messages and failed requests buffered during the test.
+
+    Args:
+        events: The EventStream of the test's browser
+        phase: Test phase (setup, call, teardown)
+        test_name: Name of the test
+    """
+    import allure
+    from utils.event_stream import CONSOLE, NAVIGATION, NETWORK
+
+    try:
+        lines = [f"[{e.get('level')}] {e.get('text')}" for e in events.events(CONSOLE)]
+        lines += [
+            f"[network] {e.get('method')} {e.get('url')} -> "
+            f"{e.get('error') or e.get('status')}"
+            for e in events.events(NETWORK)
+            if e.get("event") == "fetchError" or (e.get("status") or 0) >= 400
+        ]
+        lines += [
+            f"[navigation] {e.get('event')} {e.get('url')}"
+            for e in events.events(NAVIGATION)
+        ]
+        if not lines:
+            return
+
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        name = f"{phase}_browser_events_{timestamp}"
+        if test_name:
+            name = f"{test_name}_{name}"
+        allure.attach(
+            "\n".join(lines), name=name, attachment_type=allure.attachment_type.TEXT
+        )
+        logger.info(f"Browser events attached: {name}")
+    except Exception as e:
+        logger.debug(f"Could not capture browser events: {type(e).__name__}: {e}")
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
@@ -320,7 +643,7 @@ def browser_config(request):
         dict: Browser configuration dictionary
     """
     return {
-        "browser": request.config.getoption("--browser"),
-        "headless": request.config.getoption("--headless"),
+        "browser": get_config().browser,
+        "headless": get_config().headless,
         "environment": request.config.getoption("--env"),
     }
@@ -1,20 +1,261 @@
+from pages.locators import locators_of
+from utils.logger import logger
+from utils.wait_helper import FIND_NODES_JS, wait_for_elements_batch
+
+# Sets every [by, value, input] field of the form: inputs and textareas through
+# the native value setter (so framework-bound inputs see the change), selects by
+# option text or value, checkboxes and radios by clicking them into the wanted
+# state. Dispatches input and change events, as typing or picking would. Every
+# field and select option is resolved first, and nothing is set unless all of
+# them exist; otherwise returns the indexes of the fields that matched no
+# element and of the selects with no such option.
+_FILL_FORM_SCRIPT = FIND_NODES_JS + """
+const [fields] = arguments;
+const missing = [];
+const noOption = [];
+
+const targets = fields.map(([by, value, input], index) => {
+    const el = find(by, value).find((node) => node.nodeType === Node.ELEMENT_NODE);
+    if (!el) {
+        missing.push(index);
+        return null;
+    }
+    let option = null;
+    if (el instanceof HTMLSelectElement) {
+        const wanted = String(input).trim();
+        option = Array.from(el.options).find((o) => o.text.trim() === wanted)
+            || Array.from(el.options).find((o) => o.value === wanted);
+        if (!option) {
+            noOption.push(index);
+        }
+    }
+    return {el: el, input: input, option: option};
+});
+if (missing.length || noOption.length) {
+    return {missing: missing, noOption: noOption};
+}
+
+for (const {el, input, option} of targets) {
+    if (el.type === "checkbox" || el.type === "radio") {
+        if (el.checked !== Boolean(input)) {
+            el.click();
+        }
+        continue;
+    }
+    if (option) {
+        option.selected = true;
+    } else {
+        const proto = el instanceof HTMLTextAreaElement
+            ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        el.focus();
+        Object.getOwnPropertyDescriptor(proto, "value").set.call(el, String(input));
+    }
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+}
+return {missing: missing, noOption: noOption};
+"""
+
+
 class BasePage:
-    """Base page class for common page functionalities."""
+    """
+    Base page class for common page functionalities.
+
+    Elements are cached per page object, keyed by locator, so repeated
+    interactions with the same field reuse its handle instead of finding it
+    again. click(), enter_text() and the other actions use the handle directly
+    and look the element up once more if it has gone stale (the page navigated
+    or re-rendered). find_element() and Locator attributes, whose handles the
+    caller keeps, check that the cached handle is still attached first.
+
+    Subclasses declare their elements as Locator class attributes; see
+    pages.locators.
+    """
 
     def __init__(self, driver):
         self.driver = driver
+        self._elements = {}
+
+    @classmethod
+    def locators(cls):
+        """Returns the Locator attributes of this page, by name."""
+        return locators_of(cls)
+
+    def fetch(self, *names, projection=None):
+        """
+        Resolves several declared locators of this page in one round trip.
+
+        Args:
+            *names: Names of Locator attributes; every locator if none are given.
+            projection: None for elements, "text" or "@attribute" as in
+                wait_for_elements_batch().
+
+        Returns:
+            dict: Names mapped to the elements or projected values.
+        """
+        locators = self.locators()
+        if names:
+            locators = {name: locators[name] for name in names}
+        results = wait_for_elements_batch(self.driver, locators, projection)
+        if projection is None:
+            for name, element in results.items():
+                self._elements[tuple(locators[name])] = element
+        return results
+
+    @staticmethod
+    def _locator(args, kwargs):
+        """Returns the (by, value) pair of a find_element call."""
+        from selenium.webdriver.common.by import By
+
+        by = kwargs.get("by", args[0] if args else By.ID)
+        value = kwargs.get("value", args[1] if len(args) > 1 else None)
+        return by, value
+
+    def invalidate(self, *args, **kwargs):
+        """Forget the cached handle of one locator, or of every locator if none is given."""
+        if args or kwargs:
+            self._elements.pop(self._locator(args, kwargs), None)
+        else:
+            self._elements.clear()
+
+    def open(self, url):
+        """Navigate to a URL, discarding the handles cached for the previous page."""
+        self.invalidate()
+        self.driver.get(url)
+        return self
+
+    def _cached_element(self, *args, **kwargs):
+        """Returns the cached handle, finding the element if there is none."""
+        locator = self._locator(args, kwargs)
+        element = self._elements.get(locator)
+        if element is None:
+            element = self.driver.find_element(*locator)
+            self._elements[locator] = element
+        return element
 
     def find_element(self, *args, **kwargs):
-        """Find an element on the page."""
-        return self.driver.find_element(*args, **kwargs)
+        """
+        Find an element on the page, reusing its handle while it is still attached.
+
+        A cached handle is checked before it is returned, since callers keep
+        it beyond the one-shot retry that click() and enter_text() get. A
+        handle left over from an earlier document or removed from the DOM is
+        replaced by a fresh lookup.
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        locator = self._locator(args, kwargs)
+        element = self._elements.get(locator)
+        if element is not None:
+            try:
+                if self.driver.execute_script(
+                    "return arguments[0].isConnected;", element
+                ):
+                    return element
+            except StaleElementReferenceException:
+                pass
+            logger.debug(f"Cached element {locator} is gone, finding it again")
+            self.invalidate(*locator)
+        return self._cached_element(*locator)
+
+    def _with_element(self, action, *args, **kwargs):
+        """Run ``action`` on the element, finding it again once if its handle is stale."""
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        try:
+            return action(self._cached_element(*args, **kwargs))
+        except StaleElementReferenceException:
+            logger.debug(
+                f"Stale element {self._locator(args, kwargs)}, finding it again"
+            )
+            self.invalidate(*args, **kwargs)
+            return action(self._cached_element(*args, **kwargs))
 
     def click(self, *args, **kwargs):
         """Click an element on the page."""
-        element = self.find_element(*args, **kwargs)
-        element.click()
+        self._with_element(lambda element: element.click(), *args, **kwargs)
 
     def enter_text(self, text, *args, **kwargs):
         """Enter text into an input field."""
-        element = self.find_element(*args, **kwargs)
-        element.clear()
-        element.send_keys(text)
+
+        def enter(element):
+            element.clear()
+            element.send_keys(text)
+
+        self._with_element(enter, *args, **kwargs)
+
+    def fill_form(self, fields, type_keys=()):
+        """
+        Fills many inputs and selects with a single script call.
+
+        Values are set directly and the input/change events are dispatched, so
+        the page reacts as it would to typing. Fields listed in ``type_keys``
+        are typed with enter_text() instead, for widgets that need real
+        keystrokes (masks, autocompletes).
+
+        Args:
+            fields (dict): (By, value) locators, or names of Locator attributes,
+                mapped to the value to set. Selects take an option's visible text
+                or value; checkboxes and radios take a bool.
+            type_keys (Iterable): Keys of ``fields`` to type with send_keys.
+
+        Nothing is set unless every field and select option exists, so a
+        missing field or option leaves the form untouched. Fields in
+        ``type_keys`` are typed afterwards and are not covered by this.
+
+        Raises:
+            ValueError: A select has no option with the given text or value.
+            TimeoutException: A field did not appear within the explicit wait.
+            NoSuchElementException: A field disappeared again before filling.
+        """
+        from selenium.common.exceptions import NoSuchElementException
+
+        declared = self.locators()
+        type_keys = set(type_keys)
+        typed = [key for key in fields if key in type_keys]
+        pending = [
+            (tuple(declared[key]) if isinstance(key, str) else tuple(key), value)
+            for key, value in fields.items()
+            if key not in typed
+        ]
+
+        payload = [
+            [by, locator, "" if value is None else value]
+            for (by, locator), value in pending
+        ]
+        for attempt in range(2):
+            if not payload:
+                break
+            result = self.driver.execute_script(_FILL_FORM_SCRIPT, payload)
+            if result["noOption"]:
+                raise ValueError(
+                    "No such option: "
+                    + ", ".join(
+                        f"{pending[i][1]!r} in {pending[i][0]}"
+                        for i in result["noOption"]
+                    )
+                )
+            if not result["missing"]:
+                break
+            missing = [pending[i][0] for i in result["missing"]]
+            if attempt:
+                raise NoSuchElementException(f"Form fields not found: {missing}")
+            # Wait for the fields that are not rendered yet, then fill the form
+            wait_for_elements_batch(
+                self.driver, {str(locator): locator for locator in missing}
+            )
+        logger.debug(f"Filled {len(fields) - len(typed)} fields by script.")
+
+        for key in typed:
+            locator = declared[key] if isinstance(key, str) else key
+            self.enter_text(str(fields[key]), *locator)
+
+    def get_text(self, *args, **kwargs):
+        """Get the visible text of an element."""
+        return self._with_element(lambda element: element.text, *args, **kwargs)
+
+    def is_displayed(self, *args, **kwargs):
+        """Check whether an element is displayed."""
+        return self._with_element(
+            lambda element: element.is_displayed(), *args, **kwargs
+        )
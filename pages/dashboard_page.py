@@ -6,49 +6,62 @@ as well as tests for JavaScript alerts, iframes, and browser windows.
 from selenium.webdriver.common.by import By
 from utils.logger import logger
 from pages.base_page import BasePage
+from pages.locators import Locator
 
 
 class DashboardPage(BasePage):
     """Dashboard page class for dashboard-specific functionalities."""
 
+    welcome_heading = Locator(By.CSS_SELECTOR, "h1")
+    logout_link = Locator(By.CSS_SELECTOR, "a.logout")
+    profile_link = Locator(By.CSS_SELECTOR, "a.profile")
+    settings_link = Locator(By.CSS_SELECTOR, "a.settings")
+
     def get_welcome_message(self):
         """Get the welcome message text from the dashboard."""
-        return self.find_element(By.CSS_SELECTOR, "h1").text
+        return self.get_text(*DashboardPage.welcome_heading)
 
     def click_logout(self):
         """Click the logout button on the dashboard."""
-        self.click(By.CSS_SELECTOR, "a.logout")
+        self.click(*DashboardPage.logout_link)
 
     def navigate_to_profile(self):
         """Navigate to the user profile page."""
-        self.click(By.CSS_SELECTOR, "a.profile")
+        self.click(*DashboardPage.profile_link)
         return ProfilePage(self.driver)
 
     def navigate_to_settings(self):
         """Navigate to the settings page."""
-        self.click(By.CSS_SELECTOR, "a.settings")
+        self.click(*DashboardPage.settings_link)
         return SettingsPage(self.driver)
 
 
 class ProfilePage(BasePage):
     """Profile page class for profile-specific functionalities."""
 
+    profile_info = Locator(By.CSS_SELECTOR, "div.profile-info")
+
     def get_profile_info(self):
         """Get the profile information text."""
-        return self.find_element(By.CSS_SELECTOR, "div.profile-info").text
+        return self.get_text(*ProfilePage.profile_info)
 
 
 class SettingsPage(BasePage):
     """Settings page class for settings-specific functionalities."""
 
+    old_password_input = Locator(By.CSS_SELECTOR, "input[name='old_password']")
+    new_password_input = Locator(By.CSS_SELECTOR, "input[name='new_password']")
+    submit_button = Locator(By.CSS_SELECTOR, "button[type='submit']")
+    settings_info = Locator(By.CSS_SELECTOR, "div.settings-info")
+
     def change_password(self, old_password, new_password):
         """Change the user's password."""
-        self.enter_text(old_password, By.CSS_SELECTOR, "input[name='old_password']")
-        self.enter_text(new_password, By.CSS_SELECTOR, "input[name='new_password']")
-        self.click(By.CSS_SELECTOR, "button[type='submit']")
+        self.enter_text(old_password, *SettingsPage.old_password_input)
+        self.enter_text(new_password, *SettingsPage.new_password_input)
+        self.click(*SettingsPage.submit_button)
         logger.info("Password changed successfully.")
         return self
 
     def get_settings_info(self):
         """Get the settings information text."""
-        return self.find_element(By.CSS_SELECTOR, "div.settings-info").text
+        return self.get_text(*SettingsPage.settings_info)
@@ -0,0 +1,86 @@
+"""
+Declarative locators for page objects.
+
+A Locator is declared as a class attribute of a page::
+
+    class LoginPage(BasePage):
+        username = Locator(By.CSS_SELECTOR, "input[name='username']")
+
+Read from the class (``LoginPage.username``) it is the plain ``(by, value)``
+tuple Selenium and ``wait_helper`` accept. Read from a page instance
+(``page.username``) it is the element, found on first access and then served
+from the page's element cache for as long as it stays attached to the document. Every Locator is registered with its page class,
+so tooling can list them without a browser.
+"""
+
+# Page class -> {attribute name: Locator} declared directly on that class
+_registry = {}
+
+
+class Locator(tuple):
+    """
+    A (by, value) pair declared on a page class.
+
+    Args:
+        by (str): The locator strategy, e.g. By.CSS_SELECTOR.
+        value (str): The selector.
+        description (str): What the element is, for reports and tooling.
+    """
+
+    def __new__(cls, by, value, description=None):
+        return super().__new__(cls, (by, value))
+
+    def __init__(self, by, value, description=None):
+        self.description = description
+        self.name = None
+        self.owner = None
+
+    @property
+    def by(self):
+        return self[0]
+
+    @property
+    def value(self):
+        return self[1]
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.owner = owner
+        _registry.setdefault(owner, {})[name] = self
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.find_element(*self)
+
+    def __repr__(self):
+        owner = self.owner.__name__ if self.owner else "?"
+        return f"Locator({owner}.{self.name}: {self.by}={self.value!r})"
+
+
+def locators_of(page_class):
+    """
+    Returns every Locator of a page class, including inherited ones.
+
+    Args:
+        page_class (type): A BasePage subclass.
+
+    Returns:
+        dict[str, Locator]: Attribute names mapped to their locators.
+    """
+    locators = {}
+    for cls in reversed(page_class.__mro__):
+        locators.update(_registry.get(cls, {}))
+    return locators
+
+
+def registered_pages():
+    """
+    Returns every page class that declares locators, with its locators.
+
+    Only pages whose modules have been imported are known.
+
+    Returns:
+        dict[type, dict[str, Locator]]: Page classes mapped to locators_of() them.
+    """
+    return {page_class: locators_of(page_class) for page_class in list(_registry)}
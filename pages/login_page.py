@@ -5,34 +5,37 @@ as well as utilities for waiting for elements, handling alerts, and managing bro
 
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
-import yaml
 from pages.base_page import BasePage
 from pages.dashboard_page import DashboardPage
+from pages.locators import Locator
 from utils.logger import logger
 
-with open("config/config.yaml", "r", encoding="utf-8") as file:
-    config = yaml.safe_load(file)
-timeout = config.get("timeouts", {}).get("explicit", 10)
-
 
 class LoginPage(BasePage):
     """Login page class for login-specific functionalities."""
 
+    username_input = Locator(By.CSS_SELECTOR, "input[name='username']")
+    password_input = Locator(By.CSS_SELECTOR, "input[name='password']")
+    login_button = Locator(By.CSS_SELECTOR, "button[type='submit']")
+    error_message = Locator(By.CSS_SELECTOR, ".error-message")
+    welcome_message = Locator(By.CSS_SELECTOR, "h1.welcome")
+    dashboard_link = Locator(By.CSS_SELECTOR, "a.dashboard")
+
     def enter_username(self, username):
         """Enter the username in the login form."""
-        self.enter_text(username, By.CSS_SELECTOR, "input[name='username']")
+        self.enter_text(username, *LoginPage.username_input)
 
     def enter_password(self, password):
         """Enter the password in the login form."""
-        self.enter_text(password, By.CSS_SELECTOR, "input[name='password']")
+        self.enter_text(password, *LoginPage.password_input)
 
     def click_login(self):
         """Click the login button."""
-        self.click(By.CSS_SELECTOR, "button[type='submit']")
+        self.click(*LoginPage.login_button)
 
     def get_error_message(self):
         """Get the error message text if login fails."""
-        return self.find_element(By.CSS_SELECTOR, ".error-message").text
+        return self.get_text(*LoginPage.error_message)
 
     def login(self, username, password):
         """Perform the login action with the provided username and password."""
@@ -45,8 +48,7 @@ class LoginPage(BasePage):
     def is_login_successful(self):
         """Check if the login was successful by verifying the presence of a welcome message."""
         try:
-            welcome_message = self.find_element(By.CSS_SELECTOR, "h1.welcome")
-            return welcome_message.is_displayed()
+            return self.is_displayed(*LoginPage.welcome_message)
         except NoSuchElementException:
             logger.error("Login failed: Welcome message not found.")
             return False
@@ -54,7 +56,7 @@ class LoginPage(BasePage):
     def navigate_to_dashboard(self):
         """Navigate to the dashboard page after successful login."""
         if self.is_login_successful():
-            self.click(By.CSS_SELECTOR, "a.dashboard")
+            self.click(*LoginPage.dashboard_link)
             logger.info("Navigated to the dashboard page.")
             return DashboardPage(self.driver)
         else:
@@ -7,22 +7,29 @@ from selenium.common.exceptions import (
 )
 from utils.wait_helper import wait_for_element_presence
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.select import Select
 from utils.paths import get_absolute_path
 from utils.excel_reader import get_row_count, update_cell, load_sheet
-from openpyxl.styles import PatternFill
-from selenium.webdriver.remote.webdriver import WebDriver
-
+from pages.base_page import BasePage
 
 EXCEL_PATH = get_absolute_path("data", "excel_data.xlsx")
-GREEN_FILL = PatternFill(start_color="60b212", end_color="60b212", fill_type="solid")
-RED_FILL = PatternFill(start_color="ff0000", end_color="ff0000", fill_type="solid")
+
+# Empties the previous result before clicking Calculate, so that waiting for a
+# non-empty #futureValue waits for this row's result and nothing else
+CALCULATE_SCRIPT = """
+const result = document.getElementById("futureValue");
+if (result) result.textContent = "";
+arguments[0].click();
+"""
+RESULT_LOCATOR = (By.XPATH, "//*[@id='futureValue'][normalize-space()]")
 
 
-def find_element(driver: WebDriver, locator: tuple, data):
-    element = wait_for_element_presence(driver, locator)
-    element.clear()
-    element.send_keys(data)
+def result_fills():
+    """Returns the (pass, fail) cell fills, importing openpyxl only when the test runs."""
+    from openpyxl.styles import PatternFill
+
+    green = PatternFill(start_color="60b212", end_color="60b212", fill_type="solid")
+    red = PatternFill(start_color="ff0000", end_color="ff0000", fill_type="solid")
+    return green, red
 
 
 def test_fixed_deposit_calculator(setup_teardown):
@@ -39,6 +46,7 @@ def test_fixed_deposit_calculator(setup_teardown):
             logger.warning(f"Page load timeout, attempt {attempt + 1}, retrying...")
             time.sleep(5)
     file = EXCEL_PATH
+    green_fill, red_fill = result_fills()
 
     sheet = load_sheet(file, "Sheet3")
 
@@ -79,56 +87,42 @@ def test_fixed_deposit_calculator(setup_teardown):
 
             logger.info(f"Processing row {row}")
 
-            find_element(driver, (By.CSS_SELECTOR, "#amountInputField"), str(amount))
-            find_element(
-                driver, (By.CSS_SELECTOR, "#periodInputField"), str(period_value)
-            )
-
-            try:
-                Select(
-                    driver.find_element(By.ID, "amountSelectField")
-                ).select_by_visible_text(str(period_unit).strip())
-            except (NoSuchElementException, TimeoutException, ValueError) as e:
-                logger.error(f"Test failed due to: {type(e).__name__}: {e}")
-                update_cell(file, "Sheet3", idx, 8, value="fail", fill=RED_FILL)
-                continue
-
-            find_element(
-                driver, (By.CSS_SELECTOR, "#interestInputField"), str(interest)
-            )
-
             try:
-                Select(
-                    driver.find_element(By.ID, "frequencySelectField")
-                ).select_by_visible_text(str(frequency).strip())
+                BasePage(driver).fill_form(
+                    {
+                        (By.CSS_SELECTOR, "#amountInputField"): str(amount),
+                        (By.CSS_SELECTOR, "#periodInputField"): str(period_value),
+                        (By.ID, "amountSelectField"): str(period_unit).strip(),
+                        (By.CSS_SELECTOR, "#interestInputField"): str(interest),
+                        (By.ID, "frequencySelectField"): str(frequency).strip(),
+                    }
+                )
             except (NoSuchElementException, TimeoutException, ValueError) as e:
                 logger.error(f"Test failed due to: {type(e).__name__}: {e}")
-                update_cell(file, "Sheet3", idx, 8, value="fail", fill=RED_FILL)
+                update_cell(file, "Sheet3", idx, 8, value="fail", fill=red_fill)
                 continue
 
             try:
                 calc_btn = driver.find_element(By.ID, "calculateButton")
-                driver.execute_script("arguments[0].click();", calc_btn)
+                driver.execute_script(CALCULATE_SCRIPT, calc_btn)
             except (NoSuchElementException, TimeoutException, ValueError) as e:
                 logger.error(f"Test failed due to: {type(e).__name__}: {e}")
                 continue
 
             try:
-                result_elem = wait_for_element_presence(
-                    driver, (By.CSS_SELECTOR, "#futureValue")
-                )
+                result_elem = wait_for_element_presence(driver, RESULT_LOCATOR)
                 actual_value = float(result_elem.text.replace("Lakh", "").strip())
                 expected_value = float(expected_value)
 
                 if round(actual_value, 1) == round(expected_value, 1):
-                    update_cell(file, "Sheet3", idx, 8, value="pass", fill=GREEN_FILL)
+                    update_cell(file, "Sheet3", idx, 8, value="pass", fill=green_fill)
                 else:
-                    update_cell(file, "Sheet3", idx, 8, value="fail", fill=RED_FILL)
+                    update_cell(file, "Sheet3", idx, 8, value="fail", fill=red_fill)
 
             except (NoSuchElementException, TimeoutException, ValueError) as e:
                 logger.error(f"[Row {row}] Error during calculation: {e}")
                 pytest.fail(f"Test failed due to: {type(e).__name__}: {e}")
-                update_cell(file, "Sheet3", idx, 8, value="fail", fill=RED_FILL)
+                update_cell(file, "Sheet3", idx, 8, value="fail", fill=red_fill)
 
     except (NoSuchElementException, TimeoutException, ValueError) as e:
         logger.error(f"Test failed due to: {type(e).__name__}: {e}")
@@ -5,37 +5,49 @@ This script reads test cases from a MySQL database, runs them against a web-base
 calculator using Selenium, and updates the database with the test results.
 """
 
-from mysql.connector import connect
-from mysql.connector import Error
 from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
     WebDriverException,
 )
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.select import Select
 from utils.logger import logger
 import os
 import dotenv
 from utils.wait_helper import wait_for_element_presence
 import pytest
-from selenium.webdriver.remote.webdriver import WebDriver
-from openpyxl.styles import PatternFill
+from pages.base_page import BasePage
 
 dotenv.load_dotenv()
 
-DB_CONFIG = {
-    "host": os.getenv("DATABASE_HOST"),
-    "port": int(os.getenv("DATABASE_PORT")),
-    "user": os.getenv("DATABASE_USER"),
-    "password": os.getenv("DATABASE_PASSWORD"),
-    "database": os.getenv("DATABASE_NAME"),
-}
+# Empties the previous result before clicking Calculate, so that waiting for a
+# non-empty #futureValue waits for this row's result and nothing else
+CALCULATE_SCRIPT = """
+const result = document.getElementById("futureValue");
+if (result) result.textContent = "";
+arguments[0].click();
+"""
+RESULT_LOCATOR = (By.XPATH, "//*[@id='futureValue'][normalize-space()]")
+
+
+def get_db_config() -> dict:
+    """Reads and validates the database settings when a test first needs them."""
+    db_config = {
+        "host": os.getenv("DATABASE_HOST"),
+        "port": os.getenv("DATABASE_PORT"),
+        "user": os.getenv("DATABASE_USER"),
+        "password": os.getenv("DATABASE_PASSWORD"),
+        "database": os.getenv("DATABASE_NAME"),
+    }
+
+    for key, value in db_config.items():
+        if value is None or str(value).strip() == "":
+            logger.error(f"{key} is missing or blank in the .env file.")
+            raise ValueError(f"Missing environment variable: {key}")
+
+    db_config["port"] = int(db_config["port"])
+    return db_config
 
-for key, value in DB_CONFIG.items():
-    if value is None or str(value).strip() == "":
-        logger.error(f"{key} is missing or blank in the .env file.")
-        raise ValueError(f"Missing environment variable: {key}")
 
 DB_OPERATIONS = {
     "CREATE_TABLE": """
@@ -75,8 +87,10 @@ DB_OPERATIONS = {
 
 
 def init_db():
+    from mysql.connector import Error, connect
+
     try:
-        with connect(**DB_CONFIG) as connection:
+        with connect(**get_db_config()) as connection:
             with connection.cursor() as cursor:
                 cursor.execute(DB_OPERATIONS["CREATE_TABLE"])
                 connection.commit()
@@ -93,8 +107,10 @@ def init_db():
 
 
 def get_test_data() -> list[dict]:
+    from mysql.connector import Error, connect
+
     try:
-        with connect(**DB_CONFIG) as connection:
+        with connect(**get_db_config()) as connection:
             with connection.cursor(dictionary=True) as cursor:
                 cursor.execute(DB_OPERATIONS["SELECT"])
                 test_data = cursor.fetchall()
@@ -107,6 +123,8 @@ def get_test_data() -> list[dict]:
 
 def update_results_in_db(results: list[dict]):
     """Updates the test results in the database in a single batch."""
+    from mysql.connector import Error, connect
+
     if not results:
         logger.warning("No results to update.")
         return
@@ -116,7 +134,7 @@ def update_results_in_db(results: list[dict]):
 
     print(f"\nUpdating database: {passed_count} passed, {failed_count} failed.")
     try:
-        with connect(**DB_CONFIG) as connection:
+        with connect(**get_db_config()) as connection:
             with connection.cursor() as cursor:
                 for result in results:
                     query = (
@@ -131,17 +149,13 @@ def update_results_in_db(results: list[dict]):
         logger.error(f"Database error while updating results: {e}")
 
 
-def find_element(driver: WebDriver, locator: tuple, data):
-    element = wait_for_element_presence(driver, locator)
-    element.clear()
-    element.send_keys(data)
-
-
 @pytest.mark.skipif(
     not os.getenv("DATABASE_PASSWORD"), reason="Database credentials not available"
 )
 def test_fixed_deposit_calculator(setup_teardown):
     """Orchestrates the data-driven test for the fixed deposit calculator."""
+    from mysql.connector import Error
+
     all_test_data = get_test_data()
     if len(all_test_data) == 0:
         logger.warning("No test data found in the database.")
@@ -171,36 +185,30 @@ def test_fixed_deposit_calculator(setup_teardown):
 
             row_id = test_case["id"]
             try:
-                find_element(
-                    driver,
-                    (By.CSS_SELECTOR, "#amountInputField"),
-                    str(test_case["fd_amount_rs"]),
-                )
-                find_element(
-                    driver,
-                    (By.CSS_SELECTOR, "#periodInputField"),
-                    str(test_case["fd_period_value"]),
-                )
-                Select(
-                    driver.find_element(By.ID, "amountSelectField")
-                ).select_by_visible_text(str(test_case["fd_period_unit"]).strip())
-
-                find_element(
-                    driver,
-                    (By.CSS_SELECTOR, "#interestInputField"),
-                    str(test_case["interest_rate"]),
+                BasePage(driver).fill_form(
+                    {
+                        (By.CSS_SELECTOR, "#amountInputField"): str(
+                            test_case["fd_amount_rs"]
+                        ),
+                        (By.CSS_SELECTOR, "#periodInputField"): str(
+                            test_case["fd_period_value"]
+                        ),
+                        (By.ID, "amountSelectField"): str(
+                            test_case["fd_period_unit"]
+                        ).strip(),
+                        (By.CSS_SELECTOR, "#interestInputField"): str(
+                            test_case["interest_rate"]
+                        ),
+                        (By.ID, "frequencySelectField"): test_case[
+                            "compounding_frequency"
+                        ],
+                    }
                 )
 
-                Select(
-                    driver.find_element(By.ID, "frequencySelectField")
-                ).select_by_visible_text(test_case["compounding_frequency"])
-
                 calc_btn = driver.find_element(By.ID, "calculateButton")
-                driver.execute_script("arguments[0].click();", calc_btn)
+                driver.execute_script(CALCULATE_SCRIPT, calc_btn)
 
-                result_elem = wait_for_element_presence(
-                    driver, (By.CSS_SELECTOR, "#futureValue")
-                )
+                result_elem = wait_for_element_presence(driver, RESULT_LOCATOR)
 
                 actual_value = float(result_elem.text.replace("Lakh", ""))
                 expected_value = float(test_case["maturity_amount_lakh"])
@@ -1,4 +1,3 @@
-import yaml
 from utils.custom_assertions import (
     assert_element_is_displayed,
     assert_element_text,
@@ -10,15 +9,13 @@ from utils.paths import get_absolute_path
 import os
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-
-with open("config/config.yaml", "r", encoding="utf-8") as file:
-    config = yaml.safe_load(file)
+from utils.config import get_config
 
 
 def test_app_commands(setup_teardown):
     driver = setup_teardown
     driver.get("https://testpages.eviltester.com/styled/basic-html-form-test.html")
-    driver.implicitly_wait(config["implicit_wait"])
+    driver.implicitly_wait(get_config().implicit_wait)
     # driver.implicitly_wait(config.get("timeouts", {}).get("implicit", 10))
 
     try:
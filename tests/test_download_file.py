@@ -1,4 +1,3 @@
-from logging import config
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
@@ -6,11 +5,11 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from utils.wait_helper import wait_for_element_presence
 from utils.logger import logger
 import pytest
-import yaml
 import time
 
-with open("config/config.yaml", "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
+from utils.config import get_config
+
+config = get_config()
 
 
 def test_file_download(setup_teardown):
@@ -28,7 +27,7 @@ def test_file_download(setup_teardown):
         file.click()
         time.sleep(5)  # Wait for the download to start
         # assert wait_for_file_download(
-        #     config["download_directory"], "test.txt", timeout=15
+        #     config.download_directory, "test.txt", timeout=15
         # ), "File not fully downloaded"
         logger.info("Test passed: test file download")
 
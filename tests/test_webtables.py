@@ -1,9 +1,5 @@
 from selenium.webdriver.common.by import By
-from utils.wait_helper import (
-    wait_for_element_presence,
-    wait_for_elements_presence,
-    wait_for_element_visibility,
-)
+from utils.table_helper import read_table
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import pytest
 from utils.logger import logger
@@ -14,43 +10,23 @@ def test_static_table(setup_teardown):
     try:
         driver.get("https://testautomationpractice.blogspot.com/")
 
-        # no of rows and columns
-        rows = wait_for_elements_presence(
-            driver, (By.XPATH, "//table[@name='BookTable']/tbody/tr")
-        )
-        columns = wait_for_elements_presence(
-            driver, (By.XPATH, "//table[@name='BookTable']/tbody/tr[1]/th")
-        )
+        # read the headers and every row in one lookup
+        table = read_table(driver, (By.XPATH, "//table[@name='BookTable']"))
+        rows, columns = table.rows, table.headers
 
         # read specific row and column data
-        heading = wait_for_element_presence(
-            driver, (By.XPATH, "//table[@name='BookTable']/tbody/tr[1]/th[1] ")
-        ).text
-        data = wait_for_element_presence(
-            driver, (By.XPATH, "//table[@name='BookTable']/tbody/tr[2]/td[1] ")
-        ).text
-
-        # read all rows and columns data
-        for r in range(2, len(rows) + 1):
-            for c in range(1, len(columns) + 1):
-                data = driver.find_element(
-                    By.XPATH, f"//table[@name='BookTable']/tbody/tr[{r}]/td[{c}]"
-                ).text
+        heading = columns[0]
+        data = rows[0][0]
+
+        for row in rows:
+            for data in row:
                 logger.info(data, end="   ")
             logger.info("")
 
         # read data based on conditions
-        for r in range(2, len(rows) + 1):
-            author_name = driver.find_element(
-                By.XPATH, f"//table[@name='BookTable']/tbody/tr[{r}]/td[2]"
-            ).text
+        for row in rows:
+            book_name, author_name, price = row[0], row[1], row[3]
             if author_name == "Mukesh":
-                book_name = driver.find_element(
-                    By.XPATH, f"//table[@name='BookTable']/tbody/tr[{r}]/td[1]"
-                ).text
-                price = driver.find_element(
-                    By.XPATH, f"//table[@name='BookTable']/tbody/tr[{r}]/td[4]"
-                ).text
                 logger.info(book_name, "  ", author_name, "  ", price)
     except (TimeoutException, NoSuchElementException) as e:
         logger.error(f"Test failed due to: {type(e).__name__}: {e}")
@@ -62,44 +38,66 @@ def test_dynamic_table(setup_teardown):
     try:
         driver.get("https://testautomationpractice.blogspot.com/")
 
-        # no of rows and columns
-        rows = wait_for_elements_presence(
-            driver, (By.XPATH, "//table[@name='BookTable']/tbody/tr")
-        )
-        columns = wait_for_elements_presence(
-            driver, (By.XPATH, "//table[@name='BookTable']/tbody/tr[1]/th")
-        )
+        # read the headers and every row in one lookup
+        table = read_table(driver, (By.XPATH, "//table[@name='BookTable']"))
+        rows, columns = table.rows, table.headers
 
         # read specific row and column data
-        heading = wait_for_element_presence(
-            driver, (By.XPATH, "//table[@name='BookTable']/tbody/tr[1]/th[1] ")
-        ).text
-        data = wait_for_element_presence(
-            driver, (By.XPATH, "//table[@name='BookTable']/tbody/tr[2]/td[1] ")
-        ).text
-
-        # read all rows and columns data
-        for r in range(2, len(rows) + 1):
-            for c in range(1, len(columns) + 1):
-                data = driver.find_element(
-                    By.XPATH, f"//table[@name='BookTable']/tbody/tr[{r}]/td[{c}]"
-                ).text
+        heading = columns[0]
+        data = rows[0][0]
+
+        for row in rows:
+            for data in row:
                 print(data, end="   ")
             print()
 
         # read data based on conditions
-        for r in range(2, len(rows) + 1):
-            author_name = driver.find_element(
-                By.XPATH, f"//table[@name='BookTable']/tbody/tr[{r}]/td[2]"
-            ).text
+        for row in rows:
+            book_name, author_name, price = row[0], row[1], row[3]
             if author_name == "Mukesh":
-                book_name = driver.find_element(
-                    By.XPATH, f"//table[@name='BookTable']/tbody/tr[{r}]/td[1]"
-                ).text
-                price = driver.find_element(
-                    By.XPATH, f"//table[@name='BookTable']/tbody/tr[{r}]/td[4]"
-                ).text
                 print(book_name, "  ", author_name, "  ", price)
     except (TimeoutException, NoSuchElementException) as e:
         logger.info(f"Test failed due to: {type(e).__name__}: {e}")
         pytest.fail(f"Test failed due to: {type(e).__name__}: {e}")
+
+
+# A table paginated three rows at a time whose pager is rebuilt on every page change
+_REPAGINATING_TABLE = """
+const rows = Array.from({length: 7}, (_, i) => ["Book " + i, "Author " + (i % 3)]);
+const pager = document.createElement("div");
+const table = document.createElement("table");
+table.id = "books";
+document.body.replaceChildren(table, pager);
+function show(page) {
+    table.innerHTML = "<tr><th>Name</th><th>Author</th></tr>" + rows
+        .slice(page * 3, page * 3 + 3)
+        .map((row) => "<tr><td>" + row.join("</td><td>") + "</td></tr>")
+        .join("");
+    pager.innerHTML = "";
+    for (let i = 0; i < 3; i++) {
+        const link = document.createElement("a");
+        link.href = "#";
+        link.className = "page";
+        link.textContent = String(i + 1);
+        link.onclick = () => setTimeout(() => show(i), 100);
+        pager.appendChild(link);
+    }
+}
+show(0);
+"""
+
+
+def test_paginated_table_with_rerendered_pager(setup_teardown):
+    driver = setup_teardown
+    try:
+        driver.get("about:blank")
+        driver.execute_script(_REPAGINATING_TABLE)
+
+        table = read_table(driver, (By.ID, "books"), pager=(By.CSS_SELECTOR, "a.page"))
+
+        assert table.complete
+        assert table.headers == ["Name", "Author"]
+        assert [row[0] for row in table.rows] == [f"Book {i}" for i in range(7)]
+    except (TimeoutException, NoSuchElementException) as e:
+        logger.error(f"Test failed due to: {type(e).__name__}: {e}")
+        pytest.fail(f"Test failed due to: {type(e).__name__}: {e}")
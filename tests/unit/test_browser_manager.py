@@ -0,0 +1,41 @@
+import os
+import tempfile
+import time
+import pytest
+from utils.browser_manager import sweep_stale_browser_dirs
+
+
+@pytest.fixture
+def temp_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def make_dir(parent, name, age_hours):
+    path = parent / name
+    path.mkdir()
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_only_old_browser_directories_are_removed(temp_dir):
+    stale = [
+        make_dir(temp_dir, "scoped_dir123_456", 48),
+        make_dir(temp_dir, ".org.chromium.Chromium.abc", 48),
+        make_dir(temp_dir, "chrome_user_data_gw0_1a2b", 48),
+    ]
+    recent = make_dir(temp_dir, "scoped_dir789_1", 1)
+    unrelated = make_dir(temp_dir, "pytest-of-user", 48)
+
+    assert sweep_stale_browser_dirs(max_age_hours=24) == 3
+    assert not any(path.exists() for path in stale)
+    assert recent.exists()
+    assert unrelated.exists()
+
+
+def test_sweep_is_bounded(temp_dir):
+    for i in range(5):
+        make_dir(temp_dir, f"scoped_dir{i}", 48)
+    assert sweep_stale_browser_dirs(limit=2) == 2
+    assert len(list(temp_dir.glob("scoped_dir*"))) == 3
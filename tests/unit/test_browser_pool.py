@@ -0,0 +1,100 @@
+import pytest
+from utils import browser_pool
+from utils.browser_pool import BrowserPool, PoolStats
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(browser_pool, "pool_stats", PoolStats())
+
+
+class FakeManager:
+    """Stands in for BrowserManager: resets succeed unless a failure is given."""
+
+    def __init__(self, strategy="normal", reset_failure=None):
+        self.browser_name = "chrome"
+        self.page_load_strategy = strategy
+        self.reset_failure = None
+        self.failure = reset_failure
+        self.quit = False
+
+    def is_alive(self):
+        return not self.quit
+
+    def reset_session(self):
+        self.reset_failure = self.failure
+        return self.failure is None
+
+    def quit_browser(self):
+        self.quit = True
+
+
+class FakeLauncher:
+    def __init__(self):
+        self.prefetches = 0
+
+    def take(self, strategy):
+        return FakeManager(strategy)
+
+    def prefetch(self):
+        self.prefetches += 1
+
+
+def make_pool(size=2):
+    pool = BrowserPool(browser_name="chrome", size=size)
+    pool.launcher = FakeLauncher()
+    return pool
+
+
+def test_released_browser_is_reused():
+    pool = make_pool()
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert browser_pool.pool_stats.summary() == {
+        "reused": 1,
+        "launched": 1,
+        "reset_fallbacks": {},
+    }
+
+
+def test_failed_reset_quits_the_browser_and_counts_the_reason():
+    pool = make_pool()
+    for failure in ("no CDP or event stream", "no CDP or event stream", "no driver"):
+        manager = FakeManager(reset_failure=failure)
+        pool.release(manager)
+        assert manager.quit
+    assert not pool._idle
+    assert browser_pool.pool_stats.summary()["reset_fallbacks"] == {
+        "no CDP or event stream": 2,
+        "no driver": 1,
+    }
+
+
+def test_browsers_that_may_not_be_reused_are_not_counted_as_fallbacks():
+    pool = make_pool()
+    manager = FakeManager()
+    pool.release(manager, reuse=False)
+    assert manager.quit
+    assert browser_pool.pool_stats.summary()["reset_fallbacks"] == {}
+
+
+def test_prepare_next_ignores_idle_browsers_with_another_strategy():
+    pool = make_pool()
+    pool.release(FakeManager("eager"))
+
+    pool.prepare_next(current_isolated=True, next_isolated=False)
+    assert pool.launcher.prefetches == 1
+
+    pool.prepare_next(
+        current_isolated=True, next_isolated=False, page_load_strategy="eager"
+    )
+    assert pool.launcher.prefetches == 1
+
+
+def test_prepare_next_counts_the_current_browser_unless_it_is_discarded():
+    pool = make_pool()
+    pool.prepare_next(current_isolated=False, next_isolated=False)
+    assert pool.launcher.prefetches == 0
+    pool.prepare_next(current_isolated=False, next_isolated=True)
+    assert pool.launcher.prefetches == 1
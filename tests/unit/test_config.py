@@ -0,0 +1,83 @@
+import dataclasses
+import os
+import pytest
+from utils.config import ENV_PREFIX, RemoteSettings, Settings, _build, _coerce
+
+
+@pytest.fixture(autouse=True)
+def no_env_overrides(monkeypatch):
+    """Drop SELENIUM_* variables from the real environment during each test."""
+    for name in list(os.environ):
+        if name.startswith(ENV_PREFIX):
+            monkeypatch.delenv(name)
+
+
+@pytest.mark.parametrize("value", ["1", "true", " Yes ", "ON"])
+def test_coerce_true(value):
+    assert _coerce(value, bool) is True
+
+
+@pytest.mark.parametrize("value", ["0", "false", "no", ""])
+def test_coerce_false(value):
+    assert _coerce(value, bool) is False
+
+
+def test_coerce_numbers():
+    assert _coerce("42", int) == 42
+    assert _coerce("2.5", float) == 2.5
+    with pytest.raises(ValueError):
+        _coerce("fast", int)
+
+
+def test_coerce_tuple_splits_comma_separated_values():
+    assert _coerce(" *ads.com* , ,*tracker.io*", tuple) == ("*ads.com*", "*tracker.io*")
+    assert _coerce(["a", "b"], tuple) == ("a", "b")
+
+
+def test_coerce_leaves_typed_values_and_strings_alone():
+    assert _coerce(30, int) == 30
+    assert _coerce(False, bool) is False
+    assert _coerce("007", str) == "007"
+
+
+def test_defaults():
+    assert _build(Settings, {}, ENV_PREFIX) == Settings()
+
+
+def test_yaml_values():
+    settings = _build(
+        Settings,
+        {"browser": "firefox", "timeout": 5, "network_blocklist": ["*ads*"]},
+        ENV_PREFIX,
+    )
+    assert (settings.browser, settings.timeout) == ("firefox", 5)
+    assert settings.network_blocklist == ("*ads*",)
+
+
+def test_environment_overrides_yaml(monkeypatch):
+    monkeypatch.setenv("SELENIUM_BROWSER", "edge")
+    monkeypatch.setenv("SELENIUM_HEADLESS", "true")
+    monkeypatch.setenv("SELENIUM_EXPLICIT_WAIT", "2.5")
+
+    settings = _build(Settings, {"browser": "firefox", "headless": False}, ENV_PREFIX)
+
+    assert settings.browser == "edge"
+    assert settings.headless is True
+    assert settings.explicit_wait == 2.5
+
+
+def test_environment_overrides_nested_settings(monkeypatch):
+    monkeypatch.setenv("SELENIUM_REMOTE_URL", "http://grid:4444")
+    settings = _build(Settings, {"remote": {"pool_size": 4}}, ENV_PREFIX)
+    assert settings.remote == RemoteSettings(url="http://grid:4444", pool_size=4)
+
+
+def test_null_and_unknown_keys_are_ignored():
+    settings = _build(Settings, {"browser": None, "no_such_key": 1}, ENV_PREFIX)
+    assert settings.browser == Settings().browser
+    assert not hasattr(settings, "no_such_key")
+
+
+def test_settings_are_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        Settings().browser = "firefox"
@@ -0,0 +1,95 @@
+import os
+import pytest
+from utils import disk_cache
+from utils.disk_cache import LAST_USED_FILE, LOCK_FILE, _evict, _try_lock, claim_slot
+
+pytestmark = pytest.mark.skipif(
+    disk_cache.fcntl is None, reason="the shared disk cache needs fcntl locks"
+)
+
+
+def make_slot(root, name, size, last_used):
+    """Create a slot holding ``size`` bytes that was last used at ``last_used``."""
+    path = os.path.join(root, name)
+    os.makedirs(os.path.join(path, "Cache_Data"))
+    with open(os.path.join(path, "Cache_Data", "data_0"), "wb") as f:
+        f.write(b"x" * size)
+    marker = os.path.join(path, LAST_USED_FILE)
+    open(marker, "w").close()
+    os.utime(marker, (last_used, last_used))
+    return path
+
+
+def cached_bytes(path):
+    data = os.path.join(path, "Cache_Data", "data_0")
+    return os.path.getsize(data) if os.path.exists(data) else 0
+
+
+def test_evict_empties_least_recently_used_first(tmp_path):
+    oldest = make_slot(tmp_path, "slot_0", 400, last_used=1000)
+    middle = make_slot(tmp_path, "slot_1", 400, last_used=2000)
+    newest = make_slot(tmp_path, "slot_2", 400, last_used=3000)
+
+    _evict([oldest, middle, newest], keep=newest, max_bytes=900)
+
+    assert cached_bytes(oldest) == 0
+    assert cached_bytes(middle) == 400
+    assert cached_bytes(newest) == 400
+    # The slot itself and its lock file survive eviction
+    assert os.path.isdir(oldest)
+
+
+def test_evict_does_nothing_under_the_cap(tmp_path):
+    slots = [make_slot(tmp_path, f"slot_{i}", 100, last_used=i + 1) for i in range(3)]
+    _evict(slots, keep=slots[-1], max_bytes=1000)
+    assert [cached_bytes(path) for path in slots] == [100, 100, 100]
+
+
+def test_evict_skips_the_kept_slot(tmp_path):
+    kept = make_slot(tmp_path, "slot_0", 800, last_used=1000)
+    other = make_slot(tmp_path, "slot_1", 400, last_used=2000)
+
+    _evict([kept, other], keep=kept, max_bytes=500)
+
+    assert cached_bytes(kept) == 800
+    assert cached_bytes(other) == 0
+
+
+def test_evict_skips_slots_locked_by_another_browser(tmp_path):
+    busy = make_slot(tmp_path, "slot_0", 400, last_used=1000)
+    idle = make_slot(tmp_path, "slot_1", 400, last_used=2000)
+    newest = make_slot(tmp_path, "slot_2", 400, last_used=3000)
+
+    fd = _try_lock(busy)
+    try:
+        _evict([busy, idle, newest], keep=newest, max_bytes=900)
+    finally:
+        disk_cache.fcntl.flock(fd, disk_cache.fcntl.LOCK_UN)
+        os.close(fd)
+
+    assert cached_bytes(busy) == 400
+    assert cached_bytes(idle) == 0
+    assert os.path.exists(os.path.join(busy, LOCK_FILE))
+
+
+def test_claim_slot_prefers_the_warmest_free_slot(tmp_path):
+    make_slot(tmp_path, "slot_0", 10, last_used=1000)
+    make_slot(tmp_path, "slot_1", 10, last_used=3000)
+
+    first = claim_slot(str(tmp_path), size_mb=1, max_slots=3)
+    second = claim_slot(str(tmp_path), size_mb=1, max_slots=3)
+    try:
+        assert first.path == os.path.join(tmp_path, "slot_1")
+        assert second.path == os.path.join(tmp_path, "slot_0")
+    finally:
+        first.release()
+        second.release()
+
+
+def test_claim_slot_returns_none_when_every_slot_is_in_use(tmp_path):
+    slot = claim_slot(str(tmp_path), size_mb=1, max_slots=1)
+    try:
+        assert claim_slot(str(tmp_path), size_mb=1, max_slots=1) is None
+    finally:
+        slot.release()
+    assert os.path.exists(os.path.join(slot.path, LAST_USED_FILE))
@@ -0,0 +1,112 @@
+import os
+from unittest import mock
+import openpyxl
+import pytest
+from utils import excel_reader
+from utils.excel_reader import (
+    clear_cache,
+    get_row_count,
+    iter_rows,
+    load_sheet,
+    read_data,
+    update_cell,
+)
+
+SHEET = "Sheet1"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def write_rows(path, rows):
+    workbook = openpyxl.Workbook()
+    workbook.active.title = SHEET
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    return path
+
+
+def users_file(tmp_path):
+    return write_rows(
+        str(tmp_path / "users.xlsx"),
+        [("username", "password"), ("alice", "one"), ("bob", "two")],
+    )
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**10))
+
+
+def counting_loads():
+    """Patches openpyxl.load_workbook so each real parse can be counted."""
+    return mock.patch.object(openpyxl, "load_workbook", wraps=openpyxl.load_workbook)
+
+
+def test_workbook_is_parsed_once(tmp_path):
+    path = users_file(tmp_path)
+    with counting_loads() as load:
+        assert read_data(path, SHEET, 2, 1) == "alice"
+        assert get_row_count(path, SHEET) == 3
+        assert load_sheet(path, SHEET) is load_sheet(path, SHEET)
+    assert load.call_count == 1
+
+
+def test_relative_and_absolute_paths_share_an_entry(tmp_path):
+    path = users_file(tmp_path)
+    with counting_loads() as load:
+        assert load_sheet(os.path.relpath(path), SHEET) is load_sheet(path, SHEET)
+    assert load.call_count == 1
+
+
+def test_rewritten_file_is_parsed_again(tmp_path):
+    path = users_file(tmp_path)
+    assert read_data(path, SHEET, 2, 1) == "alice"
+
+    write_rows(path, [("username",), ("carol",), ("dave",), ("erin",)])
+    bump_mtime(path)
+
+    assert read_data(path, SHEET, 2, 1) == "carol"
+    assert get_row_count(path, SHEET) == 4
+
+
+def test_touched_file_is_parsed_again(tmp_path):
+    path = users_file(tmp_path)
+    first = load_sheet(path, SHEET)
+    bump_mtime(path)
+    assert load_sheet(path, SHEET) is not first
+
+
+def test_update_cell_keeps_the_saved_workbook_cached(tmp_path):
+    path = users_file(tmp_path)
+    with counting_loads() as load:
+        update_cell(path, SHEET, 2, 3, value="pass")
+        assert read_data(path, SHEET, 2, 3) == "pass"
+    assert load.call_count == 1
+
+    version, _ = excel_reader._workbooks[(os.path.abspath(path), False)]
+    assert version == excel_reader._file_version(path)
+
+    # A fresh parse sees the value on disk
+    clear_cache()
+    assert read_data(path, SHEET, 2, 3) == "pass"
+
+
+def test_update_cell_drops_the_streaming_workbook(tmp_path):
+    path = users_file(tmp_path)
+    assert list(iter_rows(path, SHEET, min_row=2)) == [("alice", "one"), ("bob", "two")]
+
+    update_cell(path, SHEET, 3, 2, value="three")
+
+    assert (os.path.abspath(path), True) not in excel_reader._workbooks
+    assert list(iter_rows(path, SHEET, min_row=3)) == [("bob", "three")]
+
+
+def test_missing_sheet(tmp_path):
+    with pytest.raises(ValueError, match="does not exist"):
+        load_sheet(users_file(tmp_path), "Sheet2")
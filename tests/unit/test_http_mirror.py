@@ -0,0 +1,89 @@
+import os
+from utils.http_mirror import HttpArchive, _safe_name
+
+TEST = "tests/test_login.py::test_login"
+OTHER_TEST = "tests/test_search.py::test_search"
+HEADERS = [["Content-Type", "text/html"]]
+
+
+def recorded_archive(root):
+    """An archive with one saved recording per test, read back from disk."""
+    archive = HttpArchive(root)
+    archive.start_test(TEST, clear=True)
+    key = HttpArchive.request_key("GET", "https://example.com/?page=1")
+    archive.record(TEST, key, 200, "OK", HEADERS, b"first")
+    archive.record(TEST, key, 200, "OK", HEADERS, b"second")
+    archive.save(TEST)
+
+    archive.start_test(OTHER_TEST, clear=True)
+    key = HttpArchive.request_key("GET", "https://example.com/logo.png")
+    archive.record(OTHER_TEST, key, 200, "OK", [], b"png")
+    archive.save(OTHER_TEST)
+    return HttpArchive(root)
+
+
+def test_request_key_includes_a_hash_of_the_body():
+    assert HttpArchive.request_key("GET", "https://a.test/") == "GET https://a.test/"
+    first = HttpArchive.request_key("POST", "https://a.test/", b'{"q": 1}')
+    second = HttpArchive.request_key("POST", "https://a.test/", b'{"q": 2}')
+    assert first.startswith("POST https://a.test/ ")
+    assert first != second
+
+
+def test_safe_name():
+    assert _safe_name("tests/test_a.py::test_b[chrome-1]") == (
+        "tests_test_a.py_test_b_chrome-1"
+    )
+    assert _safe_name("::") == "session"
+
+
+def test_repeated_requests_replay_in_order_then_repeat_the_last(tmp_path):
+    archive = recorded_archive(str(tmp_path))
+    archive.start_test(TEST)
+    key = HttpArchive.request_key("GET", "https://example.com/?page=1")
+
+    bodies = [archive.lookup(TEST, key)[3] for _ in range(3)]
+    assert bodies == [b"first", b"second", b"second"]
+
+    # Starting the test again replays from the first response
+    archive.start_test(TEST)
+    assert archive.lookup(TEST, key) == (200, "OK", HEADERS, b"first")
+
+
+def test_lookup_falls_back_to_other_tests_and_to_the_url_without_query(tmp_path):
+    archive = recorded_archive(str(tmp_path))
+    archive.start_test(TEST)
+
+    logo = HttpArchive.request_key("GET", "https://example.com/logo.png")
+    assert archive.lookup(TEST, logo)[3] == b"png"
+
+    other_page = HttpArchive.request_key("GET", "https://example.com/?page=2")
+    assert archive.lookup(TEST, other_page)[3] == b"first"
+
+
+def test_lookup_misses(tmp_path):
+    archive = recorded_archive(str(tmp_path))
+    archive.start_test(TEST)
+    assert archive.lookup(TEST, "GET https://example.com/missing") is None
+    # Same URL, different method
+    assert archive.lookup(TEST, "POST https://example.com/?page=1") is None
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    archive = HttpArchive(str(tmp_path))
+    archive.start_test(TEST, clear=True)
+    archive.record(TEST, "GET https://a.test/1", 200, "OK", [], b"same")
+    archive.record(TEST, "GET https://a.test/2", 200, "OK", [], b"same")
+    assert len(os.listdir(archive.bodies_dir)) == 1
+
+
+def test_record_mode_clears_the_previous_recording(tmp_path):
+    archive = recorded_archive(str(tmp_path))
+    archive.start_test(TEST, clear=True)
+    archive.record(TEST, "GET https://example.com/new", 200, "OK", [], b"new")
+    archive.save(TEST)
+
+    replay = HttpArchive(str(tmp_path))
+    replay.start_test(TEST)
+    assert replay.lookup(TEST, "GET https://example.com/new")[3] == b"new"
+    assert replay._load(TEST).keys() == {"GET https://example.com/new"}
@@ -0,0 +1,125 @@
+import lxml.html
+import pytest
+from utils.locator_validator import (
+    AMBIGUOUS,
+    INVALID,
+    UNCHECKED,
+    UNMATCHED,
+    LocatorSource,
+    UnsupportedLocator,
+    check_locator,
+    collect_test_locators,
+    load_snapshots,
+    to_xpath,
+)
+
+LOGIN_PAGE = """
+<html><body>
+  <form id="login">
+    <input name="username" class="field wide"><input name="password" class="field">
+    <button type="submit">Log in</button>
+  </form>
+  <a href="/help">Don't know your password?</a>
+</body></html>
+"""
+
+
+def snapshots(*pages):
+    return {
+        f"page_{i}.html": lxml.html.document_fromstring(page)
+        for i, page in enumerate(pages)
+    }
+
+
+def check(by, value, *pages, multiple=False):
+    source = LocatorSource(by, value, "test", multiple)
+    return check_locator(source, snapshots(*pages))
+
+
+@pytest.mark.parametrize(
+    "by, value, expected",
+    [
+        ("xpath", "//form", "//form"),
+        ("id", "login", "descendant-or-self::*[@id = 'login']"),
+        ("name", "user.name", "descendant-or-self::*[@name = 'user.name']"),
+        ("tag name", "input", "descendant-or-self::input"),
+        ("link text", " Log in ", "//a[normalize-space(.)='Log in']"),
+        ("link text", "Don't", '//a[normalize-space(.)="Don\'t"]'),
+        ("partial link text", "help", "//a[contains(., 'help')]"),
+    ],
+)
+def test_to_xpath(by, value, expected):
+    assert to_xpath(by, value) == expected
+
+
+def test_to_xpath_quotes_text_with_both_quote_kinds():
+    assert to_xpath("partial link text", 'it\'s "here"') == (
+        "//a[contains(., concat('it', \"'\", 's \"here\"'))]"
+    )
+
+
+def test_to_xpath_rejects_invalid_selectors():
+    with pytest.raises(ValueError, match="Invalid CSS selector"):
+        to_xpath("css selector", "div >> p")
+    with pytest.raises(ValueError, match="Unsupported locator strategy"):
+        to_xpath("accessibility id", "Login")
+
+
+def test_to_xpath_reports_css_cssselect_cannot_evaluate():
+    with pytest.raises(UnsupportedLocator):
+        to_xpath("css selector", "input::placeholder")
+
+
+def test_check_locator_matches():
+    assert check("css selector", "#login button", LOGIN_PAGE)[0] is None
+    assert check("class name", "wide", LOGIN_PAGE)[0] is None
+    assert check("link text", "Don't know your password?", LOGIN_PAGE)[0] is None
+
+
+def test_check_locator_problems():
+    assert check("css selector", "input.field", LOGIN_PAGE)[0] == AMBIGUOUS
+    assert check("css selector", "#missing", LOGIN_PAGE)[0] == UNMATCHED
+    assert check("xpath", "//input[", LOGIN_PAGE)[0] == INVALID
+    assert check("xpath", "count(//input)", LOGIN_PAGE)[0] == INVALID
+    assert check("css selector", "p::first-line", LOGIN_PAGE)[0] == UNCHECKED
+
+
+def test_several_matches_are_fine_for_find_elements():
+    assert check("css selector", "input.field", LOGIN_PAGE, multiple=True)[0] is None
+
+
+def test_without_snapshots_locators_are_only_compiled():
+    assert check("css selector", "#missing") == (None, "compiles")
+    assert check("xpath", "//input[")[0] == INVALID
+
+
+def test_a_match_in_any_snapshot_is_enough():
+    problem, detail = check("id", "login", "<html><body></body></html>", LOGIN_PAGE)
+    assert problem is None
+    assert detail == "matches in 1 snapshot(s)"
+
+
+def test_collect_test_locators(tmp_path):
+    (tmp_path / "test_login.py").write_text(
+        "from selenium.webdriver.common.by import By\n"
+        "\n"
+        "def test_login(driver):\n"
+        '    driver.find_element(By.ID, "login")\n'
+        '    rows = wait_for_elements_presence(driver, (By.CSS_SELECTOR, "tr"))\n'
+        '    button = (By.XPATH, "//button")\n'
+        "    dynamic = (By.ID, name)\n"
+    )
+    sources = collect_test_locators(str(tmp_path))
+    assert {(source.by, source.value): source.multiple for source in sources} == {
+        ("id", "login"): False,
+        ("css selector", "tr"): True,
+        ("xpath", "//button"): False,
+    }
+    assert {source.origin.rsplit(":", 1)[1] for source in sources} == {"4", "5", "6"}
+
+
+def test_load_snapshots_skips_empty_files(tmp_path):
+    (tmp_path / "login-attachment.html").write_text(LOGIN_PAGE)
+    (tmp_path / "blank-attachment.html").write_text("  \n")
+    loaded = load_snapshots([str(tmp_path / "*-attachment.html")])
+    assert [path.rsplit("/", 1)[1] for path in loaded] == ["login-attachment.html"]
@@ -0,0 +1,77 @@
+import pytest
+from pages import locators
+from pages.locators import Locator, locators_of, registered_pages
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    """Keep the page classes declared here out of the real registry."""
+    monkeypatch.setattr(locators, "_registry", {})
+
+
+class FakePage:
+    """Stands in for BasePage: records the lookups a Locator makes."""
+
+    def __init__(self):
+        self.lookups = []
+
+    def find_element(self, by, value):
+        self.lookups.append((by, value))
+        return f"<element {value}>"
+
+
+def declare_pages():
+    class LoginPage(FakePage):
+        username = Locator("name", "username", "Username field")
+        submit = Locator("css selector", "button[type='submit']")
+
+    class AdminLoginPage(LoginPage):
+        submit = Locator("id", "admin-submit")
+        realm = Locator("id", "realm")
+
+    return LoginPage, AdminLoginPage
+
+
+def test_class_access_is_the_plain_locator():
+    LoginPage, _ = declare_pages()
+    assert LoginPage.username == ("name", "username")
+    assert isinstance(LoginPage.username, tuple)
+    assert (LoginPage.username.by, LoginPage.username.value) == ("name", "username")
+    assert LoginPage.username.description == "Username field"
+    assert repr(LoginPage.submit) == (
+        "Locator(LoginPage.submit: css selector=\"button[type='submit']\")"
+    )
+
+
+def test_instance_access_finds_the_element():
+    LoginPage, _ = declare_pages()
+    page = LoginPage()
+    assert page.username == "<element username>"
+    assert page.lookups == [("name", "username")]
+
+
+def test_locators_are_registered_with_their_declaring_class():
+    LoginPage, AdminLoginPage = declare_pages()
+    assert LoginPage.username.owner is LoginPage
+    assert AdminLoginPage.realm.owner is AdminLoginPage
+    assert set(locators._registry[AdminLoginPage]) == {"submit", "realm"}
+
+
+def test_locators_of_includes_inherited_and_overridden_locators():
+    LoginPage, AdminLoginPage = declare_pages()
+    assert locators_of(LoginPage) == {
+        "username": LoginPage.username,
+        "submit": LoginPage.submit,
+    }
+    admin = locators_of(AdminLoginPage)
+    assert admin["username"] is LoginPage.username
+    assert admin["submit"] == ("id", "admin-submit")
+    assert admin["realm"] == ("id", "realm")
+
+
+def test_registered_pages():
+    LoginPage, AdminLoginPage = declare_pages()
+    pages = registered_pages()
+    assert set(pages) == {LoginPage, AdminLoginPage}
+    assert pages[AdminLoginPage] == locators_of(AdminLoginPage)
+    assert locators_of(FakePage) == {}
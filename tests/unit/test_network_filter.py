@@ -0,0 +1,142 @@
+import json
+from utils.network_filter import (
+    BLOCKED_REASON,
+    NetworkSavings,
+    format_savings,
+    parse_performance_log,
+    resolve_blocklist,
+    url_matches,
+)
+
+ADS = "*doubleclick.net*"
+TAGS = "*googletagmanager.com*"
+
+
+def log_entry(method, **params):
+    """An entry as returned by driver.get_log("performance")."""
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def request(request_id, url):
+    return log_entry(
+        "Network.requestWillBeSent", requestId=request_id, request={"url": url}
+    )
+
+
+def test_resolve_blocklist_drops_allowed_patterns():
+    assert resolve_blocklist([ADS, TAGS], allow=[TAGS]) == [ADS]
+    assert resolve_blocklist([ADS, TAGS], allow=["*google*"]) == [ADS]
+
+
+def test_resolve_blocklist_keeps_order_and_removes_duplicates():
+    assert resolve_blocklist([TAGS, ADS, TAGS]) == [TAGS, ADS]
+    assert resolve_blocklist([]) == []
+
+
+def test_url_matches():
+    assert url_matches("https://ad.doubleclick.net/pixel?id=1", [TAGS, ADS])
+    assert not url_matches("https://example.com/app.js", [TAGS, ADS])
+
+
+def test_parse_performance_log():
+    entries = [
+        request("1", "https://ad.doubleclick.net/pixel"),
+        request("2", "https://example.com/app.js"),
+        request("3", "https://example.com/offline.js"),
+        log_entry("Network.loadingFailed", requestId="1", blockedReason=BLOCKED_REASON),
+        log_entry("Network.loadingFinished", requestId="2", encodedDataLength=2048),
+        # Failed for another reason, so not counted as blocked
+        log_entry("Network.loadingFailed", requestId="3", errorText="net::ERR_FAILED"),
+    ]
+    activity = parse_performance_log(entries)
+    assert activity.blocked == ["https://ad.doubleclick.net/pixel"]
+    assert activity.loaded == {"https://example.com/app.js": 2048}
+
+
+def test_parse_performance_log_counts_disk_cache_hits():
+    entries = [
+        log_entry("Network.responseReceived", requestId="1", response={}),
+        log_entry(
+            "Network.responseReceived", requestId="2", response={"fromDiskCache": True}
+        ),
+    ]
+    activity = parse_performance_log(entries)
+    assert (activity.responses, activity.cache_hits) == (2, 1)
+
+
+def test_parse_performance_log_skips_malformed_entries():
+    entries = [{}, {"message": "not json"}, {"message": json.dumps({"other": 1})}]
+    assert parse_performance_log(entries) == ([], {}, 0, 0)
+
+
+def test_savings_are_estimated_from_learned_sizes(tmp_path):
+    savings = NetworkSavings(cache_file=str(tmp_path / "sizes.json"))
+    savings.learn(
+        {
+            "https://ad.doubleclick.net/pixel?id=1": 400,
+            "https://ad.doubleclick.net/script.js": 1600,
+            "https://example.com/app.js": 9000,
+        },
+        [ADS],
+    )
+
+    result = savings.record(
+        "test_page",
+        [
+            # Same URL with another query string
+            "https://ad.doubleclick.net/pixel?id=2",
+            # Unknown URL on a known host: the host's average size
+            "https://ad.doubleclick.net/other.gif",
+            "https://unknown.example/tracker.js",
+        ],
+    )
+
+    assert result == {
+        "requests_blocked": 3,
+        "estimated_bytes_avoided": 400 + 1000,
+        "unsized_requests": 1,
+    }
+    assert savings.summary()["total"] == result
+
+
+def test_learned_sizes_survive_between_runs(tmp_path):
+    cache_file = str(tmp_path / "cache" / "sizes.json")
+    first_run = NetworkSavings(cache_file=cache_file)
+    first_run.learn({"https://ad.doubleclick.net/pixel": 300}, [ADS])
+    first_run.save_sizes()
+
+    second_run = NetworkSavings(cache_file=cache_file)
+    result = second_run.record("test_page", ["https://ad.doubleclick.net/pixel"])
+    assert result["estimated_bytes_avoided"] == 300
+
+
+def test_blocked_only_resources_have_no_size_estimate(tmp_path):
+    savings = NetworkSavings(cache_file=str(tmp_path / "sizes.json"))
+    result = savings.record("test_page", ["https://ad.doubleclick.net/pixel"])
+    assert result == {
+        "requests_blocked": 1,
+        "estimated_bytes_avoided": None,
+        "unsized_requests": 1,
+    }
+    assert format_savings(result) == "1 requests (size unknown)"
+
+    savings.record("test_other", [])
+    assert savings.summary()["total"]["estimated_bytes_avoided"] is None
+
+
+def test_nothing_blocked_avoids_nothing(tmp_path):
+    savings = NetworkSavings(cache_file=str(tmp_path / "sizes.json"))
+    result = savings.record("test_page", [])
+    assert result["estimated_bytes_avoided"] == 0
+    assert format_savings(result) == "0 requests (~0 KiB estimated)"
+
+
+def test_format_savings_mentions_unsized_requests():
+    savings = {
+        "requests_blocked": 3,
+        "estimated_bytes_avoided": 4096,
+        "unsized_requests": 1,
+    }
+    assert format_savings(savings) == (
+        "3 requests (~4 KiB estimated, 1 of unknown size)"
+    )
@@ -0,0 +1,104 @@
+from utils.wait_telemetry import (
+    ERROR,
+    HISTOGRAM_BUCKETS_MS,
+    OK,
+    TIMEOUT,
+    WaitStats,
+    _histogram,
+    format_report,
+)
+
+LOCATOR = "css selector=#submit"
+
+
+def record_ms(stats, values_ms, condition="visibility", locator=LOCATOR, outcome=OK):
+    """Record one wait per value, given in milliseconds."""
+    for value in values_ms:
+        stats.record(condition, locator, value / 1000, polls=2, outcome=outcome)
+
+
+def test_histogram_buckets_are_inclusive_upper_bounds():
+    histogram = _histogram([0, 50, 50.1, 100, 9999, 10000, 10001, 60000])
+    assert list(histogram) == [f"<={bound}" for bound in HISTOGRAM_BUCKETS_MS] + [
+        ">10000"
+    ]
+    assert histogram["<=50"] == 2
+    assert histogram["<=100"] == 2
+    assert histogram["<=10000"] == 2
+    assert histogram[">10000"] == 2
+    assert sum(histogram.values()) == 8
+
+
+def test_histogram_of_nothing_is_all_zero():
+    assert set(_histogram([]).values()) == {0}
+
+
+def test_percentiles():
+    stats = WaitStats()
+    # 10, 20, ... 200 ms, recorded out of order
+    record_ms(stats, [10 * n for n in reversed(range(1, 21))])
+    entry = stats.summary()["locators"][0]
+    assert entry["count"] == 20
+    assert entry["p50_ms"] == 110
+    assert entry["p95_ms"] == 200
+    assert entry["max_ms"] == 200
+    assert entry["mean_ms"] == 105
+    assert entry["total_ms"] == 2100
+    assert entry["polls"] == 40
+
+
+def test_single_wait_is_every_percentile():
+    stats = WaitStats()
+    record_ms(stats, [320])
+    entry = stats.summary()["locators"][0]
+    assert entry["p50_ms"] == entry["p95_ms"] == entry["max_ms"] == 320
+    assert entry["histogram"]["<=500"] == 1
+
+
+def test_summary_groups_by_condition_and_locator():
+    stats = WaitStats()
+    record_ms(stats, [100, 100])
+    record_ms(stats, [5000], outcome=TIMEOUT)
+    record_ms(stats, [40], condition="presence")
+    record_ms(stats, [30], locator="id=logo", outcome=ERROR)
+
+    summary = stats.summary()
+    assert summary["waits"] == 5
+    assert summary["timeouts"] == 1
+    assert summary["total_ms"] == 5270
+
+    visibility = summary["locators"][0]
+    assert (visibility["condition"], visibility["locator"]) == ("visibility", LOCATOR)
+    assert (visibility["count"], visibility["timeouts"]) == (3, 1)
+    assert summary["most_timeouts"] == [visibility]
+    assert [entry["errors"] for entry in summary["locators"]] == [0, 0, 1]
+
+
+def test_slowest_is_ordered_by_p95_and_limited_to_top():
+    stats = WaitStats()
+    record_ms(stats, [10] * 50, locator="many fast")
+    record_ms(stats, [900], locator="one slow")
+    record_ms(stats, [300], locator="one medium")
+
+    slowest = stats.summary(top=2)["slowest"]
+    assert [entry["locator"] for entry in slowest] == ["one slow", "one medium"]
+
+
+def test_clear():
+    stats = WaitStats()
+    record_ms(stats, [100])
+    stats.clear()
+    summary = stats.summary()
+    assert summary["waits"] == 0
+    assert summary["locators"] == []
+
+
+def test_format_report():
+    stats = WaitStats()
+    record_ms(stats, [1500], outcome=TIMEOUT)
+    report = format_report(stats.summary())
+    assert report.startswith("1 waits, 1 timeouts, 1.5s waiting in total")
+    assert "1500.0 ms p95" in report
+    assert "none" not in report
+    stats.clear()
+    assert format_report(stats.summary()).endswith("Most frequently timed out:\n  none")
@@ -0,0 +1,82 @@
+import socket
+import pytest
+from utils import worker
+from utils.worker import (
+    WORKER_ENV_VAR,
+    get_port_range,
+    get_worker_id,
+    get_worker_index,
+    release_port,
+    reserve_port,
+    worker_path,
+)
+
+
+def unused_port_block(size=3):
+    """Returns ``size`` consecutive ports starting at one the OS just handed out."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        start = sock.getsockname()[1]
+    return range(start, start + size)
+
+
+@pytest.fixture(autouse=True)
+def forget_reservations():
+    yield
+    worker._reserved_ports.clear()
+
+
+def test_worker_id_outside_xdist(monkeypatch):
+    monkeypatch.delenv(WORKER_ENV_VAR, raising=False)
+    assert get_worker_id() == "master"
+    assert get_worker_index() == 0
+
+
+@pytest.mark.parametrize("worker_id, index", [("gw0", 0), ("gw3", 3), ("gwx", 0)])
+def test_worker_index(monkeypatch, worker_id, index):
+    monkeypatch.setenv(WORKER_ENV_VAR, worker_id)
+    assert get_worker_index() == index
+
+
+def test_worker_path_is_namespaced_only_in_parallel(monkeypatch, tmp_path):
+    monkeypatch.delenv(WORKER_ENV_VAR, raising=False)
+    assert worker_path(str(tmp_path)) == str(tmp_path)
+    monkeypatch.setenv(WORKER_ENV_VAR, "gw1")
+    assert worker_path(str(tmp_path)) == str(tmp_path / "gw1")
+
+
+def test_port_ranges_do_not_overlap_between_workers(monkeypatch):
+    monkeypatch.setenv(WORKER_ENV_VAR, "gw0")
+    assert get_port_range(9300, 50) == range(9300, 9350)
+    monkeypatch.setenv(WORKER_ENV_VAR, "gw1")
+    assert get_port_range(9300, 50) == range(9350, 9400)
+
+
+def test_reserved_port_is_not_handed_out_twice():
+    ports = unused_port_block()
+    first = reserve_port(ports)
+    second = reserve_port(ports)
+    assert first != second
+    assert {first, second} <= worker._reserved_ports
+
+
+def test_released_port_can_be_reserved_again():
+    ports = unused_port_block(size=1)
+    port = reserve_port(ports)
+    release_port(port)
+    assert reserve_port(ports) == port
+
+
+def test_port_in_use_is_skipped():
+    ports = unused_port_block()
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", ports[0]))
+        listener.listen()
+        assert reserve_port(ports) != ports[0]
+
+
+def test_exhausted_range_raises():
+    ports = unused_port_block(size=1)
+    reserve_port(ports)
+    with pytest.raises(RuntimeError, match="No free port"):
+        reserve_port(ports)
@@ -0,0 +1,110 @@
+"""Background launcher that starts browsers before the tests that need them."""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.browser_manager import BrowserManager
+from utils.config import get_config
+from utils.logger import logger
+
+
+class BrowserLauncher:
+    """
+    Starts up to ``lookahead`` browsers on a background thread ahead of demand.
+
+    Prefetched browsers use the configured page load strategy; requests for any
+    other strategy are launched on the calling thread.
+    """
+
+    def __init__(self, browser_name=None, lookahead=None):
+        config = get_config()
+        self.browser_name = browser_name
+        self.page_load_strategy = config.page_load_strategy.lower()
+        self.lookahead = (
+            lookahead if lookahead is not None else config.prefetch_lookahead
+        )
+        # The memory limit applies to the whole container, so split it between workers
+        workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+        self.memory_limit_mb = config.prefetch_memory_limit_mb / workers
+        self.browser_memory_mb = config.browser_memory_estimate_mb
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="browser-prefetch"
+        )
+        self._pending = deque()
+
+    def _launch(self, page_load_strategy=None):
+        """Start a browser and return its manager."""
+        manager = BrowserManager(
+            browser_name=self.browser_name, page_load_strategy=page_load_strategy
+        )
+        manager.start_browser()
+        return manager
+
+    def _used_memory_mb(self):
+        """Resident memory of this process and every browser it has started."""
+        import psutil
+
+        process = psutil.Process(os.getpid())
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        return total / (1024 * 1024)
+
+    def _has_memory_headroom(self):
+        """Check that one more browser fits within the memory limit."""
+        used = self._used_memory_mb()
+        if used + self.browser_memory_mb > self.memory_limit_mb:
+            logger.info(
+                f"Skipping browser prefetch: {used:.0f} MB used, limit {self.memory_limit_mb:.0f} MB"
+            )
+            return False
+        return True
+
+    def prefetch(self):
+        """Start browsers in the background until the lookahead is full."""
+        while len(self._pending) < self.lookahead and self._has_memory_headroom():
+            logger.info("Prefetching browser in the background")
+            self._pending.append(self._executor.submit(self._launch))
+
+    def take(self, page_load_strategy=None):
+        """
+        Returns a started browser, waiting for a prefetched one if available.
+
+        Falls back to launching on the calling thread when nothing was prefetched,
+        the background launch failed or a different page load strategy is needed.
+
+        Args:
+            page_load_strategy (str): The strategy the browser must use; defaults
+                to the configured one.
+
+        Returns:
+            BrowserManager: A manager whose driver is ready for use.
+        """
+        if page_load_strategy and page_load_strategy != self.page_load_strategy:
+            return self._launch(page_load_strategy)
+
+        while self._pending:
+            future = self._pending.popleft()
+            try:
+                manager = future.result()
+                logger.info("Using prefetched browser")
+                return manager
+            except Exception as e:
+                logger.warning(f"Prefetched browser failed to start: {e}")
+
+        return self._launch()
+
+    def shutdown(self):
+        """Cancel pending launches and quit browsers that were never handed out."""
+        while self._pending:
+            future = self._pending.popleft()
+            if future.cancel():
+                continue
+            try:
+                future.result().quit_browser()
+            except Exception as e:
+                logger.warning(f"Prefetched browser failed to start: {e}")
+        self._executor.shutdown(wait=True)
@@ -1,36 +1,87 @@
-"""Module for managing Selenium WebDriver instances based on configuration."""
+"""Module for managing Selenium WebDriver instances based on configuration.
 
-import yaml
+Selenium and psutil are imported inside the methods that use them, so importing
+this module (e.g. from conftest during collection) stays cheap.
+"""
+
+import glob
 import tempfile
 import os
 import shutil
-import psutil
 import time
 import uuid
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from utils.config import get_config
+from utils.disk_cache import claim_slot
+from utils.http_mirror import get_active_mirror
 from utils.logger import logger
-
-with open("config/config.yaml", "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
+from utils.paths import get_absolute_path
+from utils.profile_template import clone_profile, get_profile_template
+from utils.worker import (
+    get_port_range,
+    get_worker_id,
+    release_port,
+    reserve_port,
+    worker_path,
+)
+
+# Directories Chrome and chromedriver leave in the temp dir when a run crashes
+STALE_DIR_PATTERNS = ("scoped_dir*", ".org.chromium.*", "chrome_user_data_*")
+
+# Clears every kind of storage of the current origin; resolves false if any failed
+_CLEAR_ORIGIN_STORAGE_SCRIPT = """
+const done = arguments[arguments.length - 1];
+(async () => {
+    localStorage.clear();
+    sessionStorage.clear();
+    if (window.indexedDB && indexedDB.databases) {
+        for (const db of await indexedDB.databases()) {
+            indexedDB.deleteDatabase(db.name);
+        }
+    }
+    if (navigator.serviceWorker) {
+        for (const registration of await navigator.serviceWorker.getRegistrations()) {
+            await registration.unregister();
+        }
+    }
+    if (window.caches) {
+        for (const key of await caches.keys()) {
+            await caches.delete(key);
+        }
+    }
+})().then(() => done(true), () => done(false));
+"""
 
 
 class BrowserManager:
     """Manages Selenium WebDriver instances for different browsers."""
 
     ALLOWED_BROWSERS = ["chrome", "firefox"]
+    PAGE_LOAD_STRATEGIES = ["normal", "eager", "none"]
 
-    def __init__(self, browser_name=None):
+    def __init__(self, browser_name=None, page_load_strategy=None):
+        self.config = get_config()
         self.driver = None
-        self.browser_name = browser_name or config.get("browser", "chrome").lower()
-        self.headless = config.get("headless", False)
-        self.download_dir = os.path.abspath(
-            config.get("download_directory", "./downloads")
-        )
+        self.browser_name = (browser_name or self.config.browser).lower()
+        self.page_load_strategy = (
+            page_load_strategy or self.config.page_load_strategy
+        ).lower()
+        self.headless = self.config.headless
+        self.download_dir = worker_path(os.path.abspath(self.config.download_directory))
         self.user_data_dir = None
-        self.use_user_data_dir = config.get("use_user_data_dir", True)
+        self.use_user_data_dir = self.config.use_user_data_dir
+        self.use_profile_template = self.config.use_profile_template
+        self.backend = self.config.backend.lower()
+        self.service_pid = None
+        self._processes = {}
+        self._created_dirs = set()
+        self._ports = []
+        self._performance_log = False
+        self.cache_slot = None
+        self.events = None
+        self.blocked_urls = []
+        # Why the last reset_session() asked for a relaunch, or None
+        self.reset_failure = None
 
         # Always disable user data dir in CI environments or when running tests
         if (
@@ -41,6 +92,10 @@ class BrowserManager:
             self.use_user_data_dir = False
             logger.info("Detected CI environment or pytest - disabling user data dir")
 
+        # Profile paths on this machine mean nothing to a remote browser
+        if self.backend == "remote":
+            self.use_user_data_dir = False
+
         logger.info(f"use_user_data_dir = {self.use_user_data_dir}")
 
         if self.browser_name not in self.ALLOWED_BROWSERS:
@@ -52,51 +107,97 @@ class BrowserManager:
                 f"Unsupported browser: '{self.browser_name}'. Allowed values: {', '.join(self.ALLOWED_BROWSERS)}"
             )
 
+        if self.page_load_strategy not in self.PAGE_LOAD_STRATEGIES:
+            raise ValueError(
+                f"Unsupported page load strategy: '{self.page_load_strategy}'. Allowed values: {', '.join(self.PAGE_LOAD_STRATEGIES)}"
+            )
+
         if not os.path.exists(self.download_dir):
-            os.makedirs(self.download_dir)
+            os.makedirs(self.download_dir, exist_ok=True)
 
-    def _cleanup_chrome_processes(self):
-        """Kill any existing Chrome/ChromeDriver processes."""
-        processes_killed = 0
-        for proc in psutil.process_iter(["pid", "name", "cmdline"]):
+    def _collect_browser_processes(self):
+        """
+        Refresh the set of processes started for this manager.
+
+        The driver service process and its whole child tree (browser, renderers,
+        GPU and utility processes) are tracked, along with any profile directory
+        passed to the browser on its command line.
+        """
+        import psutil
+
+        if not self.service_pid:
+            return
+        try:
+            service_process = psutil.Process(self.service_pid)
+            processes = [service_process] + service_process.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+
+        for proc in processes:
+            self._processes[proc.pid] = proc
             try:
-                if proc.info["name"] and any(
-                    name in proc.info["name"].lower()
-                    for name in ["chrome", "chromedriver"]
-                ):
-                    proc.kill()
-                    processes_killed += 1
-                    logger.info(
-                        f"Killed process: {proc.info['name']} (PID: {proc.info['pid']})"
-                    )
+                cmdline = proc.cmdline()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            for index, arg in enumerate(cmdline):
+                if arg.startswith("--user-data-dir="):
+                    self._created_dirs.add(arg.split("=", 1)[1])
+                elif arg == "-profile" and index + 1 < len(cmdline):
+                    self._created_dirs.add(cmdline[index + 1])
+
+    def _cleanup_chrome_processes(self, grace_period=0):
+        """
+        Reap the driver service and browser processes started by this manager.
+
+        Waits up to ``grace_period`` seconds for the processes to exit on their
+        own, kills any that remain and waits for them to be gone, so callers
+        return as soon as the browser has actually shut down.
+
+        Args:
+            grace_period (float): Seconds to wait before killing survivors.
+        """
+        import psutil
+
+        self._collect_browser_processes()
+        processes = list(self._processes.values())
+        self._processes.clear()
+        self.service_pid = None
+        if not processes:
+            return
+
+        timeout = self.config.shutdown_timeout
+        _, alive = psutil.wait_procs(processes, timeout=grace_period)
+
+        for proc in alive:
+            try:
+                proc.kill()
+                logger.info(f"Killed process: {proc.name()} (PID: {proc.pid})")
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
 
-        if processes_killed > 0:
-            time.sleep(2)  # Give processes time to die
-            logger.info(f"Killed {processes_killed} Chrome-related processes")
+        _, still_alive = psutil.wait_procs(alive, timeout=timeout)
+        if alive:
+            logger.info(f"Killed {len(alive)} browser-related processes")
+        for proc in still_alive:
+            logger.warning(f"Process {proc.pid} did not exit within {timeout}s")
 
     def _cleanup_temp_directories(self):
-        """Clean up any existing Chrome user data directories."""
-        temp_patterns = [
-            "/tmp/chrome_user_data_*",
-            "/tmp/.org.chromium.*",
-            "/tmp/scoped_dir*",
-            os.path.expanduser("~/tmp/chrome_user_data_*"),
-        ]
+        """
+        Clean up the profile directories created for this manager's browsers.
 
+        Directories left by crashed runs are removed at session start by
+        sweep_stale_browser_dirs().
+        """
         cleaned = 0
-        for pattern in temp_patterns:
-            import glob
-
-            for path in glob.glob(pattern):
-                try:
-                    if os.path.isdir(path):
-                        shutil.rmtree(path, ignore_errors=True)
-                        cleaned += 1
-                        logger.info(f"Cleaned temp directory: {path}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean {path}: {e}")
+        for path in list(self._created_dirs):
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                    cleaned += 1
+                    logger.info(f"Cleaned temp directory: {path}")
+                self._created_dirs.discard(path)
+            except Exception as e:
+                logger.warning(f"Failed to clean {path}: {e}")
 
         if cleaned > 0:
             logger.info(f"Cleaned {cleaned} temporary directories")
@@ -109,19 +210,81 @@ class BrowserManager:
         # Use a more unique identifier
         unique_id = f"{uuid.uuid4().hex[:8]}_{os.getpid()}_{int(time.time())}"
         temp_base = os.environ.get("TMPDIR", "/tmp")
-        user_data_dir = os.path.join(temp_base, f"chrome_user_data_{unique_id}")
+        user_data_dir = os.path.join(
+            temp_base, f"chrome_user_data_{get_worker_id()}_{unique_id}"
+        )
 
         try:
             os.makedirs(user_data_dir, mode=0o755, exist_ok=False)
+            self._created_dirs.add(user_data_dir)
             logger.info(f"Created unique user data dir: {user_data_dir}")
-            return user_data_dir
         except OSError as e:
             logger.warning(f"Failed to create user data dir {user_data_dir}: {e}")
             return None
 
+        # Start from a profile that has already completed first-run setup
+        if self.use_profile_template:
+            template_dir = get_profile_template(self._build_profile_template)
+            if template_dir:
+                try:
+                    clone_profile(template_dir, user_data_dir)
+                except OSError as e:
+                    logger.warning(f"Failed to clone profile template: {e}")
+
+        return user_data_dir
+
+    def _build_profile_template(self):
+        """
+        Launch a browser once with this manager's options and keep its profile.
+
+        Returns:
+            str: The profile directory, with first-run setup done and prefs written.
+        """
+        builder = BrowserManager(
+            browser_name=self.browser_name, page_load_strategy=self.page_load_strategy
+        )
+        builder.use_user_data_dir = True
+        builder.use_profile_template = False
+        builder.start_browser()
+        template_dir = builder.user_data_dir
+        builder.driver.get("about:blank")
+        builder.quit_browser(keep_user_data_dir=True)
+        return template_dir
+
+    def _claim_cache_slot(self):
+        """
+        Lock a slot of the shared disk cache for the browser being started.
+
+        Returns:
+            tuple[str, int] or None: The cache directory and its size in bytes, or
+            None if the shared cache is disabled or every slot is in use.
+        """
+        disk_cache = self.config.disk_cache
+        if not disk_cache.enabled or self.backend != "local":
+            return None
+        if self.cache_slot is None:
+            self.cache_slot = claim_slot(
+                get_absolute_path(disk_cache.directory),
+                disk_cache.size_mb,
+                disk_cache.slots,
+            )
+        if self.cache_slot is None:
+            return None
+        size = disk_cache.size_mb * 1024 * 1024 // disk_cache.slots
+        return self.cache_slot.path, size
+
+    def _release_cache_slot(self):
+        """Unlock the disk cache slot once the browser has exited."""
+        if self.cache_slot:
+            self.cache_slot.release()
+            self.cache_slot = None
+
     def _get_chrome_options(self):
         """Get Chrome options with proper configuration."""
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+
         options = ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
 
         # Download preferences
         prefs = {
@@ -175,6 +338,10 @@ class BrowserManager:
         for arg in essential_args:
             options.add_argument(arg)
 
+        # Debugging port from this worker's range so parallel browsers never collide
+        if self.backend == "local":
+            options.add_argument(f"--remote-debugging-port={self._allocate_port()}")
+
         # Headless specific configuration
         if self.headless:
             headless_args = [
@@ -187,44 +354,156 @@ class BrowserManager:
                 "--enable-logging",
                 "--log-level=0",
                 "--enable-features=NetworkService,NetworkServiceInProcess",
-                "--remote-debugging-port=0",  # Allow remote debugging
                 "--enable-chrome-browser-cloud-management",
             ]
             for arg in headless_args:
                 options.add_argument(arg)
 
+        # Keep the HTTP cache in a shared slot so later sessions start warm
+        cache = self._claim_cache_slot()
+        if cache:
+            options.add_argument(f"--disk-cache-dir={cache[0]}")
+            options.add_argument(f"--disk-cache-size={cache[1]}")
+
+        # The performance log reports blocked and cached requests for the run reports.
+        # Only network events are recorded, so the log costs one entry per request.
+        savings_report = (
+            self.config.network_blocking and self.config.network_savings_report
+        )
+        if savings_report or cache:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option(
+                "perfLoggingPrefs", {"enableNetwork": True, "enablePage": False}
+            )
+            self._performance_log = True
+
+        if self.config.event_stream:
+            options.set_capability("webSocketUrl", True)
+
+        # Route traffic through the record/replay mirror
+        mirror = get_active_mirror()
+        if mirror:
+            options.add_argument(f"--proxy-server=http://{mirror.address}")
+            options.accept_insecure_certs = True
+
         # Experimental options
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
 
         return options
 
+    def _allocate_port(self):
+        """Pick a free port from the range reserved for this xdist worker."""
+        ports = get_port_range(
+            self.config.debug_port_base, self.config.ports_per_worker
+        )
+        port = reserve_port(ports)
+        self._ports.append(port)
+        return port
+
+    def _release_ports(self):
+        """Return the ports reserved by this manager to the worker's range."""
+        for port in self._ports:
+            release_port(port)
+        self._ports.clear()
+
+    def _track_service(self, service):
+        """Remember the driver service process so only its tree is reaped."""
+        process = getattr(service, "process", None)
+        if process is not None:
+            self.service_pid = process.pid
+            self._collect_browser_processes()
+
+    def _create_driver(self, driver_class, service_class, options):
+        """
+        Create a local driver, or a Remote driver when the remote backend is selected.
+
+        Args:
+            driver_class: The local driver class, e.g. webdriver.Chrome.
+            service_class: The matching Service class for the local driver.
+            options: The browser options.
+
+        Returns:
+            WebDriver: The new driver.
+        """
+        if self.backend == "remote":
+            from selenium import webdriver
+            from utils.remote_connection import create_remote_connection
+
+            remote = self.config.remote
+            executor = create_remote_connection(
+                remote.url,
+                pool_size=remote.pool_size,
+                timeout=remote.timeout,
+                keep_alive=remote.keep_alive,
+            )
+            return webdriver.Remote(command_executor=executor, options=options)
+
+        service = service_class(port=self._allocate_port())
+        try:
+            return driver_class(options=options, service=service)
+        finally:
+            self._track_service(service)
+
+    def _open_event_stream(self):
+        """
+        Start buffering BiDi events for the new session.
+
+        The stream is also exposed as ``driver.event_stream`` so waits and
+        artifact capture that only have the driver can use it.
+        """
+        if not self.config.event_stream:
+            return
+        from utils.event_stream import open_event_stream
+
+        self.events = open_event_stream(self.driver)
+        self.driver.event_stream = self.events
+
+    def _install_request_counter(self):
+        """Count fetch/XHR calls from the start of every page, for wait_for_network_idle."""
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return
+        from utils.wait_helper import REQUEST_COUNTER_SCRIPT
+
+        try:
+            self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument",
+                {"source": REQUEST_COUNTER_SCRIPT},
+            )
+        except Exception as e:
+            logger.debug(f"Could not install request counter: {e}")
+
+    def _close_event_stream(self):
+        if self.events:
+            self.events.close()
+            self.events = None
+
+    def _configure_timeouts(self):
+        """Apply the configured implicit, page load and script timeouts."""
+        self.driver.implicitly_wait(self.config.implicit_wait)
+        self.driver.set_page_load_timeout(self.config.page_load_timeout)
+        # Observer waits run as async scripts, so they must fit in the script timeout
+        self.driver.set_script_timeout(max(30, self.config.explicit_wait + 5))
+
     def start_browser(self):
         """Initializes the WebDriver based on the specified browser with enhanced retry logic."""
-        retries = config.get("retry_attempts", 3)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
+        from selenium.webdriver.firefox.service import Service as FirefoxService
 
-        # Pre-cleanup before starting
-        self._cleanup_chrome_processes()
-        self._cleanup_temp_directories()
+        retries = self.config.retry_attempts
 
         for attempt in range(retries):
             try:
                 if self.browser_name == "chrome":
                     options = self._get_chrome_options()
-
-                    # Additional cleanup between attempts
-                    if attempt > 0:
-                        time.sleep(2)
-                        self._cleanup_chrome_processes()
-
-                    self.driver = webdriver.Chrome(options=options)
+                    self.driver = self._create_driver(
+                        webdriver.Chrome, ChromeService, options
+                    )
 
                     # Configure timeouts
-                    self.driver.implicitly_wait(config.get("implicit_wait", 10))
-                    self.driver.set_page_load_timeout(
-                        config.get("page_load_timeout", 60)
-                    )
-                    self.driver.set_script_timeout(30)
+                    self._configure_timeouts()
 
                     # Only maximize window if not in headless mode and not in CI
                     if not self.headless and not os.environ.get("CI"):
@@ -237,7 +516,8 @@ class BrowserManager:
 
                 elif self.browser_name == "firefox":
                     options = FirefoxOptions()
-                    file_type = config.get("file_type", "application/octet-stream")
+                    options.page_load_strategy = self.page_load_strategy
+                    file_type = self.config.file_type
 
                     # Firefox preferences
                     firefox_prefs = {
@@ -251,18 +531,44 @@ class BrowserManager:
                         "javascript.enabled": False,
                     }
 
+                    cache = self._claim_cache_slot()
+                    if cache:
+                        firefox_prefs.update(
+                            {
+                                "browser.cache.disk.enable": True,
+                                "browser.cache.disk.parent_directory": cache[0],
+                                "browser.cache.disk.smart_size.enabled": False,
+                                "browser.cache.disk.capacity": cache[1] // 1024,
+                            }
+                        )
+
+                    mirror = get_active_mirror()
+                    if mirror:
+                        host, port = mirror.address.split(":")
+                        firefox_prefs.update(
+                            {
+                                "network.proxy.type": 1,
+                                "network.proxy.http": host,
+                                "network.proxy.http_port": int(port),
+                                "network.proxy.ssl": host,
+                                "network.proxy.ssl_port": int(port),
+                            }
+                        )
+                        options.accept_insecure_certs = True
+
                     for pref, value in firefox_prefs.items():
                         options.set_preference(pref, value)
 
                     if self.headless:
                         options.add_argument("-headless")
 
-                    self.driver = webdriver.Firefox(options=options)
-                    self.driver.implicitly_wait(config.get("implicit_wait", 10))
-                    self.driver.set_page_load_timeout(
-                        config.get("page_load_timeout", 60)
+                    if self.config.event_stream:
+                        options.set_capability("webSocketUrl", True)
+
+                    self.driver = self._create_driver(
+                        webdriver.Firefox, FirefoxService, options
                     )
-                    self.driver.set_script_timeout(30)
+                    self._configure_timeouts()
 
                     if not self.headless and not os.environ.get("CI"):
                         try:
@@ -271,6 +577,9 @@ class BrowserManager:
                             logger.warning(f"Could not maximize window: {e}")
                             self.driver.set_window_size(1920, 1080)
 
+                self._open_event_stream()
+                self._install_request_counter()
+
                 logger.info(
                     f"Browser {self.browser_name} started successfully on attempt {attempt + 1}"
                 )
@@ -280,32 +589,31 @@ class BrowserManager:
                 logger.warning(f"Attempt {attempt + 1} failed to start browser: {e}")
 
                 # Cleanup after failed attempt
-                if self.user_data_dir and os.path.exists(self.user_data_dir):
-                    try:
-                        shutil.rmtree(self.user_data_dir, ignore_errors=True)
-                        logger.info(
-                            f"Cleaned user data dir after failed attempt: {self.user_data_dir}"
-                        )
-                    except Exception as cleanup_error:
-                        logger.warning(
-                            f"Failed to clean user data dir: {cleanup_error}"
-                        )
-                    self.user_data_dir = None
-
-                # Additional cleanup between attempts
+                self._close_event_stream()
+                self.user_data_dir = None
                 self._cleanup_chrome_processes()
+                self._cleanup_temp_directories()
+                self._release_ports()
+                self._release_cache_slot()
 
                 if attempt == retries - 1:
                     logger.error(f"Failed to start browser after {retries} attempts")
                     raise
 
-                # Wait before retry
-                time.sleep(2**attempt)  # Exponential backoff
-
         return None
 
-    def quit_browser(self):
-        """Closes the WebDriver instance and cleans up resources."""
+    def quit_browser(self, keep_user_data_dir=False):
+        """
+        Closes the WebDriver instance and cleans up resources.
+
+        Args:
+            keep_user_data_dir (bool): Leave the user data dir on disk, e.g. to
+                reuse it as a profile template.
+        """
+        # Snapshot the process tree while the driver service is still alive
+        self._collect_browser_processes()
+        self._close_event_stream()
+
         if self.driver:
             try:
                 self.driver.quit()
@@ -315,20 +623,242 @@ class BrowserManager:
             finally:
                 self.driver = None
 
-        # Give browser time to shut down properly
-        time.sleep(1)
+        # Wait for the browser to exit, then reap anything it left behind
+        self._cleanup_chrome_processes(grace_period=self.config.shutdown_timeout)
+        # The final collection above re-reads --user-data-dir, so only drop it now
+        if keep_user_data_dir and self.user_data_dir:
+            self._created_dirs.discard(self.user_data_dir)
+        self._cleanup_temp_directories()
+        self._release_ports()
+        self._release_cache_slot()
+        self.user_data_dir = None
 
-        # Clean up processes
-        self._cleanup_chrome_processes()
+    def _read_performance_log(self):
+        """Drain the Chrome performance log, or return nothing if it is not enabled."""
+        if not self._performance_log or not self.driver:
+            return []
+        try:
+            return self.driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Could not read performance log: {e}")
+            return []
+
+    def apply_network_filter(self, patterns):
+        """
+        Blocks requests to URLs matching ``patterns`` until the filter is changed.
+
+        Uses CDP ``Network.setBlockedURLs``, so blocked requests fail before a
+        connection is made. Browsers without CDP (Firefox) are left unfiltered.
+
+        Args:
+            patterns (list[str]): URL patterns with "*" wildcards; empty to unblock.
+
+        Returns:
+            bool: True if the filter is active in the browser.
+        """
+        if not self.driver or not hasattr(self.driver, "execute_cdp_cmd"):
+            if patterns:
+                logger.debug(
+                    f"Network blocking is not supported on {self.browser_name}"
+                )
+            return False
+        if not patterns and not self.blocked_urls:
+            return False
 
-        # Clean up user data directory
-        if self.user_data_dir and os.path.exists(self.user_data_dir):
+        # Drop events from before this test so the report only counts its requests
+        self._read_performance_log()
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            logger.warning(f"Failed to apply network filter: {e}")
+            return False
+
+        self.blocked_urls = list(patterns)
+        if patterns:
+            logger.info(f"Blocking {len(patterns)} URL patterns")
+        return bool(patterns)
+
+    def collect_network_activity(self):
+        """
+        Returns the requests made since the filter was applied.
+
+        Returns:
+            NetworkActivity: Blocked, completed and disk-cached requests.
+        """
+        from utils.network_filter import parse_performance_log
+
+        return parse_performance_log(self._read_performance_log())
+
+    def is_alive(self):
+        """Returns True if the driver session still responds to commands."""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def _visited_origins(self, handles):
+        """
+        Collects the origins the session loaded documents, frames or workers from.
+
+        Uses the navigation history of every window, the URLs of every DevTools
+        target (out-of-process frames, service and shared workers) and, when
+        the event stream is open, the URLs of every request of the test.
+
+        Args:
+            handles (list[str]): The open window handles.
+
+        Returns:
+            set[str]: http(s) origins.
+        """
+        from utils.event_stream import url_origin
+
+        urls = []
+        for handle in handles:
+            self.driver.switch_to.window(handle)
+            history = self.driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+            urls += [entry.get("url") for entry in history.get("entries", [])]
+        targets = self.driver.execute_cdp_cmd("Target.getTargets", {})
+        urls += [target.get("url") for target in targets.get("targetInfos", [])]
+
+        origins = {url_origin(url) for url in urls} - {None}
+        if self.events:
+            origins |= self.events.origins()
+        return origins
+
+    def _reset_without_cdp(self):
+        """
+        Clears cookies and storage through WebDriver and BiDi.
+
+        WebDriver only reaches the current document, so this succeeds only if
+        the event stream shows that the test never left the current origin.
+
+        Returns:
+            bool: True if no state can be left behind, False otherwise, with the
+            reason in ``reset_failure``.
+        """
+        from utils.event_stream import url_origin
+
+        if not self.events:
+            self.reset_failure = "no CDP or event stream"
+            return False
+        current = url_origin(self.driver.execute_script("return window.location.href;"))
+        others = self.events.origins() - {current}
+        if others:
+            logger.info(f"Test visited {len(others)} other origin(s)")
+            self.reset_failure = "other origins visited without CDP"
+            return False
+
+        self.events.delete_cookies()
+        if not self.driver.execute_async_script(_CLEAR_ORIGIN_STORAGE_SCRIPT):
+            self.reset_failure = "storage not cleared"
+            return False
+        return True
+
+    def reset_session(self):
+        """
+        Returns the running browser to a blank state so the next test can reuse it.
+
+        Dismisses any open alert, closes every window except the first, clears
+        cookies and storage, restores the configured timeouts and navigates to
+        about:blank.
+
+        Cookies of every domain are cleared. Storage (local and session storage,
+        IndexedDB, service workers, cache storage) is cleared for every origin
+        the session is known to have visited. Without CDP that is only possible
+        when the test stayed on one origin, so the browser is relaunched instead
+        when other origins may hold state.
+
+        Returns:
+            bool: True if the browser is ready for reuse, False if it should be
+            relaunched, with the reason in ``reset_failure``.
+        """
+        from selenium.common.exceptions import NoAlertPresentException
+
+        self.reset_failure = None
+        if not self.driver:
+            self.reset_failure = "no driver"
+            return False
+
+        try:
             try:
-                shutil.rmtree(self.user_data_dir, ignore_errors=True)
-                logger.info(f"Cleaned up user data directory: {self.user_data_dir}")
-            except Exception as e:
-                logger.warning(
-                    f"Failed to clean up user data directory {self.user_data_dir}: {e}"
-                )
-            finally:
-                self.user_data_dir = None
+                self.driver.switch_to.alert.dismiss()
+            except NoAlertPresentException:
+                pass
+
+            cdp = hasattr(self.driver, "execute_cdp_cmd")
+            handles = self.driver.window_handles
+            origins = self._visited_origins(handles) if cdp else set()
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            self.driver.switch_to.default_content()
+
+            if cdp:
+                self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                for origin in sorted(origins):
+                    self.driver.execute_cdp_cmd(
+                        "Storage.clearDataForOrigin",
+                        {"origin": origin, "storageTypes": "all"},
+                    )
+                # So the next reset only sees the origins of the next test
+                self.driver.execute_cdp_cmd("Page.resetNavigationHistory", {})
+            elif not self._reset_without_cdp():
+                return False
+
+            self._configure_timeouts()
+            self.driver.get("about:blank")
+            logger.info("Browser session reset for reuse")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset browser session: {e}")
+            self.reset_failure = f"reset error ({type(e).__name__})"
+            return False
+
+
+def sweep_stale_browser_dirs(max_age_hours=24, limit=100):
+    """
+    Removes browser temp directories left behind by crashed or killed runs.
+
+    Only directories owned by the current user and untouched for
+    ``max_age_hours`` are removed, so browsers of runs still in progress keep
+    theirs. At most ``limit`` directories are removed per call.
+
+    Args:
+        max_age_hours (float): Minimum age of a directory to remove.
+        limit (int): Maximum number of directories to remove.
+
+    Returns:
+        int: The number of directories removed.
+    """
+    if not hasattr(os, "getuid"):
+        return 0
+
+    cutoff = time.time() - max_age_hours * 3600
+    temp_dir = tempfile.gettempdir()
+    removed = 0
+    for pattern in STALE_DIR_PATTERNS:
+        for path in glob.glob(os.path.join(temp_dir, pattern)):
+            if removed >= limit:
+                logger.info(f"Stale directory sweep stopped after {limit} directories")
+                return removed
+            try:
+                stat = os.lstat(path)
+            except OSError:
+                continue
+            if (
+                os.path.isdir(path)
+                and not os.path.islink(path)
+                and stat.st_uid == os.getuid()
+                and stat.st_mtime < cutoff
+            ):
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+
+    if removed:
+        logger.info(f"Removed {removed} stale browser directories from {temp_dir}")
+    return removed
@@ -0,0 +1,144 @@
+"""Pool of warm browser sessions that are reset and reused between tests."""
+
+import threading
+from collections import Counter
+from utils.browser_launcher import BrowserLauncher
+from utils.config import get_config
+from utils.logger import logger
+
+
+class PoolStats:
+    """Counts how tests got their browser, and why reset browsers were relaunched."""
+
+    def __init__(self):
+        self.reused = 0
+        self.launched = 0
+        self.fallbacks = Counter()
+        self._lock = threading.Lock()
+
+    def record_acquire(self, reused):
+        with self._lock:
+            if reused:
+                self.reused += 1
+            else:
+                self.launched += 1
+
+    def record_fallback(self, reason):
+        with self._lock:
+            self.fallbacks[reason] += 1
+
+    def summary(self):
+        """
+        Returns:
+            dict: Browsers reused and launched, and the relaunches after a failed
+            reset per reason.
+        """
+        with self._lock:
+            return {
+                "reused": self.reused,
+                "launched": self.launched,
+                "reset_fallbacks": dict(self.fallbacks.most_common()),
+            }
+
+
+# Browser reuse of every test run by this process
+pool_stats = PoolStats()
+
+
+class BrowserPool:
+    """Keeps up to ``size`` started browsers alive and hands them out one test at a time."""
+
+    def __init__(self, browser_name=None, size=None):
+        self.browser_name = browser_name
+        self.size = size if size is not None else get_config().browser_pool_size
+        self._idle = []
+        self.launcher = BrowserLauncher(browser_name=browser_name)
+
+    def acquire(self, isolated=False, page_load_strategy=None):
+        """
+        Returns a started BrowserManager, reusing a warm browser when possible.
+
+        The page load strategy is fixed when a browser starts, so only idle
+        browsers started with the requested strategy are reused.
+
+        Args:
+            isolated (bool): Always launch a fresh browser instead of reusing one.
+            page_load_strategy (str): The strategy the browser must use; defaults
+                to the configured one.
+
+        Returns:
+            BrowserManager: A manager whose driver is ready for use.
+        """
+        strategy = (page_load_strategy or get_config().page_load_strategy).lower()
+        matching = [m for m in self._idle if m.page_load_strategy == strategy]
+        while not isolated and matching:
+            manager = matching.pop()
+            self._idle.remove(manager)
+            if manager.is_alive():
+                logger.info(
+                    f"Reusing warm {manager.browser_name} browser ({len(self._idle)} idle)"
+                )
+                pool_stats.record_acquire(reused=True)
+                return manager
+            logger.warning("Discarding pooled browser that is no longer responding")
+            manager.quit_browser()
+
+        pool_stats.record_acquire(reused=False)
+        return self.launcher.take(strategy)
+
+    def prepare_next(self, current_isolated, next_isolated, page_load_strategy=None):
+        """
+        Starts a browser in the background if the next test will not get a warm one.
+
+        Only idle browsers started with the next test's page load strategy count
+        as warm, as in acquire().
+
+        Args:
+            current_isolated (bool): Whether the running test's browser will be
+                discarded or cannot be used by the next test.
+            next_isolated (bool): Whether the next test needs a fresh browser.
+            page_load_strategy (str): The next test's strategy; defaults to the
+                configured one.
+        """
+        strategy = (page_load_strategy or get_config().page_load_strategy).lower()
+        warm_available = not current_isolated or any(
+            m.page_load_strategy == strategy for m in self._idle
+        )
+        if next_isolated or not warm_available:
+            self.launcher.prefetch()
+
+    def release(self, manager, reuse=True):
+        """
+        Returns a browser to the pool, or quits it if it cannot be reused.
+
+        When the pool is full the longest-idle browser is quit instead, so a
+        test with an unusual page load strategy does not keep its browser warm
+        at the expense of the following tests.
+
+        A browser that cannot be reset is quit, and the reason is logged and
+        counted in ``pool_stats``.
+
+        Args:
+            manager (BrowserManager): The manager obtained from acquire().
+            reuse (bool): Whether the browser may be handed to another test.
+        """
+        if reuse and self.size > 0:
+            if manager.reset_session():
+                if len(self._idle) >= self.size:
+                    logger.info("Pool is full, quitting the longest-idle browser")
+                    self._idle.pop(0).quit_browser()
+                self._idle.append(manager)
+                return
+            reason = manager.reset_failure or "reset failed"
+            pool_stats.record_fallback(reason)
+            logger.info(f"Quitting browser that could not be reset: {reason}")
+        else:
+            logger.info("Quitting browser instead of returning it to the pool")
+        manager.quit_browser()
+
+    def shutdown(self):
+        """Quits every idle browser held by the pool."""
+        while self._idle:
+            self._idle.pop().quit_browser()
+        self.launcher.shutdown()
+        logger.info("Browser pool shut down")
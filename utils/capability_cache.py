@@ -0,0 +1,125 @@
+"""On-disk cache of browser capabilities keyed by the installed browser binary."""
+
+import json
+import os
+import shutil
+import subprocess
+from utils.logger import logger
+from utils.paths import get_absolute_path
+
+CACHE_FILE = get_absolute_path(".cache", "capabilities.json")
+
+BROWSER_BINARIES = {
+    "chrome": [
+        "google-chrome",
+        "google-chrome-stable",
+        "chromium",
+        "chromium-browser",
+        "chrome",
+    ],
+    "firefox": ["firefox", "firefox-esr"],
+}
+
+
+def find_browser_binary(browser_name):
+    """
+    Finds the browser executable on PATH.
+
+    Args:
+        browser_name (str): The browser name, e.g. "chrome" or "firefox".
+
+    Returns:
+        str or None: The resolved path of the binary, or None if it is not installed.
+    """
+    for candidate in BROWSER_BINARIES.get(browser_name, []):
+        path = shutil.which(candidate)
+        if path:
+            return os.path.realpath(path)
+    return None
+
+
+def _binary_version(path):
+    """Returns the output of ``<binary> --version`` without starting a browser."""
+    try:
+        result = subprocess.run(
+            [path, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=False,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Could not read version of {path}: {e}")
+        return ""
+
+
+def cache_key(browser_name):
+    """
+    Builds the cache key for the installed browser.
+
+    The key changes whenever the binary is replaced, updated or moved. Building
+    it runs ``<binary> --version``, so callers compute it once per session and
+    pass it to load_capabilities() and store_capabilities().
+
+    Args:
+        browser_name (str): The browser name.
+
+    Returns:
+        str or None: The cache key, or None if the binary cannot be found.
+    """
+    path = find_browser_binary(browser_name)
+    if not path:
+        return None
+    mtime = int(os.path.getmtime(path))
+    return f"{browser_name}|{path}|{mtime}|{_binary_version(path)}"
+
+
+def _read_cache():
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_capabilities(key):
+    """
+    Returns the cached capabilities for the installed browser.
+
+    Args:
+        key (str): The browser's cache_key().
+
+    Returns:
+        dict or None: The cached capabilities, or None on a cache miss.
+    """
+    if key is None:
+        return None
+    capabilities = _read_cache().get(key)
+    if capabilities:
+        logger.info(f"Capability cache hit for {key}")
+    return capabilities
+
+
+def store_capabilities(key, capabilities):
+    """
+    Stores the capabilities of a running session for the installed browser.
+
+    Args:
+        key (str): The browser's cache_key().
+        capabilities (dict): The driver capabilities to cache.
+    """
+    if key is None:
+        return
+
+    cache = _read_cache()
+    cache[key] = capabilities
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    tmp_file = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2, default=str)
+        os.replace(tmp_file, CACHE_FILE)
+        logger.info(f"Cached capabilities for {key}")
+    except OSError as e:
+        logger.warning(f"Failed to write capability cache: {e}")
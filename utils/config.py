@@ -0,0 +1,177 @@
+"""Typed test configuration, loaded once per process from config/config.yaml."""
+
+import dataclasses
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from utils.logger import logger
+from utils.paths import get_absolute_path
+
+ENV_PREFIX = "SELENIUM_"
+CONFIG_ENV_VAR = "SELENIUM_CONFIG"
+
+# Overrides from the pytest command line, applied on top of YAML and environment
+_cli_overrides = {}
+
+
+@dataclass(frozen=True)
+class RemoteSettings:
+    """Connection settings for the remote WebDriver backend."""
+
+    url: str = "http://127.0.0.1:9515"
+    pool_size: int = 10
+    timeout: float = 120
+    keep_alive: bool = True
+
+
+@dataclass(frozen=True)
+class MirrorSettings:
+    """Record-and-replay HTTP mirror settings."""
+
+    mode: str = "off"
+    archive_dir: str = "recordings"
+    upstream_timeout: float = 30
+
+
+@dataclass(frozen=True)
+class DiskCacheSettings:
+    """Shared HTTP disk cache reused by every browser session."""
+
+    enabled: bool = False
+    directory: str = ".cache/browser_cache"
+    size_mb: int = 1024
+    slots: int = 8
+
+
+@dataclass(frozen=True)
+class Settings:
+    """All settings read from config.yaml, with their defaults."""
+
+    # Browser
+    browser: str = "chrome"
+    headless: bool = False
+    download_directory: str = "./downloads"
+    file_type: str = "application/octet-stream"
+    timeout: int = 30
+    retry_attempts: int = 3
+    shutdown_timeout: float = 5
+    window_size: str = "1920,1080"
+    use_user_data_dir: bool = True
+    use_profile_template: bool = True
+    browser_pool_size: int = 1
+    debug_port_base: int = 9300
+    ports_per_worker: int = 50
+    prefetch_lookahead: int = 1
+    prefetch_memory_limit_mb: int = 2048
+    browser_memory_estimate_mb: int = 350
+    event_stream: bool = False
+    disk_cache: DiskCacheSettings = field(default_factory=DiskCacheSettings)
+
+    # Network filtering (Chrome only)
+    network_blocking: bool = True
+    network_savings_report: bool = True
+    network_blocklist: tuple = ()
+    network_allowlist: tuple = ()
+
+    # WebDriver backend
+    backend: str = "local"
+    remote: RemoteSettings = field(default_factory=RemoteSettings)
+    mirror: MirrorSettings = field(default_factory=MirrorSettings)
+
+    # Test
+    test_timeout: int = 60
+    implicit_wait: float = 10
+    explicit_wait: float = 10
+    wait_engine: str = "polling"
+    network_idle_ms: int = 500
+    page_load_timeout: float = 60
+    page_load_strategy: str = "normal"
+
+    # Logging
+    log_level: str = "INFO"
+    log_file: str = "logs/test.log"
+
+    base_url: str = ""
+    excel_data_file: str = "data/excel_data.xlsx"
+    excel_data_sheet: str = "Sheet1"
+    enable_screenshots: bool = True
+
+
+def _coerce(value, field_type):
+    """Convert a string from the environment or command line to the field type."""
+    if field_type is tuple:
+        if isinstance(value, str):
+            return tuple(item.strip() for item in value.split(",") if item.strip())
+        return tuple(value)
+    if not isinstance(value, str) or field_type is str:
+        return value
+    if field_type is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return field_type(value)
+
+
+def _build(settings_class, values, env_prefix):
+    """Create a settings dataclass from YAML values, then apply env overrides."""
+    kwargs = {}
+    known = set()
+    for settings_field in dataclasses.fields(settings_class):
+        name = settings_field.name
+        known.add(name)
+        env_name = f"{env_prefix}{name}".upper()
+
+        if dataclasses.is_dataclass(settings_field.type):
+            kwargs[name] = _build(
+                settings_field.type, values.get(name) or {}, f"{env_name}_"
+            )
+            continue
+
+        if env_name in os.environ:
+            kwargs[name] = _coerce(os.environ[env_name], settings_field.type)
+        elif values.get(name) is not None:
+            kwargs[name] = _coerce(values[name], settings_field.type)
+
+    for name in set(values) - known:
+        logger.warning(f"Ignoring unknown config key: {name}")
+
+    return settings_class(**kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_config():
+    """
+    Returns the test configuration, parsing config.yaml on first use only.
+
+    Values are resolved in order: command line overrides, then ``SELENIUM_<KEY>``
+    environment variables (``SELENIUM_REMOTE_URL`` for nested keys), then
+    config.yaml, then the defaults on Settings. The file is found relative to
+    the project root, or at ``$SELENIUM_CONFIG`` if set.
+
+    Returns:
+        Settings: The immutable configuration.
+    """
+    import yaml
+
+    path = os.environ.get(CONFIG_ENV_VAR) or get_absolute_path("config", "config.yaml")
+    with open(path, "r", encoding="utf-8") as f:
+        values = yaml.safe_load(f) or {}
+
+    settings = _build(Settings, values, ENV_PREFIX)
+    if _cli_overrides:
+        settings = dataclasses.replace(settings, **_cli_overrides)
+    logger.debug(f"Loaded configuration from {path}")
+    return settings
+
+
+def set_overrides(**overrides):
+    """
+    Overrides settings from the command line and discards the cached config.
+
+    Options that were not given (None) are ignored.
+
+    Args:
+        **overrides: Settings field names mapped to their new values.
+    """
+    _cli_overrides.update(
+        {name: value for name, value in overrides.items() if value is not None}
+    )
+    get_config.cache_clear()
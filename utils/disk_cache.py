@@ -0,0 +1,175 @@
+"""
+Shared HTTP disk cache directories that survive between browser sessions.
+
+A browser's disk cache cannot be used by two running browsers at once, so the
+cache is split into slots. Each browser locks one slot for its lifetime and
+later browsers, in this or another xdist worker, reuse whichever slot is free
+and was used most recently. Least recently used slots are emptied when the
+total size goes over the cap.
+"""
+
+import os
+import shutil
+import threading
+import time
+from utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so the shared cache is disabled
+    fcntl = None
+
+LOCK_FILE = ".lock"
+LAST_USED_FILE = ".last_used"
+
+
+class CacheSlot:
+    """A cache directory locked by one browser until release() is called."""
+
+    def __init__(self, path, lock_fd):
+        self.path = path
+        self._lock_fd = lock_fd
+
+    def release(self):
+        """Marks the slot as just used and unlocks it for other browsers."""
+        if self._lock_fd is None:
+            return
+        try:
+            with open(os.path.join(self.path, LAST_USED_FILE), "w") as f:
+                f.write(str(time.time()))
+        except OSError:
+            pass
+        fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        os.close(self._lock_fd)
+        self._lock_fd = None
+
+
+def _try_lock(path):
+    """Returns a locked file descriptor for the slot, or None if it is in use."""
+    os.makedirs(path, exist_ok=True)
+    fd = os.open(os.path.join(path, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+    except OSError:
+        os.close(fd)
+        return None
+
+
+def _last_used(path):
+    try:
+        return os.path.getmtime(os.path.join(path, LAST_USED_FILE))
+    except OSError:
+        return 0
+
+
+def _size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _empty(path):
+    """Delete a slot's cached data but keep the slot and its lock file."""
+    for name in os.listdir(path):
+        if name == LOCK_FILE:
+            continue
+        target = os.path.join(path, name)
+        if os.path.isdir(target) and not os.path.islink(target):
+            shutil.rmtree(target, ignore_errors=True)
+        else:
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+
+
+def _evict(slot_paths, keep, max_bytes):
+    """Empty least recently used, unlocked slots until the cache fits in max_bytes."""
+    sizes = {path: _size(path) for path in slot_paths}
+    total = sum(sizes.values())
+    for path in sorted(slot_paths, key=_last_used):
+        if total <= max_bytes:
+            break
+        if path == keep or sizes[path] == 0:
+            continue
+        fd = _try_lock(path)
+        if fd is None:
+            continue
+        try:
+            _empty(path)
+            total -= sizes[path]
+            logger.info(
+                f"Evicted disk cache slot {path} ({sizes[path] / 1024 / 1024:.1f} MB)"
+            )
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+def claim_slot(directory, size_mb, max_slots):
+    """
+    Locks a cache slot for a new browser.
+
+    Args:
+        directory (str): Root directory shared by every worker.
+        size_mb (int): Size cap of the whole cache, split evenly between slots.
+        max_slots (int): Most browsers that can use the cache at the same time.
+
+    Returns:
+        CacheSlot or None: The locked slot, or None if every slot is in use or
+        locking is not supported on this platform.
+    """
+    if fcntl is None:
+        logger.info("Shared disk cache needs fcntl locks; not available here")
+        return None
+
+    os.makedirs(directory, exist_ok=True)
+    slot_paths = [os.path.join(directory, f"slot_{i}") for i in range(max_slots)]
+
+    # Warmest slots first, then slots that were never used
+    for path in sorted(slot_paths, key=_last_used, reverse=True):
+        fd = _try_lock(path)
+        if fd is not None:
+            _evict(slot_paths, keep=path, max_bytes=size_mb * 1024 * 1024)
+            logger.info(f"Using shared disk cache slot {path}")
+            return CacheSlot(path, fd)
+
+    logger.warning(f"All {max_slots} disk cache slots are in use")
+    return None
+
+
+class CacheStats:
+    """Counts responses and disk cache hits across the tests of this process."""
+
+    def __init__(self):
+        self.responses = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def record(self, responses, hits):
+        with self._lock:
+            self.responses += responses
+            self.hits += hits
+
+    def summary(self):
+        """
+        Returns:
+            dict: Responses seen, disk cache hits and the hit rate (0-1).
+        """
+        with self._lock:
+            rate = self.hits / self.responses if self.responses else 0.0
+            return {
+                "responses": self.responses,
+                "disk_cache_hits": self.hits,
+                "hit_rate": round(rate, 4),
+            }
+
+
+# Disk cache hits of every test run by this process
+cache_stats = CacheStats()
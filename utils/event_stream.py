@@ -0,0 +1,240 @@
+"""
+WebDriver BiDi event stream that buffers browser events as they happen.
+
+Console messages, network events and navigation events are pushed by the
+browser over the session's BiDi WebSocket and collected on a background thread,
+so failure artifacts and waits can read them without polling the driver.
+"""
+
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from utils.logger import logger
+
+CONSOLE = "console"
+NETWORK = "network"
+NAVIGATION = "navigation"
+
+# BiDi events subscribed to, and the buffer each one is stored in
+EVENTS = {
+    "log.entryAdded": CONSOLE,
+    "network.beforeRequestSent": NETWORK,
+    "network.responseCompleted": NETWORK,
+    "network.fetchError": NETWORK,
+    "browsingContext.navigationStarted": NAVIGATION,
+    "browsingContext.domContentLoaded": NAVIGATION,
+    "browsingContext.load": NAVIGATION,
+}
+
+# Events kept per buffer; older ones are dropped
+MAX_EVENTS = 5000
+
+
+def url_origin(url):
+    """Returns the origin of an http(s) URL, or None for other URLs."""
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _normalise(method, params):
+    """Flatten a BiDi event into the fields tests and reports care about."""
+    event = {
+        "event": method.split(".", 1)[1],
+        "timestamp": params.get("timestamp", time.time() * 1000),
+    }
+    if method == "log.entryAdded":
+        source = params.get("source", {})
+        event.update(
+            level=params.get("level"),
+            text=params.get("text"),
+            type=params.get("type"),
+            context=source.get("context"),
+        )
+    elif method.startswith("network."):
+        request = params.get("request", {})
+        response = params.get("response", {})
+        event.update(
+            url=request.get("url"),
+            method=request.get("method"),
+            status=response.get("status"),
+            error=params.get("errorText"),
+            context=params.get("context"),
+        )
+    else:
+        event.update(url=params.get("url"), context=params.get("context"))
+    return event
+
+
+class EventStream:
+    """
+    Buffers BiDi events for one browser session.
+
+    Args:
+        ws_url (str): The ``webSocketUrl`` capability of the session.
+        timeout (float): Seconds to wait for the connection and subscription.
+    """
+
+    def __init__(self, ws_url, timeout=10):
+        import websocket
+
+        self._ws = websocket.create_connection(ws_url, timeout=timeout)
+        self._ws.settimeout(None)
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._replies = {}
+        self._condition = threading.Condition()
+        self._buffers = {
+            kind: deque(maxlen=MAX_EVENTS) for kind in set(EVENTS.values())
+        }
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._read, name="bidi-events", daemon=True
+        )
+        self._thread.start()
+        try:
+            self._command("session.subscribe", {"events": list(EVENTS)}, timeout)
+        except Exception:
+            self.close()
+            raise
+
+    def _command(self, method, params, timeout):
+        """Send a BiDi command and wait for its reply."""
+        command_id = next(self._ids)
+        with self._send_lock:
+            self._ws.send(
+                json.dumps({"id": command_id, "method": method, "params": params})
+            )
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: command_id in self._replies or self._closed, timeout
+            ):
+                raise TimeoutError(f"No reply to BiDi command {method}")
+            reply = self._replies.pop(command_id, None)
+        if reply is None or reply.get("type") == "error":
+            raise RuntimeError(f"BiDi command {method} failed: {reply}")
+        return reply.get("result")
+
+    def _read(self):
+        """Receive messages until the connection closes, buffering every event."""
+        while True:
+            try:
+                message = json.loads(self._ws.recv())
+            except Exception:
+                break
+            with self._condition:
+                if "id" in message:
+                    self._replies[message["id"]] = message
+                elif message.get("method") in EVENTS:
+                    kind = EVENTS[message["method"]]
+                    self._buffers[kind].append(
+                        _normalise(message["method"], message.get("params", {}))
+                    )
+                self._condition.notify_all()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def events(self, kind):
+        """
+        Returns the buffered events of one kind, oldest first.
+
+        Args:
+            kind (str): CONSOLE, NETWORK or NAVIGATION.
+
+        Returns:
+            list[dict]: A snapshot of the buffer.
+        """
+        with self._condition:
+            return list(self._buffers[kind])
+
+    def clear(self):
+        """Empty every buffer, e.g. at the start of a test."""
+        with self._condition:
+            for buffer in self._buffers.values():
+                buffer.clear()
+
+    def wait_for(self, kind, predicate, timeout):
+        """
+        Blocks until a buffered event of ``kind`` satisfies ``predicate``.
+
+        Events already in the buffer count, so call clear() first to wait only
+        for new ones.
+
+        Args:
+            kind (str): CONSOLE, NETWORK or NAVIGATION.
+            predicate (callable): Called with each event dict.
+            timeout (float): Seconds to wait.
+
+        Returns:
+            dict or None: The first matching event, or None on timeout.
+        """
+
+        def find():
+            return next((e for e in self._buffers[kind] if predicate(e)), None)
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: find() is not None or self._closed, timeout
+            )
+            return find()
+
+    def delete_cookies(self, timeout=10):
+        """Delete every cookie of every domain in the browser (BiDi storage.deleteCookies)."""
+        self._command("storage.deleteCookies", {}, timeout)
+
+    def origins(self):
+        """
+        Returns the http(s) origins of every buffered network and navigation event.
+
+        Returns:
+            set[str]: Origins such as ``"https://example.com"``.
+        """
+        origins = set()
+        for kind in (NETWORK, NAVIGATION):
+            for event in self.events(kind):
+                origin = url_origin(event.get("url"))
+                if origin:
+                    origins.add(origin)
+        return origins
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        """Close the WebSocket and stop the reader thread."""
+        try:
+            self._ws.close()
+        except Exception as e:
+            logger.debug(f"Error closing BiDi connection: {e}")
+        self._thread.join(timeout=5)
+
+
+def open_event_stream(driver, timeout=10):
+    """
+    Connects an EventStream to a session started with ``webSocketUrl`` enabled.
+
+    Args:
+        driver: The WebDriver instance.
+        timeout (float): Seconds to wait for the connection.
+
+    Returns:
+        EventStream or None: The stream, or None if the session has no BiDi
+        endpoint or the connection failed.
+    """
+    ws_url = driver.capabilities.get("webSocketUrl")
+    if not isinstance(ws_url, str):
+        logger.debug("Session has no BiDi WebSocket; event stream disabled")
+        return None
+    try:
+        stream = EventStream(ws_url, timeout)
+        logger.info("Streaming BiDi console, network and navigation events")
+        return stream
+    except Exception as e:
+        logger.warning(f"Failed to open BiDi event stream: {e}")
+        return None
@@ -1,7 +1,67 @@
-"""Utility functions for reading from and writing to Excel files."""
+"""Utility functions for reading from and writing to Excel files.
 
-import openpyxl
-from openpyxl.styles import PatternFill
+openpyxl is imported on first use so that collecting tests does not load it.
+Workbooks are parsed once and cached by path, and parsed again only when the
+file changes on disk. Large sheets can be streamed with iter_rows().
+"""
+
+import os
+import threading
+
+# (absolute path, read_only) -> ((mtime_ns, size), workbook)
+_workbooks = {}
+_lock = threading.Lock()
+
+
+def _file_version(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _close(workbook, read_only):
+    # Read-only workbooks keep the file open until closed
+    if read_only:
+        workbook.close()
+
+
+def _get_workbook(file, read_only=False):
+    """
+    Returns the cached workbook for ``file``, loading it if the file changed.
+
+    Args:
+        file (str): The path to the Excel file.
+        read_only (bool): Open in openpyxl's streaming read-only mode.
+
+    Returns:
+        openpyxl.Workbook: The workbook.
+    """
+    import openpyxl
+
+    key = (os.path.abspath(file), read_only)
+    version = _file_version(file)
+    with _lock:
+        cached = _workbooks.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+        if cached:
+            _close(cached[1], read_only)
+        workbook = openpyxl.load_workbook(file, read_only=read_only)
+        _workbooks[key] = (version, workbook)
+        return workbook
+
+
+def clear_cache():
+    """Closes and forgets every cached workbook."""
+    with _lock:
+        for (_, read_only), (_, workbook) in _workbooks.items():
+            _close(workbook, read_only)
+        _workbooks.clear()
+
+
+def _get_sheet(workbook, sheet_name):
+    if sheet_name not in workbook.sheetnames:
+        raise ValueError(f"Sheet '{sheet_name}' does not exist in the workbook.")
+    return workbook[sheet_name]
 
 
 def load_sheet(file, sheet_name):
@@ -15,10 +75,30 @@ def load_sheet(file, sheet_name):
     Returns:
         openpyxl.worksheet.worksheet.Worksheet: The loaded sheet.
     """
-    workbook = openpyxl.load_workbook(file)
-    if sheet_name not in workbook.sheetnames:
-        raise ValueError(f"Sheet '{sheet_name}' does not exist in the workbook.")
-    return workbook[sheet_name]
+    return _get_sheet(_get_workbook(file), sheet_name)
+
+
+def iter_rows(file, sheet_name, min_row=1, max_row=None, values_only=True):
+    """
+    Streams the rows of a sheet without loading the whole sheet into memory.
+
+    The workbook is opened read-only, so rows are parsed as they are consumed.
+    Do not update the file with update_cell() while iterating over it.
+
+    Args:
+        file (str): The path to the Excel file.
+        sheet_name (str): The name of the sheet within the Excel file.
+        min_row (int): The first row to yield (1-indexed).
+        max_row (int): The last row to yield, or None for every row.
+        values_only (bool): Yield tuples of cell values instead of cells.
+
+    Yields:
+        tuple: One row at a time.
+    """
+    sheet = _get_sheet(_get_workbook(file, read_only=True), sheet_name)
+    yield from sheet.iter_rows(
+        min_row=min_row, max_row=max_row, values_only=values_only
+    )
 
 
 def get_row_count(file, sheet_name):
@@ -32,9 +112,7 @@ def get_row_count(file, sheet_name):
     Returns:
         int: The number of rows in the sheet.
     """
-    workbook = openpyxl.load_workbook(file)
-    sheet = workbook[sheet_name]
-    return sheet.max_row
+    return load_sheet(file, sheet_name).max_row
 
 
 def read_data(file, sheet_name, row_num, col_num):
@@ -50,17 +128,24 @@ def read_data(file, sheet_name, row_num, col_num):
     Returns:
         any: The value from the specified cell.
     """
-    workbook = openpyxl.load_workbook(file)
-    sheet = workbook[sheet_name]
+    sheet = load_sheet(file, sheet_name)
     data = sheet.cell(row_num, col_num).value
     return data
 
 
 def update_cell(file, sheet_name, row, col, value=None, fill=None):
-    workbook = openpyxl.load_workbook(file)
+    workbook = _get_workbook(file)
     sheet = workbook[sheet_name]
     if value is not None:
         sheet.cell(row=row, column=col).value = value
     if fill is not None:
         sheet.cell(row=row, column=col).fill = fill
-    workbook.save(file)
+
+    path = os.path.abspath(file)
+    with _lock:
+        streaming = _workbooks.pop((path, True), None)
+        if streaming:
+            _close(streaming[1], True)
+        workbook.save(file)
+        # The cached workbook is what was just written, so keep it for the new version
+        _workbooks[(path, False)] = (_file_version(file), workbook)
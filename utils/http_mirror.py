@@ -0,0 +1,490 @@
+"""
+Record-and-replay HTTP mirror that the browser is routed through as a proxy.
+
+In record mode every request is forwarded to the real site and the response is
+stored in an on-disk archive, one index file per test. In replay mode responses
+are served from the archive, so runs need no network access. HTTPS is
+intercepted with a self-signed certificate, which Chrome accepts because it runs
+with ``--ignore-certificate-errors`` (Firefox with ``acceptInsecureCerts``).
+
+Archive layout::
+
+    <archive_dir>/index/<test id>.json   requests and response metadata per test
+    <archive_dir>/bodies/<sha256>        response bodies, shared between tests
+"""
+
+import hashlib
+import json
+import os
+import re
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from utils.logger import logger
+from utils.paths import get_absolute_path
+
+MODES = ("off", "record", "replay")
+
+# Headers that describe a single connection and must not be stored or forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "proxy-connection",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+    "content-length",
+}
+
+CERT_DIR = get_absolute_path(".cache", "mirror")
+
+_active_mirror = None
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _without_query(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def _safe_name(test_id):
+    """Turn a pytest node id into a file name."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", test_id).strip("_") or "session"
+
+
+class HttpArchive:
+    """
+    Recorded HTTP exchanges, grouped by the test that made them.
+
+    Lookups try the current test's recording first and then every other test's,
+    so a resource a pooled browser had cached while recording is still found.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.index_dir = os.path.join(root, "index")
+        self.bodies_dir = os.path.join(root, "bodies")
+        self._tests = {}
+        self._all = None
+        self._served = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def request_key(method, url, body=b""):
+        """Key identifying a request: method, URL and a hash of any body."""
+        key = f"{method} {url}"
+        if body:
+            key += f" {_sha256(body)[:16]}"
+        return key
+
+    def _index_file(self, test_id):
+        return os.path.join(self.index_dir, f"{_safe_name(test_id)}.json")
+
+    def _load(self, test_id):
+        if test_id not in self._tests:
+            try:
+                with open(self._index_file(test_id), "r", encoding="utf-8") as f:
+                    self._tests[test_id] = json.load(f)
+            except (OSError, ValueError):
+                self._tests[test_id] = {}
+        return self._tests[test_id]
+
+    def _load_all(self):
+        """Merge the recordings of every test, for lookups outside the current one."""
+        if self._all is None:
+            self._all = {}
+            if os.path.isdir(self.index_dir):
+                for name in sorted(os.listdir(self.index_dir)):
+                    try:
+                        with open(
+                            os.path.join(self.index_dir, name), "r", encoding="utf-8"
+                        ) as f:
+                            entries = json.load(f)
+                    except (OSError, ValueError):
+                        continue
+                    for key, responses in entries.items():
+                        self._all.setdefault(key, responses)
+        return self._all
+
+    def start_test(self, test_id, clear=False):
+        """
+        Begins serving or recording a test.
+
+        Args:
+            test_id (str): The pytest node id.
+            clear (bool): Discard the test's previous recording (record mode).
+        """
+        with self._lock:
+            if clear:
+                self._tests[test_id] = {}
+            else:
+                self._load(test_id)
+            self._served = {}
+
+    def record(self, test_id, key, status, reason, headers, body):
+        """Stores one response for ``key`` in the test's recording."""
+        digest = _sha256(body)
+        body_file = os.path.join(self.bodies_dir, digest)
+        if not os.path.exists(body_file):
+            os.makedirs(self.bodies_dir, exist_ok=True)
+            tmp_file = f"{body_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(body)
+            os.replace(tmp_file, body_file)
+
+        response = {
+            "status": status,
+            "reason": reason,
+            "headers": headers,
+            "body": digest,
+        }
+        with self._lock:
+            self._load(test_id).setdefault(key, []).append(response)
+
+    def _find(self, test_id, key):
+        """Returns the recorded responses for ``key``, or None."""
+        sources = (self._load(test_id), self._load_all())
+        for entries in sources:
+            if key in entries:
+                return entries[key]
+
+        method, url = key.split(" ")[:2]
+        target = _without_query(url)
+        for entries in sources:
+            for name, responses in entries.items():
+                name_method, name_url = name.split(" ")[:2]
+                if name_method == method and _without_query(name_url) == target:
+                    return responses
+        return None
+
+    def lookup(self, test_id, key):
+        """
+        Finds the recorded response for a request.
+
+        Repeated requests get the recorded responses in order, then the last one
+        again. Falls back to other tests' recordings, then to the same URL
+        without its query string.
+
+        Returns:
+            tuple or None: (status, reason, headers, body), or None on a miss.
+        """
+        with self._lock:
+            responses = self._find(test_id, key)
+            if not responses:
+                return None
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            response = responses[min(index, len(responses) - 1)]
+
+        try:
+            with open(os.path.join(self.bodies_dir, response["body"]), "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        return response["status"], response["reason"], response["headers"], body
+
+    def save(self, test_id):
+        """Writes the test's recording to disk."""
+        with self._lock:
+            entries = self._tests.get(test_id)
+            if not entries:
+                return
+            os.makedirs(self.index_dir, exist_ok=True)
+            index_file = self._index_file(test_id)
+            tmp_file = f"{index_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_file, index_file)
+            self._all = None
+        logger.info(f"Recorded {len(entries)} requests to {index_file}")
+
+
+def _ensure_certificate(cert_dir=CERT_DIR):
+    """
+    Returns a self-signed certificate and key for intercepting HTTPS.
+
+    The pair is generated once with the openssl command line tool and reused.
+
+    Returns:
+        tuple[str, str]: Paths of the certificate and the private key.
+
+    Raises:
+        RuntimeError: If openssl is not available.
+    """
+    cert_file = os.path.join(cert_dir, "mirror-cert.pem")
+    key_file = os.path.join(cert_dir, "mirror-key.pem")
+    if os.path.exists(cert_file) and os.path.exists(key_file):
+        return cert_file, key_file
+
+    os.makedirs(cert_dir, exist_ok=True)
+    suffix = f".{os.getpid()}.tmp"
+    try:
+        subprocess.run(
+            [
+                "openssl",
+                "req",
+                "-x509",
+                "-newkey",
+                "rsa:2048",
+                "-nodes",
+                "-days",
+                "3650",
+                "-subj",
+                "/CN=selenium-pytest-mirror",
+                "-keyout",
+                key_file + suffix,
+                "-out",
+                cert_file + suffix,
+            ],
+            capture_output=True,
+            check=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        raise RuntimeError(
+            f"openssl is required to intercept HTTPS in the HTTP mirror: {e}"
+        ) from e
+    os.replace(key_file + suffix, key_file)
+    os.replace(cert_file + suffix, cert_file)
+    return cert_file, key_file
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    """Proxy request handler; ``server.mirror`` is the owning HttpMirror."""
+
+    protocol_version = "HTTP/1.1"
+    _tunnel_host = None
+
+    def log_message(self, format, *args):
+        logger.debug(f"Mirror: {format % args}")
+
+    def do_CONNECT(self):
+        """Terminate TLS locally and handle the tunnelled requests ourselves."""
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        try:
+            tls = self.server.mirror.ssl_context.wrap_socket(
+                self.connection, server_side=True
+            )
+        except (ssl.SSLError, OSError) as e:
+            logger.debug(f"Mirror: TLS handshake for {self.path} failed: {e}")
+            self.close_connection = True
+            return
+
+        self._tunnel_host = self.path
+        self.connection = tls
+        self.rfile = tls.makefile("rb", self.rbufsize)
+        self.wfile = tls.makefile("wb", self.wbufsize)
+        self.close_connection = False
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def _absolute_url(self):
+        if self._tunnel_host:
+            host, _, port = self._tunnel_host.partition(":")
+            netloc = host if port in ("", "443") else self._tunnel_host
+            return f"https://{netloc}{self.path}"
+        return self.path
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = self._absolute_url()
+        status, reason, headers, payload = self.server.mirror.handle(
+            self.command, url, dict(self.headers.items()), body
+        )
+
+        self.send_response(status, reason)
+        for name, value in headers:
+            if name.lower() not in HOP_BY_HOP_HEADERS:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _handle
+
+
+class HttpMirror:
+    """
+    Local proxy that records live traffic or replays it from an HttpArchive.
+
+    Args:
+        mode (str): "record" or "replay".
+        archive_dir (str): Root directory of the archive.
+        upstream_timeout (float): Seconds to wait for live sites in record mode.
+    """
+
+    def __init__(self, mode, archive_dir, upstream_timeout=30):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported mirror mode: '{mode}'")
+        self.mode = mode
+        self.archive = HttpArchive(archive_dir)
+        self.upstream_timeout = upstream_timeout
+        self.test_id = "session"
+        self.misses = []
+        self.ssl_context = None
+        self._server = None
+        self._thread = None
+        self._upstream = None
+
+    @property
+    def address(self):
+        """The ``host:port`` the browser should use as its proxy."""
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self, port=0):
+        """
+        Starts serving on 127.0.0.1 in a background thread.
+
+        Args:
+            port (int): Port to listen on; 0 picks a free one.
+        """
+        cert_file, key_file = _ensure_certificate()
+        self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ssl_context.load_cert_chain(cert_file, key_file)
+
+        if self.mode == "record":
+            import urllib3
+
+            # Match the browser, which runs with --ignore-certificate-errors
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            self._upstream = urllib3.PoolManager(
+                retries=False, timeout=self.upstream_timeout, cert_reqs="CERT_NONE"
+            )
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _MirrorHandler)
+        self._server.daemon_threads = True
+        self._server.mirror = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="http-mirror", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"HTTP mirror ({self.mode}) listening on {self.address}, archive {self.archive.root}"
+        )
+
+    def stop(self):
+        """Stops the server and closes upstream connections."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._upstream:
+            self._upstream.clear()
+        if self.misses:
+            logger.warning(f"HTTP mirror missed {len(self.misses)} requests in replay")
+
+    def start_test(self, test_id):
+        """Routes traffic to the recording of ``test_id``."""
+        self.test_id = test_id
+        self.archive.start_test(test_id, clear=self.mode == "record")
+
+    def finish_test(self):
+        """Saves the current test's recording in record mode."""
+        if self.mode == "record":
+            self.archive.save(self.test_id)
+        self.test_id = "session"
+
+    def handle(self, method, url, headers, body):
+        """
+        Answers one proxied request.
+
+        Returns:
+            tuple: (status, reason, headers as [name, value] pairs, body bytes).
+        """
+        key = HttpArchive.request_key(method, url, body)
+        if self.mode == "replay":
+            response = self.archive.lookup(self.test_id, key)
+            if response is None:
+                self.misses.append(key)
+                logger.warning(f"HTTP mirror has no recording for {key}")
+                return 504, "Not Recorded", [["Content-Type", "text/plain"]], b""
+            return response
+
+        return self._fetch_and_record(method, url, headers, body, key)
+
+    def _fetch_and_record(self, method, url, headers, body, key):
+        forward_headers = {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+        try:
+            upstream = self._upstream.request(
+                method,
+                url,
+                body=body or None,
+                headers=forward_headers,
+                redirect=False,
+                preload_content=False,
+                decode_content=False,
+            )
+            payload = upstream.read(decode_content=False)
+            upstream.release_conn()
+        except Exception as e:
+            logger.warning(f"HTTP mirror failed to fetch {url}: {e}")
+            return 502, "Bad Gateway", [["Content-Type", "text/plain"]], b""
+
+        response_headers = [
+            [name, value]
+            for name, value in upstream.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        self.archive.record(
+            self.test_id,
+            key,
+            upstream.status,
+            upstream.reason or "",
+            response_headers,
+            payload,
+        )
+        return upstream.status, upstream.reason or "", response_headers, payload
+
+
+def start_mirror(mode, archive_dir, port=0, upstream_timeout=30):
+    """
+    Starts the process-wide mirror that new browsers are routed through.
+
+    Args:
+        mode (str): "off", "record" or "replay".
+        archive_dir (str): Root directory of the archive.
+        port (int): Port to listen on; 0 picks a free one.
+        upstream_timeout (float): Seconds to wait for live sites in record mode.
+
+    Returns:
+        HttpMirror or None: The running mirror, or None when mode is "off".
+    """
+    global _active_mirror
+    if mode == "off":
+        return None
+    if mode not in MODES:
+        raise ValueError(
+            f"Unsupported mirror mode: '{mode}'. Allowed values: {', '.join(MODES)}"
+        )
+    _active_mirror = HttpMirror(mode, archive_dir, upstream_timeout)
+    _active_mirror.start(port)
+    return _active_mirror
+
+
+def stop_mirror():
+    """Stops the process-wide mirror if one is running."""
+    global _active_mirror
+    if _active_mirror:
+        _active_mirror.stop()
+        _active_mirror = None
+
+
+def get_active_mirror():
+    """Returns the running process-wide mirror, or None."""
+    return _active_mirror
@@ -0,0 +1,331 @@
+"""
+Check page-object and test locators against saved HTML snapshots, without a browser.
+
+Locators are collected from the Locator attributes of every page in ``pages/``
+and from the ``(By.X, "...")`` literals in ``tests/``. Each one is compiled and
+evaluated with lxml against the snapshots, by default the page sources that
+failing tests attach to Allure. A locator is reported as:
+
+- invalid: the selector does not compile or select elements (always a failure)
+- ambiguous: a single-element locator matches several nodes in a snapshot
+- unmatched: it matches nothing in any snapshot (the page may not be captured)
+
+Ambiguous and unmatched locators fail the check only with ``--strict``.
+
+Usage:
+    python -m utils.locator_validator [SNAPSHOT ...] [--strict]
+"""
+
+import argparse
+import ast
+import glob
+import importlib
+import os
+import pkgutil
+import sys
+import time
+from collections import namedtuple
+from utils.paths import get_absolute_path
+
+PROJECT_ROOT = get_absolute_path()
+
+# Where page sources attached by conftest._attach_page_source end up
+DEFAULT_SNAPSHOTS = ("allure-results/*-attachment.html",)
+
+# Selenium By values (and their By.* attribute names) to a CSS selector template
+_CSS_EQUIVALENTS = {
+    "id": "#{}",
+    "name": '[name="{}"]',
+    "class name": ".{}",
+    "tag name": "{}",
+}
+_BY_NAMES = {
+    "ID": "id",
+    "NAME": "name",
+    "CLASS_NAME": "class name",
+    "TAG_NAME": "tag name",
+    "CSS_SELECTOR": "css selector",
+    "XPATH": "xpath",
+    "LINK_TEXT": "link text",
+    "PARTIAL_LINK_TEXT": "partial link text",
+}
+
+# Calls whose locator argument is expected to match several elements
+_MULTIPLE_CALLS = ("find_elements", "wait_for_elements_presence")
+
+# A locator and where it is declared; ``multiple`` if it is used to find a list
+LocatorSource = namedtuple("LocatorSource", ["by", "value", "origin", "multiple"])
+
+INVALID = "invalid"
+AMBIGUOUS = "ambiguous"
+UNMATCHED = "unmatched"
+UNCHECKED = "unchecked"
+
+
+class UnsupportedLocator(ValueError):
+    """A valid CSS selector that cssselect cannot translate, e.g. a pseudo-element."""
+
+
+def collect_page_locators():
+    """
+    Returns the Locator attributes of every page object in ``pages/``.
+
+    Returns:
+        list[LocatorSource]: One entry per declared locator.
+    """
+    import pages
+    from pages.locators import registered_pages
+
+    for module in pkgutil.iter_modules(pages.__path__):
+        importlib.import_module(f"pages.{module.name}")
+
+    sources = []
+    for page_class, locators in registered_pages().items():
+        for name, locator in locators.items():
+            if locator.owner is page_class:
+                origin = f"{page_class.__module__}.{page_class.__name__}.{name}"
+                sources.append(LocatorSource(*locator, origin, False))
+    return sources
+
+
+def collect_test_locators(test_dir=None):
+    """
+    Returns the ``(By.X, "literal")`` locators written in the test modules.
+
+    Args:
+        test_dir (str): Directory to scan; defaults to ``tests/``.
+
+    Returns:
+        list[LocatorSource]: One entry per locator literal.
+    """
+    test_dir = test_dir or os.path.join(PROJECT_ROOT, "tests")
+    sources = []
+    for path in sorted(glob.glob(os.path.join(test_dir, "**", "*.py"), recursive=True)):
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        relative = os.path.relpath(path, PROJECT_ROOT)
+        multiple_args = set()
+        # ast.walk is breadth-first, so a call is seen before the tuples passed to it
+        for node in ast.walk(tree):
+            origin = f"{relative}:{getattr(node, 'lineno', 0)}"
+            if isinstance(node, ast.Call):
+                func = node.func
+                name = func.attr if isinstance(func, ast.Attribute) else None
+                name = func.id if isinstance(func, ast.Name) else name
+                if name in _MULTIPLE_CALLS:
+                    multiple_args.update(id(arg) for arg in node.args)
+                locator = _locator_literal(node.args)
+                if locator and name in ("find_element", "find_elements"):
+                    sources.append(
+                        LocatorSource(*locator, origin, name == "find_elements")
+                    )
+            elif isinstance(node, ast.Tuple) and len(node.elts) == 2:
+                locator = _locator_literal(node.elts)
+                if locator:
+                    sources.append(
+                        LocatorSource(*locator, origin, id(node) in multiple_args)
+                    )
+    return sources
+
+
+def _locator_literal(nodes):
+    """Returns (by, value) if ``nodes`` start with ``By.X, "literal"``, else None."""
+    if len(nodes) < 2:
+        return None
+    by, value = nodes[0], nodes[1]
+    if (
+        isinstance(by, ast.Attribute)
+        and isinstance(by.value, ast.Name)
+        and by.value.id == "By"
+        and by.attr in _BY_NAMES
+        and isinstance(value, ast.Constant)
+        and isinstance(value.value, str)
+    ):
+        return _BY_NAMES[by.attr], value.value
+    return None
+
+
+def to_xpath(by, value):
+    """
+    Translates a Selenium locator into an XPath expression lxml can evaluate.
+
+    Args:
+        by (str): The locator strategy, e.g. "css selector".
+        value (str): The selector.
+
+    Returns:
+        str: The equivalent XPath.
+
+    Raises:
+        ValueError: The selector is not valid for its strategy.
+        UnsupportedLocator: The CSS uses features cssselect cannot evaluate.
+    """
+    from cssselect import GenericTranslator, SelectorSyntaxError
+    from cssselect.xpath import ExpressionError
+
+    if by == "xpath":
+        return value
+    if by == "link text":
+        return f"//a[normalize-space(.)={_xpath_string(value.strip())}]"
+    if by == "partial link text":
+        return f"//a[contains(., {_xpath_string(value)})]"
+    if by in _CSS_EQUIVALENTS:
+        if by != "tag name":
+            value = _css_escape(value)
+        by, value = "css selector", _CSS_EQUIVALENTS[by].format(value)
+    if by != "css selector":
+        raise ValueError(f"Unsupported locator strategy: {by}")
+    try:
+        return GenericTranslator().css_to_xpath(value)
+    except SelectorSyntaxError as e:
+        raise ValueError(f"Invalid CSS selector: {e}") from e
+    except ExpressionError as e:
+        raise UnsupportedLocator(str(e)) from e
+
+
+def _xpath_string(text):
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ', "\'", '.join(f"'{part}'" for part in parts) + ")"
+
+
+def _css_escape(value):
+    return "".join(c if c.isalnum() or c in "-_" else f"\\{c}" for c in value)
+
+
+def load_snapshots(patterns):
+    """
+    Parses the HTML snapshots matching the glob patterns.
+
+    Args:
+        patterns (Iterable[str]): File paths or globs, relative to the project root.
+
+    Returns:
+        dict: Snapshot path mapped to its lxml document.
+    """
+    import lxml.html
+
+    snapshots = {}
+    for pattern in patterns:
+        for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, pattern))):
+            with open(path, "rb") as f:
+                content = f.read()
+            if content.strip():
+                snapshots[os.path.relpath(path, PROJECT_ROOT)] = (
+                    lxml.html.document_fromstring(content)
+                )
+    return snapshots
+
+
+def check_locator(source, snapshots):
+    """
+    Compiles a locator and counts its matches in every snapshot.
+
+    Args:
+        source (LocatorSource): The locator to check.
+        snapshots (dict): Parsed documents, from load_snapshots().
+
+    Returns:
+        tuple[str or None, str]: The problem (INVALID, AMBIGUOUS, UNMATCHED,
+        UNCHECKED) or None if the locator is fine, and a detail message.
+    """
+    from lxml import etree
+
+    try:
+        xpath = etree.XPath(to_xpath(source.by, source.value))
+    # UnsupportedLocator is a ValueError, so it is caught first
+    except UnsupportedLocator as e:
+        return UNCHECKED, str(e)
+    except (ValueError, etree.XPathSyntaxError) as e:
+        return INVALID, str(e)
+
+    counts = {}
+    for path, document in snapshots.items():
+        try:
+            matches = xpath(document)
+        except etree.XPathEvalError as e:
+            return INVALID, str(e)
+        if not isinstance(matches, list):
+            return INVALID, f"selects a {type(matches).__name__}, not elements"
+        if matches:
+            counts[path] = len(matches)
+    if not snapshots:
+        return None, "compiles"
+    if not counts:
+        return UNMATCHED, f"no match in {len(snapshots)} snapshot(s)"
+    if not source.multiple:
+        crowded = {path: n for path, n in counts.items() if n > 1}
+        if crowded:
+            path, n = max(crowded.items(), key=lambda item: item[1])
+            return AMBIGUOUS, f"{n} matches in {path}"
+    return None, f"matches in {len(counts)} snapshot(s)"
+
+
+def validate(snapshot_patterns=DEFAULT_SNAPSHOTS):
+    """
+    Checks every page-object and test locator against the snapshots.
+
+    Args:
+        snapshot_patterns (Iterable[str]): Snapshot files or globs.
+
+    Returns:
+        tuple[list, int]: Each locator as a (LocatorSource, problem, detail)
+        tuple, see check_locator(), and the number of snapshots loaded.
+    """
+    snapshots = load_snapshots(snapshot_patterns)
+    seen = set()
+    results = []
+    for source in collect_page_locators() + collect_test_locators():
+        key = (source.by, source.value, source.origin)
+        if key in seen:
+            continue
+        seen.add(key)
+        results.append((source, *check_locator(source, snapshots)))
+    return results, len(snapshots)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "snapshots",
+        nargs="*",
+        default=list(DEFAULT_SNAPSHOTS),
+        help="HTML snapshot files or globs (default: Allure page-source attachments)",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="also fail on ambiguous and unmatched locators",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results, snapshot_count = validate(args.snapshots)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    failing = {INVALID, AMBIGUOUS, UNMATCHED} if args.strict else {INVALID}
+    # Unmatched locators are usually pages without a snapshot, so only list them when strict
+    listed = failing | {AMBIGUOUS, UNCHECKED}
+    counts = {}
+    for source, problem, detail in results:
+        if not problem:
+            continue
+        counts[problem] = counts.get(problem, 0) + 1
+        if problem in listed:
+            print(
+                f"{problem.upper():<10} {source.origin}: "
+                f"{source.by}={source.value!r} ({detail})"
+            )
+    summary = ", ".join(f"{n} {problem}" for problem, n in sorted(counts.items()))
+    print(
+        f"\nChecked {len(results)} locators against {snapshot_count} snapshot(s) "
+        f"in {elapsed_ms:.0f} ms: {summary or 'no problems'}."
+    )
+    return 1 if any(problem in failing for problem in counts) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,8 @@
 
 import os
 import sys
+import threading
 from datetime import datetime
-from loguru import logger
-import allure
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 LOG_DIR = os.path.join(BASE_DIR, "logs")
@@ -12,11 +11,12 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 ENV = os.getenv("ENV", "development").lower()
 
-log_filename = f"selenium_log_{datetime.now().strftime('%Y-%m-%d')}.log"
+# Each xdist worker writes to its own log file so parallel runs never interleave
+WORKER_ID = os.getenv("PYTEST_XDIST_WORKER")
+log_suffix = f"_{WORKER_ID}" if WORKER_ID else ""
+log_filename = f"selenium_log_{datetime.now().strftime('%Y-%m-%d')}{log_suffix}.log"
 log_file_path = os.path.join(LOG_DIR, log_filename)
 
-logger.remove()
-
 LOG_FORMAT = (
     "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
     "<level>{level: <8}</level> | "
@@ -24,24 +24,54 @@ LOG_FORMAT = (
     "<level>{message}</level>"
 )
 
-logger.add(
-    sys.stdout,
-    level="ERROR" if ENV == "development" else "ERROR",
-    colorize=True,
-    format=LOG_FORMAT,
-)
 
-logger.add(
-    log_file_path,
-    level="ERROR" if ENV == "development" else "ERROR",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-    rotation="1 MB",
-    retention="7 days",
-    encoding="utf-8",
-    enqueue=True,
-    # backtrace=True,
-    # diagnose=True,
-)
+def _configure():
+    """Imports loguru and installs the console and file handlers."""
+    from loguru import logger
+
+    logger.remove()
+
+    logger.add(
+        sys.stdout,
+        level="ERROR" if ENV == "development" else "ERROR",
+        colorize=True,
+        format=LOG_FORMAT,
+    )
+
+    logger.add(
+        log_file_path,
+        level="ERROR" if ENV == "development" else "ERROR",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+        rotation="1 MB",
+        retention="7 days",
+        encoding="utf-8",
+        enqueue=True,
+        # backtrace=True,
+        # diagnose=True,
+    )
+    return logger
+
+
+class _LazyLogger:
+    """
+    Stands in for the loguru logger until something is first logged.
+
+    Importing loguru and starting its file writer costs more than most of the
+    modules that log, so both wait for the first call on ``logger``.
+    """
+
+    _lock = threading.Lock()
+    _logger = None
+
+    def __getattr__(self, name):
+        if _LazyLogger._logger is None:
+            with _LazyLogger._lock:
+                if _LazyLogger._logger is None:
+                    _LazyLogger._logger = _configure()
+        return getattr(_LazyLogger._logger, name)
+
+
+logger = _LazyLogger()
 
 
 def catch_exceptions(type_, value, traceback):
@@ -57,6 +87,8 @@ LOG_PATH = log_file_path
 
 def attach_log_to_allure():
     try:
+        import allure
+
         if os.path.exists(LOG_PATH):
             with open(LOG_PATH, "r", encoding="utf-8") as log_file:
                 allure.attach(
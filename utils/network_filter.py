@@ -0,0 +1,233 @@
+"""Blocklist resolution and savings accounting for third-party request blocking."""
+
+import json
+import os
+import threading
+from collections import namedtuple
+from fnmatch import fnmatchcase
+from urllib.parse import urlsplit
+from utils.logger import logger
+from utils.paths import get_absolute_path
+
+SIZE_CACHE_FILE = get_absolute_path(".cache", "resource_sizes.json")
+
+# blockedReason Chrome reports for requests stopped by Network.setBlockedURLs
+BLOCKED_REASON = "inspector"
+
+# Requests seen in a performance log: blocked URLs, completed URLs mapped to
+# their transfer size, and how many responses there were and came from disk cache
+NetworkActivity = namedtuple(
+    "NetworkActivity", ["blocked", "loaded", "responses", "cache_hits"]
+)
+
+
+def resolve_blocklist(block, allow=()):
+    """
+    Returns the blocklist patterns that are not let through by the allowlist.
+
+    Allowlist entries are matched against the blocklist patterns themselves,
+    so ``"*googletagmanager.com*"`` or ``"*google*"`` both unblock Tag Manager.
+
+    Args:
+        block (Iterable[str]): URL patterns to block, with "*" wildcards.
+        allow (Iterable[str]): Patterns of blocklist entries to drop.
+
+    Returns:
+        list[str]: The patterns to pass to Network.setBlockedURLs.
+    """
+    allow = list(allow)
+    patterns = []
+    for pattern in block:
+        if pattern in patterns or any(fnmatchcase(pattern, a) for a in allow):
+            continue
+        patterns.append(pattern)
+    return patterns
+
+
+def url_matches(url, patterns):
+    """Returns True if ``url`` matches any of the wildcard patterns."""
+    return any(fnmatchcase(url, pattern) for pattern in patterns)
+
+
+def parse_performance_log(entries):
+    """
+    Extracts blocked, completed and cached requests from a Chrome performance log.
+
+    Args:
+        entries (list[dict]): Entries from ``driver.get_log("performance")``.
+
+    Returns:
+        NetworkActivity: The requests made while the log was recorded.
+    """
+    urls = {}
+    blocked = []
+    loaded = {}
+    responses = 0
+    cache_hits = 0
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+
+        if method == "Network.requestWillBeSent":
+            urls[request_id] = params.get("request", {}).get("url", "")
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason") == BLOCKED_REASON and request_id in urls:
+                blocked.append(urls[request_id])
+        elif method == "Network.responseReceived":
+            responses += 1
+            if params.get("response", {}).get("fromDiskCache"):
+                cache_hits += 1
+        elif method == "Network.loadingFinished" and request_id in urls:
+            loaded[urls[request_id]] = int(params.get("encodedDataLength", 0))
+    return NetworkActivity(blocked, loaded, responses, cache_hits)
+
+
+def format_savings(savings):
+    """
+    Describes the requests blocking avoided, e.g. for the log.
+
+    Args:
+        savings (dict): A result of NetworkSavings.record() or its summary total.
+
+    Returns:
+        str: "N requests (~X KiB estimated, M of unknown size)".
+    """
+    estimate = savings["estimated_bytes_avoided"]
+    size = (
+        "size unknown" if estimate is None else f"~{estimate / 1024:.0f} KiB estimated"
+    )
+    if estimate is not None and savings["unsized_requests"]:
+        size += f", {savings['unsized_requests']} of unknown size"
+    return f"{savings['requests_blocked']} requests ({size})"
+
+
+def _strip_query(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class NetworkSavings:
+    """
+    Per-test record of the requests avoided by blocking, with estimated bytes.
+
+    Blocked requests are never downloaded, so their size is estimated from the
+    last time the same URL (or, failing that, the same host) was loaded
+    unblocked, e.g. in a run with ``network_blocking: false``. Sizes are kept
+    in ``.cache/resource_sizes.json`` between runs. A resource that has only
+    ever been blocked has no known size, so byte figures are estimates and are
+    None when no blocked request could be sized.
+    """
+
+    def __init__(self, cache_file=SIZE_CACHE_FILE):
+        self.cache_file = cache_file
+        self._sizes = None
+        self._tests = {}
+        self._lock = threading.Lock()
+
+    def _load_sizes(self):
+        if self._sizes is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self._sizes = json.load(f)
+            except (OSError, ValueError):
+                self._sizes = {}
+        return self._sizes
+
+    def _estimate(self, url):
+        """Returns the expected transfer size of ``url``, or None if unknown."""
+        sizes = self._load_sizes()
+        size = sizes.get(_strip_query(url))
+        if size is not None:
+            return size
+        host = urlsplit(url).netloc
+        host_sizes = [
+            value for key, value in sizes.items() if urlsplit(key).netloc == host
+        ]
+        if host_sizes:
+            return sum(host_sizes) // len(host_sizes)
+        return None
+
+    def learn(self, loaded, patterns):
+        """
+        Remembers the sizes of loaded resources that the blocklist would stop.
+
+        Args:
+            loaded (dict): URL mapped to transfer size, from NetworkActivity.loaded.
+            patterns (Iterable[str]): The configured blocklist.
+        """
+        with self._lock:
+            sizes = self._load_sizes()
+            for url, size in loaded.items():
+                if url_matches(url, patterns):
+                    sizes[_strip_query(url)] = size
+
+    def record(self, test_name, blocked):
+        """
+        Records the requests a test avoided.
+
+        Args:
+            test_name (str): The test node id.
+            blocked (list[str]): URLs of the blocked requests.
+
+        Returns:
+            dict: Requests blocked, the estimated bytes avoided (None if no
+            blocked request could be sized) and the number of requests whose
+            size is unknown.
+        """
+        with self._lock:
+            sizes = [self._estimate(url) for url in blocked]
+            known = [size for size in sizes if size is not None]
+            result = {
+                "requests_blocked": len(blocked),
+                "estimated_bytes_avoided": sum(known) if known or not blocked else None,
+                "unsized_requests": len(sizes) - len(known),
+            }
+            self._tests[test_name] = result
+        return result
+
+    def summary(self):
+        """
+        Returns the savings of every test plus session totals.
+
+        Returns:
+            dict: ``{"total": {...}, "tests": {test_name: {...}}}``.
+        """
+        with self._lock:
+            tests = dict(self._tests)
+        total = {
+            key: sum(result[key] for result in tests.values())
+            for key in ("requests_blocked", "unsized_requests")
+        }
+        estimates = [
+            result["estimated_bytes_avoided"]
+            for result in tests.values()
+            if result["requests_blocked"]
+            and result["estimated_bytes_avoided"] is not None
+        ]
+        total["estimated_bytes_avoided"] = (
+            sum(estimates) if estimates or not total["requests_blocked"] else None
+        )
+        return {"total": total, "tests": tests}
+
+    def save_sizes(self):
+        """Writes the learned resource sizes to the on-disk cache."""
+        with self._lock:
+            if not self._sizes:
+                return
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(self._sizes, f, indent=2, sort_keys=True)
+                os.replace(tmp_file, self.cache_file)
+            except OSError as e:
+                logger.warning(f"Failed to write resource size cache: {e}")
+
+
+# Savings of every test run by this process
+network_savings = NetworkSavings()
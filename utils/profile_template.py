@@ -0,0 +1,109 @@
+"""Pre-seeded browser profile templates cloned into each new user data dir."""
+
+import atexit
+import errno
+import os
+import shutil
+import threading
+from utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows has no reflinks; profiles are copied instead
+    fcntl = None
+
+# ioctl request code for FICLONE (copy-on-write clone of a whole file) on Linux
+FICLONE = 0x40049409
+
+# Files Chrome uses to lock a profile to a single running instance
+LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+
+_template_dir = None
+_template_lock = threading.Lock()
+_reflink_supported = fcntl is not None
+
+
+def _reflink(src, dst):
+    """Clone ``src`` to ``dst`` with a copy-on-write reflink."""
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    shutil.copystat(src, dst)
+
+
+def _clone_file(src, dst):
+    """Reflink a file where the filesystem supports it, otherwise copy it."""
+    global _reflink_supported
+    if _reflink_supported:
+        try:
+            _reflink(src, dst)
+            return
+        except OSError as e:
+            if e.errno not in (
+                errno.EOPNOTSUPP,
+                errno.EXDEV,
+                errno.EINVAL,
+                errno.ENOTTY,
+            ):
+                raise
+            _reflink_supported = False
+            logger.info("Filesystem does not support reflinks, copying profiles")
+    shutil.copy2(src, dst)
+
+
+def clone_profile(template_dir, user_data_dir):
+    """
+    Populates a user data dir from the profile template.
+
+    Args:
+        template_dir (str): The template profile built by get_profile_template().
+        user_data_dir (str): The (existing, empty) directory to populate.
+    """
+    shutil.copytree(
+        template_dir,
+        user_data_dir,
+        copy_function=_clone_file,
+        symlinks=True,
+        dirs_exist_ok=True,
+    )
+    logger.info(f"Cloned profile template into {user_data_dir}")
+
+
+def _remove_template():
+    if _template_dir and os.path.isdir(_template_dir):
+        shutil.rmtree(_template_dir, ignore_errors=True)
+        logger.info(f"Removed profile template: {_template_dir}")
+
+
+def get_profile_template(build):
+    """
+    Returns the profile template for this process, building it on first use.
+
+    Args:
+        build (callable): Launches a browser once and returns the path of the
+            profile it leaves behind.
+
+    Returns:
+        str or None: The template directory, or None if it could not be built.
+    """
+    global _template_dir
+    with _template_lock:
+        if _template_dir and os.path.isdir(_template_dir):
+            return _template_dir
+
+        try:
+            template_dir = build()
+        except Exception as e:
+            logger.warning(f"Failed to build profile template: {e}")
+            return None
+
+        for name in LOCK_FILES:
+            path = os.path.join(template_dir, name)
+            if os.path.lexists(path):
+                os.remove(path)
+
+        _template_dir = template_dir
+        logger.info(f"Built profile template: {template_dir}")
+        return _template_dir
+
+
+atexit.register(_remove_template)
@@ -0,0 +1,121 @@
+"""Remote WebDriver connection with a shared keep-alive pool and per-command timing."""
+
+import statistics
+import threading
+import time
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from urllib3.util.retry import Retry
+from utils.logger import logger
+
+# Retry opening a connection the endpoint refused or timed out, e.g. while the
+# grid restarts. Kept-alive connections the grid closed while idle are replaced
+# when they are taken from the pool. A command the endpoint may already have
+# received is never sent again (read=0)
+COMMAND_RETRIES = Retry(total=2, connect=2, read=0, other=0)
+
+
+class CommandStats:
+    """Thread-safe record of how long each WebDriver command took on the wire."""
+
+    def __init__(self):
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def record(self, command, elapsed):
+        with self._lock:
+            self._latencies.setdefault(command, []).append(elapsed)
+
+    def summary(self):
+        """
+        Summarises the recorded latencies per command.
+
+        Returns:
+            dict: Command name mapped to count, mean, p50, p95 and max in milliseconds,
+            slowest total time first.
+        """
+        with self._lock:
+            latencies = {name: list(values) for name, values in self._latencies.items()}
+
+        summary = {}
+        for name, values in sorted(
+            latencies.items(), key=lambda item: sum(item[1]), reverse=True
+        ):
+            values.sort()
+            summary[name] = {
+                "count": len(values),
+                "mean_ms": round(statistics.mean(values) * 1000, 2),
+                "p50_ms": round(values[len(values) // 2] * 1000, 2),
+                "p95_ms": round(values[int(len(values) * 0.95)] * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._latencies.clear()
+
+
+class PooledRemoteConnection(RemoteConnection):
+    """
+    RemoteConnection that shares one urllib3 pool between all drivers in the process.
+
+    Every command is timed and recorded in ``PooledRemoteConnection.stats``.
+    """
+
+    stats = CommandStats()
+    pool_size = 10
+    _shared_pool = None
+    _pool_lock = threading.Lock()
+
+    def _get_connection_manager(self):
+        with PooledRemoteConnection._pool_lock:
+            if PooledRemoteConnection._shared_pool is None:
+                # The base class applies the proxy and certificate settings
+                manager = super()._get_connection_manager()
+                manager.connection_pool_kw.update(
+                    maxsize=self.pool_size, block=False, retries=COMMAND_RETRIES
+                )
+                PooledRemoteConnection._shared_pool = manager
+                logger.info(
+                    f"Created shared WebDriver connection pool (maxsize={self.pool_size})"
+                )
+            return PooledRemoteConnection._shared_pool
+
+    def execute(self, command, params):
+        started = time.perf_counter()
+        try:
+            return super().execute(command, params)
+        finally:
+            self.stats.record(command, time.perf_counter() - started)
+
+    def close(self):
+        """Leave the shared pool open for the other drivers; see close_pool()."""
+
+    @classmethod
+    def close_pool(cls):
+        """Close every connection in the shared pool."""
+        with cls._pool_lock:
+            if cls._shared_pool is not None:
+                cls._shared_pool.clear()
+                cls._shared_pool = None
+
+
+def create_remote_connection(url, pool_size=10, timeout=120, keep_alive=True):
+    """
+    Builds a connection to a WebDriver endpoint that uses the shared pool.
+
+    Args:
+        url (str): The WebDriver endpoint, e.g. "http://127.0.0.1:9515".
+        pool_size (int): Maximum kept-alive connections to the endpoint.
+        timeout (float): Seconds to wait for the endpoint to answer a command.
+        keep_alive (bool): Reuse connections between commands.
+
+    Returns:
+        PooledRemoteConnection: The command executor for webdriver.Remote.
+    """
+    PooledRemoteConnection.pool_size = pool_size
+    client_config = ClientConfig(
+        remote_server_addr=url, keep_alive=keep_alive, timeout=timeout
+    )
+    return PooledRemoteConnection(client_config=client_config)
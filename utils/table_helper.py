@@ -0,0 +1,181 @@
+"""
+Reads whole HTML tables in one script call.
+"""
+
+from collections import namedtuple
+from typing import TYPE_CHECKING
+from utils.config import get_config
+from utils.logger import logger
+from utils.wait_helper import FIND_NODES_JS, wait_for_element_presence
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Header cell texts, one list of cell texts per body row, and whether every page was read
+Table = namedtuple("Table", ["headers", "rows", "complete"], defaults=(True,))
+
+# Resolves with {headers, rows, pages, complete, stopped} for the first table
+# matching the locator, or null if there is none. A leading row made only of <th>
+# cells is the header. With a pager locator the script also walks client-side
+# pagination: a single match is a "next" control clicked until it is disabled or
+# gone; several matches are numbered page links, clicked by page number. A click
+# that does not change the rows while a next page is still offered stops the read
+# as incomplete ("stalled"), as does running out of time ("budget").
+_READ_TABLE_SCRIPT = FIND_NODES_JS + """
+const [by, value, pagerBy, pagerValue, maxPages, pageTimeoutMs, budgetMs] = arguments;
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+const clean = (text) => (text || "").replace(/\\s+/g, " ").trim();
+const firstElement = (nodes) => nodes.find((node) => node.nodeType === Node.ELEMENT_NODE);
+
+function read() {
+    const table = firstElement(find(by, value));
+    if (!table) {
+        return null;
+    }
+    let headers = [];
+    const rows = [];
+    for (const row of Array.from(table.rows || table.querySelectorAll("tr"))) {
+        const cells = Array.from(row.cells || row.querySelectorAll("th, td"));
+        if (!headers.length && !rows.length && cells.length
+                && cells.every((cell) => cell.tagName === "TH")) {
+            headers = cells.map((cell) => clean(cell.innerText));
+        } else if (cells.length) {
+            rows.push(cells.map((cell) => clean(cell.innerText)));
+        }
+    }
+    return {headers: headers, rows: rows};
+}
+
+function disabled(el) {
+    return el.disabled || el.getAttribute("aria-disabled") === "true"
+        || el.classList.contains("disabled")
+        || (el.parentElement && el.parentElement.classList.contains("disabled"));
+}
+
+function pagerLinks() {
+    return pagerBy ? find(pagerBy, pagerValue).filter(
+        (node) => node.nodeType === Node.ELEMENT_NODE) : [];
+}
+
+const first = read();
+if (!first) {
+    done(null);
+} else {
+    const result = {
+        headers: first.headers, rows: first.rows, pages: 1, complete: true, stopped: null,
+    };
+    // Pagers may re-render on every page change, so links are looked up again each time
+    const numbered = pagerLinks().length > 1;
+    let previous = JSON.stringify(first.rows);
+
+    // The control leading to the page after the current one, or null on the last page
+    const nextControl = () => {
+        const links = pagerLinks();
+        if (!numbered) {
+            return links.length && !disabled(links[0]) ? links[0] : null;
+        }
+        const label = String(result.pages + 1);
+        const link = links.find((el) => clean(el.innerText) === label)
+            || links[result.pages];
+        return link && !disabled(link) ? link : null;
+    };
+
+    const finish = (stopped) => {
+        result.complete = !stopped;
+        result.stopped = stopped;
+        done(result);
+    };
+
+    const nextPage = () => {
+        const link = result.pages < maxPages ? nextControl() : null;
+        if (!link) {
+            finish(null);
+            return;
+        }
+        link.click();
+        const clicked = performance.now();
+        (function poll() {
+            const page = read();
+            const signature = page && JSON.stringify(page.rows);
+            if (signature && signature !== previous) {
+                previous = signature;
+                result.rows.push(...page.rows);
+                result.pages += 1;
+                nextPage();
+            } else if (performance.now() - started >= budgetMs) {
+                finish("budget");
+            } else if (performance.now() - clicked >= pageTimeoutMs) {
+                // A "next" control that is now gone or disabled was the last page
+                finish(nextControl() ? "stalled" : null);
+            } else {
+                setTimeout(poll, 25);
+            }
+        })();
+    };
+    nextPage();
+}
+"""
+
+
+def read_table(
+    driver: "WebDriver",
+    locator: tuple,
+    pager: tuple = None,
+    max_pages: int = 100,
+    page_timeout: float = 2,
+) -> Table:
+    """
+    Returns a table's headers and rows with whitespace-normalised cell text.
+
+    The whole table is read by one ``execute_async_script``, however many rows
+    and columns it has. With ``pager`` the same call walks client-side
+    pagination and concatenates the rows of every page; paginators that load a
+    new document are not supported.
+
+    Args:
+        driver: The WebDriver instance.
+        locator: The (By, value) locator of the <table>.
+        pager: Locator of the "next" control, or of every numbered page link.
+        max_pages: Pages to read at most.
+        page_timeout: Seconds to wait for the rows to change after a page click.
+            If they do not and the pager still offers a next page, the read
+            stops there and the table is returned as incomplete.
+
+    Returns:
+        Table: The header cells and the body rows, as lists of strings, and
+        ``complete``, False if a page did not load or time ran out.
+    """
+    from selenium.common.exceptions import NoSuchElementException
+
+    timeout = get_config().explicit_wait
+    pager_by, pager_value = pager if pager else (None, None)
+    args = (
+        _READ_TABLE_SCRIPT,
+        *locator,
+        pager_by,
+        pager_value,
+        max_pages,
+        int(page_timeout * 1000),
+        int(timeout * 1000),
+    )
+    result = driver.execute_async_script(*args)
+    if result is None:
+        wait_for_element_presence(driver, locator)
+        result = driver.execute_async_script(*args)
+        if result is None:
+            raise NoSuchElementException(f"Table disappeared: {locator}")
+
+    if result["stopped"] == "budget":
+        logger.warning(
+            f"Stopped reading {locator} after {result['pages']} pages ({timeout}s)"
+        )
+    elif result["stopped"] == "stalled":
+        logger.warning(
+            f"Page {result['pages'] + 1} of {locator} did not load within "
+            f"{page_timeout}s; read {result['pages']} page(s)"
+        )
+    logger.debug(
+        f"Read {len(result['rows'])} rows from {result['pages']} page(s) of {locator}."
+    )
+    return Table(result["headers"], result["rows"], result["complete"])
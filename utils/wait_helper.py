@@ -2,26 +2,312 @@
 Helper functions for explicit waits in Selenium WebDriver.
 """
 
-import yaml
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import TimeoutException
+import functools
+import threading
+import time
+from typing import TYPE_CHECKING
+from utils.config import get_config
 from utils.logger import logger
+from utils.wait_telemetry import ERROR, OK, TIMEOUT, wait_stats
 
+# Selenium is imported inside the helpers so that importing them stays cheap
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+# find(by, value): every node matching a Selenium (By, value) locator, in document order.
+# Prepended to the scripts here and to the page-object scripts in pages/
+FIND_NODES_JS = """
+function find(by, value) {
+    switch (by) {
+        case "css selector":
+            return Array.from(document.querySelectorAll(value));
+        case "id":
+            return Array.from(document.querySelectorAll("#" + CSS.escape(value)));
+        case "name":
+            return Array.from(document.querySelectorAll(`[name="${CSS.escape(value)}"]`));
+        case "class name":
+            return Array.from(document.querySelectorAll("." + CSS.escape(value)));
+        case "tag name":
+            return Array.from(document.getElementsByTagName(value));
+        case "link text":
+            return Array.from(document.querySelectorAll("a")).filter(
+                (a) => a.innerText.trim() === value
+            );
+        case "partial link text":
+            return Array.from(document.querySelectorAll("a")).filter(
+                (a) => a.innerText.includes(value)
+            );
+        case "xpath": {
+            const snapshot = document.evaluate(
+                value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            const nodes = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+        }
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+"""
+
+# Resolves (via the async callback) with the first element matching the locator
+# once it satisfies the condition, or null after the timeout. Re-checks on every
+# DOM mutation and whenever the element's intersection with the viewport
+# changes, with a slow timer for style changes neither observer reports.
+_OBSERVER_WAIT_SCRIPT = FIND_NODES_JS + """
+const [by, value, condition, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+
+function displayed(el) {
+    const style = window.getComputedStyle(el);
+    const rect = el.getBoundingClientRect();
+    return style.visibility !== "hidden" && style.display !== "none"
+        && rect.width > 0 && rect.height > 0;
+}
+
+function check() {
+    const el = find(by, value).find((node) => node.nodeType === Node.ELEMENT_NODE);
+    if (!el || condition === "presence") {
+        return el || null;
+    }
+    if (!displayed(el)) {
+        return null;
+    }
+    return condition === "clickable" && el.disabled ? null : el;
+}
+
+const found = check();
+if (found) {
+    done(found);
+} else {
+    let observed = null;
+    const intersection = new IntersectionObserver(attempt);
+    const mutations = new MutationObserver(attempt);
+    const interval = setInterval(attempt, 250);
+    const timer = setTimeout(() => finish(null), timeoutMs);
+
+    function finish(result) {
+        mutations.disconnect();
+        intersection.disconnect();
+        clearInterval(interval);
+        clearTimeout(timer);
+        done(result);
+    }
+
+    function attempt() {
+        const el = check();
+        if (el) {
+            finish(el);
+            return;
+        }
+        const candidate = find(by, value)[0];
+        if (candidate && candidate !== observed && candidate.nodeType === Node.ELEMENT_NODE) {
+            intersection.disconnect();
+            intersection.observe(candidate);
+            observed = candidate;
+        }
+    }
+
+    mutations.observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+    attempt();
+}
+"""
+
+# Counts in-flight fetch() and XMLHttpRequest calls in window.__pendingRequests.
+# Installed on every new document by BrowserManager where CDP is available, and
+# otherwise injected by wait_for_network_idle() itself. Safe to run twice.
+REQUEST_COUNTER_SCRIPT = """
+(() => {
+    if (window.__pendingRequests) {
+        return;
+    }
+    const state = (window.__pendingRequests = {count: 0, lastChange: performance.now()});
+    const change = (delta) => {
+        state.count = Math.max(0, state.count + delta);
+        state.lastChange = performance.now();
+    };
+
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function (...args) {
+            change(1);
+            try {
+                return originalFetch.apply(this, args).finally(() => change(-1));
+            } catch (e) {
+                change(-1);
+                throw e;
+            }
+        };
+    }
+
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        change(1);
+        this.addEventListener("loadend", () => change(-1), {once: true});
+        try {
+            return originalSend.apply(this, args);
+        } catch (e) {
+            change(-1);
+            throw e;
+        }
+    };
+})();
+"""
+
+# Resolves true once no fetch/XHR has been in flight for quietMs, false on timeout
+_NETWORK_IDLE_SCRIPT = REQUEST_COUNTER_SCRIPT + """
+const [quietMs, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const state = window.__pendingRequests;
+const started = performance.now();
+
+(function check() {
+    const now = performance.now();
+    if (state.count === 0 && now - Math.max(state.lastChange, started) >= quietMs) {
+        done(true);
+    } else if (now - started >= timeoutMs) {
+        done(false);
+    } else {
+        setTimeout(check, 25);
+    }
+})();
+"""
+
+# Sessions where async scripts failed, which always poll from then on
+_polling_only_sessions = set()
+
+# Driver round trips made by the wait in progress on each thread
+_polls = threading.local()
+
+
+def _count_poll():
+    _polls.count = getattr(_polls, "count", 0) + 1
+
+
+def _counted(predicate):
+    """Wraps a WebDriverWait predicate so that every call counts as a poll."""
+
+    def poll(driver):
+        _count_poll()
+        return predicate(driver)
+
+    return poll
+
+
+def _locator_of(args, kwargs):
+    return str(kwargs.get("locator", args[1] if len(args) > 1 else None))
 
-with open("config/config.yaml", "r", encoding="utf-8") as file:
-    config = yaml.safe_load(file)
 
+def _batch_locators_of(args, kwargs):
+    locators = kwargs.get("locators", args[1] if len(args) > 1 else {})
+    return ", ".join(f"{name}={locator}" for name, locator in locators.items())
 
-timeout = config.get("explicit_wait", 10)
 
+def _recorded(condition, target=_locator_of):
+    """
+    Records every call of a wait helper in ``wait_stats``.
+
+    Args:
+        condition (str): The name the waits are grouped under, e.g. "visibility".
+        target (callable): Builds the locator label from the call's args and kwargs.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            from selenium.common.exceptions import TimeoutException
+
+            _polls.count = 0
+            outcome = ERROR
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                outcome = OK
+                return result
+            except TimeoutException:
+                outcome = TIMEOUT
+                raise
+            finally:
+                wait_stats.record(
+                    condition,
+                    target(args, kwargs),
+                    time.perf_counter() - start,
+                    _polls.count,
+                    outcome,
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def _wait_until(driver, locator, condition, expected_condition, timeout):
+    """
+    Waits for ``condition`` on the element, using the configured wait engine.
+
+    With ``wait_engine: observer`` the condition is checked in the browser by a
+    MutationObserver/IntersectionObserver script that returns the moment it
+    holds. Polling with WebDriverWait is used otherwise, when the session
+    cannot run async scripts, or for the rest of the timeout if the script is
+    interrupted (e.g. by a navigation).
+
+    Args:
+        driver: The WebDriver instance.
+        locator: The (By, value) locator.
+        condition: "presence", "visibility" or "clickable".
+        expected_condition: The matching ``expected_conditions`` factory.
+        timeout: Seconds to wait.
+
+    Returns:
+        WebElement: The element once the condition holds.
+    """
+    from selenium.common.exceptions import (
+        JavascriptException,
+        TimeoutException,
+        WebDriverException,
+    )
+    from selenium.webdriver.support.ui import WebDriverWait
 
-def wait_for_element_presence(driver: WebDriver, locator: tuple) -> WebElement:
+    deadline = time.monotonic() + timeout
+    if (
+        get_config().wait_engine == "observer"
+        and driver.session_id not in _polling_only_sessions
+    ):
+        by, value = locator
+        try:
+            _count_poll()
+            element = driver.execute_async_script(
+                _OBSERVER_WAIT_SCRIPT, by, value, condition, int(timeout * 1000)
+            )
+            if element is None:
+                raise TimeoutException(f"{condition} of {locator}")
+            return element
+        except TimeoutException:
+            raise
+        except JavascriptException as e:
+            logger.debug(f"Observer wait interrupted, polling instead: {e}")
+        except WebDriverException as e:
+            logger.debug(f"Async scripts unavailable, polling from now on: {e}")
+            _polling_only_sessions.add(driver.session_id)
+
+    remaining = max(deadline - time.monotonic(), 0)
+    return WebDriverWait(driver, remaining).until(_counted(expected_condition(locator)))
+
+
+@_recorded("presence")
+def wait_for_element_presence(driver: "WebDriver", locator: tuple) -> "WebElement":
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+
+    timeout = get_config().explicit_wait
     try:
-        element = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located(locator)
+        element = _wait_until(
+            driver, locator, "presence", EC.presence_of_element_located, timeout
         )
         logger.debug(f"Element located by {locator} is present.")
         return element
@@ -33,10 +319,18 @@ def wait_for_element_presence(driver: WebDriver, locator: tuple) -> WebElement:
         raise
 
 
-def wait_for_elements_presence(driver: WebDriver, locator: tuple) -> list[WebElement]:
+@_recorded("presence_all")
+def wait_for_elements_presence(
+    driver: "WebDriver", locator: tuple
+) -> list["WebElement"]:
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = get_config().explicit_wait
     try:
         elements = WebDriverWait(driver, timeout).until(
-            EC.presence_of_all_elements_located(locator)
+            _counted(EC.presence_of_all_elements_located(locator))
         )
         logger.debug(f"Element located by {locator} is present.")
         return elements
@@ -48,13 +342,18 @@ def wait_for_elements_presence(driver: WebDriver, locator: tuple) -> list[WebEle
         raise
 
 
-def wait_for_element_visibility(driver: WebDriver, locator: tuple) -> WebElement:
+@_recorded("visibility")
+def wait_for_element_visibility(driver: "WebDriver", locator: tuple) -> "WebElement":
     """
     Waits for an element to be visible on the page.
     """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+
+    timeout = get_config().explicit_wait
     try:
-        element = WebDriverWait(driver, timeout).until(
-            EC.visibility_of_element_located(locator)
+        element = _wait_until(
+            driver, locator, "visibility", EC.visibility_of_element_located, timeout
         )
         logger.debug(f"Element located by {locator} is visible.")
         return element
@@ -66,12 +365,18 @@ def wait_for_element_visibility(driver: WebDriver, locator: tuple) -> WebElement
         raise
 
 
-def wait_for_alert_visibility(driver: WebDriver) -> str:
+@_recorded("alert", lambda args, kwargs: "alert")
+def wait_for_alert_visibility(driver: "WebDriver") -> str:
     """
     Waits for a JavaScript alert to be present and returns its text.
     """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = get_config().explicit_wait
     try:
-        WebDriverWait(driver, timeout).until(EC.alert_is_present())
+        WebDriverWait(driver, timeout).until(_counted(EC.alert_is_present()))
         logger.debug("Alert is present.")
         alert = driver.switch_to.alert
         return alert
@@ -83,14 +388,225 @@ def wait_for_alert_visibility(driver: WebDriver) -> str:
         raise
 
 
-def wait_for_element_clickable(driver: WebDriver, locator: tuple) -> WebElement:
+@_recorded("clickable")
+def wait_for_element_clickable(driver: "WebDriver", locator: tuple) -> "WebElement":
     """Waits for an element to be clickable on the page."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+
+    timeout = get_config().explicit_wait
     try:
-        element = WebDriverWait(driver, timeout).until(
-            EC.element_to_be_clickable(locator)
+        element = _wait_until(
+            driver, locator, "clickable", EC.element_to_be_clickable, timeout
         )
         logger.debug(f"Element located by {locator} is clickable.")
         return element
     except TimeoutException:
         logger.error(f"Timeout: Element not clickable within {timeout}s: {locator}")
         raise
+
+
+def navigate_and_wait_for_element(
+    driver: "WebDriver", url: str, locator: tuple, stop_loading: bool = False
+) -> "WebElement":
+    """
+    Navigates to a URL and returns as soon as the element is present.
+
+    How early this returns depends on the session's page load strategy:
+    ``driver.get`` waits for every subresource under "normal", for the DOM
+    under "eager" and not at all under "none", after which the element is
+    polled with wait_for_element_presence().
+
+    Args:
+        driver: The WebDriver instance.
+        url: The page to open.
+        locator: The element the test needs, e.g. (By.ID, "username").
+        stop_loading: Cancel subresources still loading once the element is found.
+
+    Returns:
+        WebElement: The located element.
+    """
+    driver.get(url)
+    element = wait_for_element_presence(driver, locator)
+    if (
+        stop_loading
+        and driver.execute_script("return document.readyState") != "complete"
+    ):
+        driver.execute_script("window.stop();")
+        logger.debug(f"Stopped loading {url} after {locator} was found.")
+    return element
+
+
+@_recorded(
+    "navigation",
+    lambda args, kwargs: kwargs.get("url_fragment", args[1] if len(args) > 1 else ""),
+)
+def wait_for_navigation(driver: "WebDriver", url_fragment: str) -> str:
+    """
+    Waits until a page whose URL contains ``url_fragment`` has loaded.
+
+    Reacts to the BiDi ``browsingContext.load`` event when the session has an
+    event stream, and polls the URL and ``document.readyState`` otherwise.
+
+    Args:
+        driver: The WebDriver instance.
+        url_fragment: Part of the expected URL.
+
+    Returns:
+        str: The URL of the loaded page.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = get_config().explicit_wait
+    events = getattr(driver, "event_stream", None)
+    if events is not None:
+        from utils.event_stream import NAVIGATION
+
+        event = events.wait_for(
+            NAVIGATION,
+            lambda e: e["event"] == "load" and url_fragment in (e["url"] or ""),
+            timeout,
+        )
+        if event is None:
+            logger.error(f"Timeout: No page load for {url_fragment} within {timeout}s")
+            raise TimeoutException(f"No page load for {url_fragment}")
+        logger.debug(f"Page loaded: {event['url']}")
+        return event["url"]
+
+    try:
+        WebDriverWait(driver, timeout).until(
+            _counted(
+                lambda d: url_fragment in d.current_url
+                and d.execute_script("return document.readyState") == "complete"
+            )
+        )
+        logger.debug(f"Page loaded: {driver.current_url}")
+        return driver.current_url
+    except TimeoutException:
+        logger.error(f"Timeout: No page load for {url_fragment} within {timeout}s")
+        raise
+
+
+# Resolves a dict of named (by, value) locators in the page. Returns, per name,
+# the first match (or every match when ``multiple``) as an element or projected
+# to text / an attribute, plus the names of locators that matched nothing.
+_BATCH_LOOKUP_SCRIPT = FIND_NODES_JS + """
+const [locators, projection, multiple] = arguments;
+
+function project(node) {
+    if (projection === null) {
+        return node.nodeType === Node.ELEMENT_NODE ? node : null;
+    }
+    if (projection === "text") {
+        const text = node.nodeType === Node.ELEMENT_NODE ? node.innerText : node.textContent;
+        return text.trim();
+    }
+    return node.getAttribute ? node.getAttribute(projection.slice(1)) : null;
+}
+
+const values = {};
+const missing = [];
+for (const [name, [by, value]] of Object.entries(locators)) {
+    const nodes = find(by, value);
+    if (!nodes.length) {
+        missing.push(name);
+    }
+    values[name] = multiple ? nodes.map(project) : nodes.length ? project(nodes[0]) : null;
+}
+return {values: values, missing: missing};
+"""
+
+
+@_recorded("batch", _batch_locators_of)
+def wait_for_elements_batch(
+    driver: "WebDriver",
+    locators: dict[str, tuple],
+    projection: str = None,
+    multiple: bool = False,
+) -> dict:
+    """
+    Waits until every named locator matches, resolving all of them in one script call.
+
+    Each poll is a single ``execute_script`` round trip instead of one
+    ``find_element`` per locator. The timeout is the same as in
+    wait_for_element_presence().
+
+    Args:
+        driver: The WebDriver instance.
+        locators: Names mapped to (By, value) locators.
+        projection: None to return elements, "text" for their trimmed visible text or
+            "@name" for an attribute, e.g. "@href".
+        multiple: Return every match per locator instead of the first one.
+
+    Returns:
+        dict: Names mapped to the element or projected value, or to a list of
+        them when ``multiple`` is set.
+    """
+    if projection not in (None, "text") and not str(projection).startswith("@"):
+        raise ValueError(f"Unsupported projection: {projection!r}")
+
+    if not locators:
+        return {}
+
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = get_config().explicit_wait
+    payload = {name: list(locator) for name, locator in locators.items()}
+    missing = list(locators)
+
+    def resolve(d):
+        result = d.execute_script(_BATCH_LOOKUP_SCRIPT, payload, projection, multiple)
+        missing[:] = result["missing"]
+        return result["values"] if not missing else False
+
+    try:
+        results = WebDriverWait(driver, timeout).until(_counted(resolve))
+        logger.debug(f"Resolved {len(locators)} locators in one lookup.")
+        return results
+    except TimeoutException:
+        logger.error(
+            f"Timeout: Elements not present within {timeout}s: "
+            + ", ".join(f"{name}={locators[name]}" for name in missing)
+        )
+        raise
+    except Exception as e:
+        logger.error(f"An error occurred while resolving locators: {e}")
+        raise
+
+
+@_recorded("network_idle", lambda args, kwargs: "fetch/xhr")
+def wait_for_network_idle(driver: "WebDriver", quiet_ms: int = None) -> None:
+    """
+    Waits until no fetch/XHR request has been in flight for a quiet window.
+
+    Use it after an action that triggers background requests (e.g. a Calculate
+    button) instead of a fixed sleep. Requests are counted by
+    REQUEST_COUNTER_SCRIPT, which sees requests from the start of the page when
+    BrowserManager installed it, and from this call onwards otherwise.
+
+    Args:
+        driver: The WebDriver instance.
+        quiet_ms: Milliseconds with no requests in flight; defaults to
+            ``network_idle_ms`` in config.yaml.
+    """
+    from selenium.common.exceptions import TimeoutException
+
+    config = get_config()
+    timeout = config.explicit_wait
+    quiet_ms = quiet_ms if quiet_ms is not None else config.network_idle_ms
+    try:
+        _count_poll()
+        idle = driver.execute_async_script(
+            _NETWORK_IDLE_SCRIPT, quiet_ms, int(timeout * 1000)
+        )
+        if not idle:
+            raise TimeoutException(f"Requests still in flight after {timeout}s")
+        logger.debug(f"Network idle for {quiet_ms} ms.")
+    except TimeoutException:
+        logger.error(f"Timeout: Network not idle within {timeout}s")
+        raise
+    except Exception as e:
+        logger.error(f"An error occurred while waiting for network idle: {e}")
+        raise
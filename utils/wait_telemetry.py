@@ -0,0 +1,140 @@
+"""In-memory record of every explicit wait: what was waited for, how long and how it ended."""
+
+import statistics
+import threading
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+OK = "ok"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+
+def _histogram(values_ms):
+    labels = [f"<={bound}" for bound in HISTOGRAM_BUCKETS_MS] + [
+        f">{HISTOGRAM_BUCKETS_MS[-1]}"
+    ]
+    counts = dict.fromkeys(labels, 0)
+    for value in values_ms:
+        for bound, label in zip(HISTOGRAM_BUCKETS_MS, labels):
+            if value <= bound:
+                counts[label] += 1
+                break
+        else:
+            counts[labels[-1]] += 1
+    return counts
+
+
+class WaitStats:
+    """Thread-safe store of wait timings, grouped by condition and locator."""
+
+    def __init__(self):
+        self._waits = {}
+        self._lock = threading.Lock()
+
+    def record(self, condition, locator, elapsed, polls, outcome):
+        """
+        Records one finished wait.
+
+        Args:
+            condition (str): What was waited for, e.g. "visibility".
+            locator (str): The locator or other target of the wait.
+            elapsed (float): Seconds the wait took.
+            polls (int): Round trips made to the driver.
+            outcome (str): OK, TIMEOUT or ERROR.
+        """
+        with self._lock:
+            self._waits.setdefault((condition, locator), []).append(
+                (elapsed, polls, outcome)
+            )
+
+    def summary(self, top=10):
+        """
+        Summarises the recorded waits.
+
+        Args:
+            top (int): Entries to list as slowest and most timed out.
+
+        Returns:
+            dict: Totals, per-locator statistics with a latency histogram
+            (slowest total time first), and the ``top`` slowest (by p95) and
+            most frequently timed-out locators.
+        """
+        with self._lock:
+            waits = {key: list(values) for key, values in self._waits.items()}
+
+        locators = []
+        for (condition, locator), records in waits.items():
+            elapsed_ms = sorted(record[0] * 1000 for record in records)
+            outcomes = [record[2] for record in records]
+            locators.append(
+                {
+                    "condition": condition,
+                    "locator": locator,
+                    "count": len(records),
+                    "timeouts": outcomes.count(TIMEOUT),
+                    "errors": outcomes.count(ERROR),
+                    "polls": sum(record[1] for record in records),
+                    "total_ms": round(sum(elapsed_ms), 2),
+                    "mean_ms": round(statistics.mean(elapsed_ms), 2),
+                    "p50_ms": round(elapsed_ms[len(elapsed_ms) // 2], 2),
+                    "p95_ms": round(elapsed_ms[int(len(elapsed_ms) * 0.95)], 2),
+                    "max_ms": round(elapsed_ms[-1], 2),
+                    "histogram": _histogram(elapsed_ms),
+                }
+            )
+        locators.sort(key=lambda entry: entry["total_ms"], reverse=True)
+
+        return {
+            "waits": sum(entry["count"] for entry in locators),
+            "timeouts": sum(entry["timeouts"] for entry in locators),
+            "total_ms": round(sum(entry["total_ms"] for entry in locators), 2),
+            "slowest": sorted(locators, key=lambda e: e["p95_ms"], reverse=True)[:top],
+            "most_timeouts": sorted(
+                (entry for entry in locators if entry["timeouts"]),
+                key=lambda e: e["timeouts"],
+                reverse=True,
+            )[:top],
+            "locators": locators,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._waits.clear()
+
+
+def format_report(summary):
+    """
+    Renders a summary as a plain-text report of the slowest and most timed-out waits.
+
+    Args:
+        summary (dict): The result of WaitStats.summary().
+
+    Returns:
+        str: The report.
+    """
+    lines = [
+        f"{summary['waits']} waits, {summary['timeouts']} timeouts, "
+        f"{summary['total_ms'] / 1000:.1f}s waiting in total",
+        "",
+        "Slowest locators (p95):",
+    ]
+    for entry in summary["slowest"]:
+        lines.append(
+            f"  {entry['p95_ms']:9.1f} ms p95  {entry['count']:4d}x  "
+            f"{entry['condition']:<12} {entry['locator']}"
+        )
+    lines += ["", "Most frequently timed out:"]
+    for entry in summary["most_timeouts"] or []:
+        lines.append(
+            f"  {entry['timeouts']:4d}/{entry['count']:<4d} "
+            f"{entry['condition']:<12} {entry['locator']}"
+        )
+    if not summary["most_timeouts"]:
+        lines.append("  none")
+    return "\n".join(lines)
+
+
+# Waits made by this process
+wait_stats = WaitStats()
@@ -0,0 +1,114 @@
+"""Helpers for isolating per-worker resources when running under pytest-xdist."""
+
+import os
+import socket
+import threading
+
+WORKER_ENV_VAR = "PYTEST_XDIST_WORKER"
+
+_reserved_ports = set()
+_reserved_lock = threading.Lock()
+
+
+def get_worker_id():
+    """
+    Returns the xdist worker id of the current process.
+
+    Returns:
+        str: The worker id (e.g. "gw0"), or "master" when not running in parallel.
+    """
+    return os.environ.get(WORKER_ENV_VAR, "master")
+
+
+def get_worker_index():
+    """
+    Returns the numeric index of the current xdist worker.
+
+    Returns:
+        int: 0 for "gw0" or when not running in parallel, 1 for "gw1", and so on.
+    """
+    worker_id = get_worker_id()
+    if worker_id.startswith("gw") and worker_id[2:].isdigit():
+        return int(worker_id[2:])
+    return 0
+
+
+def is_parallel():
+    """Returns True if the current process is an xdist worker."""
+    return WORKER_ENV_VAR in os.environ
+
+
+def is_controller(config):
+    """
+    Returns True if this process is the xdist controller or a non-parallel run.
+
+    Args:
+        config: The pytest config object.
+    """
+    return not hasattr(config, "workerinput")
+
+
+def worker_path(base_path):
+    """
+    Namespaces a directory by worker id when running in parallel.
+
+    Args:
+        base_path (str): The shared directory.
+
+    Returns:
+        str: ``base_path/<worker_id>`` on xdist workers, ``base_path`` otherwise.
+    """
+    if is_parallel():
+        return os.path.join(base_path, get_worker_id())
+    return base_path
+
+
+def get_port_range(base_port, ports_per_worker):
+    """
+    Returns the block of ports reserved for the current worker.
+
+    Args:
+        base_port (int): First port of the block reserved for worker 0.
+        ports_per_worker (int): Size of each worker's block.
+
+    Returns:
+        range: The ports this worker may use.
+    """
+    start = base_port + get_worker_index() * ports_per_worker
+    return range(start, start + ports_per_worker)
+
+
+def reserve_port(ports):
+    """
+    Reserves a port in the given range that nothing is currently listening on.
+
+    Ports handed out by this process stay reserved until release_port() is
+    called, so two browsers starting at the same time never get the same port.
+
+    Args:
+        ports (range): Candidate ports.
+
+    Returns:
+        int: The reserved port.
+
+    Raises:
+        RuntimeError: If every port in the range is in use.
+    """
+    with _reserved_lock:
+        for port in ports:
+            if port in _reserved_ports:
+                continue
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                try:
+                    sock.bind(("127.0.0.1", port))
+                except OSError:
+                    continue
+            _reserved_ports.add(port)
+            return port
+    raise RuntimeError(f"No free port in range {ports.start}-{ports.stop - 1}")
+
+
+def release_port(port):
+    """Returns a port obtained from reserve_port() to the pool."""
+    with _reserved_lock:
+        _reserved_ports.discard(port)